@@ -0,0 +1,148 @@
+"""Simulated Areson firmware behind the ``hid.device`` surface.
+
+:class:`SimulatedAreson` answers the reports :class:`venus_protocol.VenusDevice`
+sends the way the receiver does: every valid 17-byte report 0x08 gets one
+report 0x09 on the interrupt endpoint, EEPROM reads and writes act on a
+64 KiB image, and the challenge, ready, notify and status commands answer
+with what the captures show.  Reports with a bad checksum are ignored.
+
+The transport can be made as unkind as the real one:
+
+* ``ack_latency`` delays each answer (seconds, after the report arrives);
+* ``drop_rate`` loses that fraction of answers, from a seeded RNG, so runs
+  are repeatable;
+* ``min_gap`` is how long the firmware stays busy committing an EEPROM
+  write after acknowledging it; reports arriving in that window are ignored,
+  as they are when the host does not leave the mouse its settle time.
+
+Attach it with ``VenusDevice(path, handle_factory=sim.handle)``; no mouse or
+hidapi is needed.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import Counter
+
+import venus_protocol as vp
+
+# The firmware addresses a full 16-bit space; only the first
+# vp.EEPROM_SIZE bytes hold the profile.
+ADDRESS_SPACE = 0x10000
+
+
+class SimulatedAreson:
+    def __init__(self, image: bytes | None = None, *,
+                 ack_latency: float = 0.0, drop_rate: float = 0.0,
+                 min_gap: float = 0.0, battery_level: int = 7,
+                 cable_connected: bool = False, seed: int = 0):
+        if image is not None and len(image) != ADDRESS_SPACE:
+            raise ValueError(f"EEPROM image must be {ADDRESS_SPACE} bytes")
+        self.eeprom = bytearray(image if image is not None else ADDRESS_SPACE)
+        self._factory_image = bytes(self.eeprom)
+        self.ack_latency = ack_latency
+        self.drop_rate = drop_rate
+        self.min_gap = min_gap
+        self.battery_level = battery_level
+        self.cable_connected = cable_connected
+        self.notifications = False
+        # Reports received, answers dropped and reports ignored for arriving
+        # while a write was still being committed, by command byte.
+        self.received: Counter[int] = Counter()
+        self.dropped: Counter[int] = Counter()
+        self.too_fast: Counter[int] = Counter()
+        self._random = random.Random(seed)
+        self._pending: list[tuple[float, bytes]] = []
+        self._ready = threading.Condition()
+        self._busy_until = float("-inf")
+        self._open = False
+
+    # -- hid.device surface ------------------------------------------------
+
+    def handle(self) -> "SimulatedAreson":
+        """Factory for ``VenusDevice(handle_factory=...)``."""
+        return self
+
+    def open_path(self, path: bytes) -> None:
+        self._open = True
+
+    def set_nonblocking(self, value: bool) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._ready:
+            self._open = False
+            self._pending.clear()
+            self._ready.notify_all()
+
+    def send_feature_report(self, report) -> int:
+        report = bytes(report)
+        now = time.monotonic()
+        if (len(report) != vp.REPORT_LEN or report[0] != vp.REPORT_ID
+                or not vp.report_checksum_valid(report)):
+            return len(report)
+        command = report[1]
+        self.received[command] += 1
+        with self._ready:
+            if now < self._busy_until:
+                self.too_fast[command] += 1
+                return len(report)
+            data = self._execute(report)
+            due = now + self.ack_latency
+            if command == vp.CMD_WRITE:
+                self._busy_until = due + self.min_gap
+            if self.drop_rate and self._random.random() < self.drop_rate:
+                self.dropped[command] += 1
+                return len(report)
+            self._pending.append((due, self._answer(report, data)))
+            self._ready.notify_all()
+        return len(report)
+
+    def read(self, length: int, timeout_ms: int = 0) -> list[int]:
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        with self._ready:
+            while self._open:
+                now = time.monotonic()
+                if self._pending and self._pending[0][0] <= now:
+                    return list(self._pending.pop(0)[1][:length])
+                wake = min(deadline, self._pending[0][0]) if self._pending else deadline
+                if wake <= now:
+                    return []
+                self._ready.wait(wake - now)
+        return []
+
+    # -- firmware ----------------------------------------------------------
+
+    def _execute(self, report: bytes) -> bytes:
+        """Apply one request and return the data bytes of its answer."""
+        command = report[1]
+        address = (report[3] << 8) | report[4]
+        length = min(report[5], vp.MAX_DATA_LEN)
+        if command == vp.CMD_CHALLENGE:
+            return vp.challenge_response(report[6:10])
+        if command == vp.CMD_READY:
+            return b"\x01"
+        if command == vp.CMD_NOTIFY:
+            self.notifications = True
+            return b"\x01"
+        if command == vp.CMD_STATUS:
+            return bytes([self.battery_level, int(self.cable_connected)])
+        if command == vp.CMD_READ:
+            return bytes(self.eeprom[address:address + length])
+        if command == vp.CMD_WRITE:
+            self.eeprom[address:address + length] = report[6:6 + length]
+            return b""
+        if command == vp.CMD_FACTORY_RESET:
+            self.eeprom[:] = self._factory_image
+        return b""
+
+    @staticmethod
+    def _answer(report: bytes, data: bytes) -> bytes:
+        answer = bytearray(report)
+        answer[0] = vp.RESPONSE_REPORT_ID
+        if data:
+            answer[5] = len(data)
+            answer[6:16] = data.ljust(10, b"\x00")
+        answer[16] = vp.calc_checksum(answer[:16])
+        return bytes(answer)
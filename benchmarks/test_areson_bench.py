@@ -0,0 +1,104 @@
+"""Benchmarks of the Areson I/O paths against the simulated firmware.
+
+Run with ``python -m pytest benchmarks/`` (needs pytest-benchmark).  The
+simulator answers after ``ACK_LATENCY`` and stays busy for the minimum
+pacing gap after each write, so the numbers track the real protocol cost of
+pacing, pipelining and retries rather than hidapi or USB timing.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import areson_sim
+import capture_replay
+import device_driver as dd
+import venus_protocol as vp
+import venusctl
+
+ACK_LATENCY = 0.002
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DUMP = REPO_ROOT / "dumps" / "Good_Config_Windows.bin"
+VENDOR_SESSION = REPO_ROOT / "usbcap" / "wired - open utility - all communication automatic.pcapng"
+
+
+def simulated_device(pacer=None, **options) -> vp.VenusDevice:
+    image = DUMP.read_bytes() if DUMP.exists() else None
+    options.setdefault("ack_latency", ACK_LATENCY)
+    options.setdefault("min_gap", vp.PACING_MIN_SECONDS)
+    sim = areson_sim.SimulatedAreson(image, **options)
+    device = vp.VenusDevice(b"/dev/sim-areson", pacer=pacer, handle_factory=sim.handle)
+    device.open()
+    device.start_session()
+    return device
+
+
+@pytest.fixture
+def device():
+    device = simulated_device()
+    yield device
+    device.close()
+
+
+def test_full_read(benchmark, device):
+    data = benchmark(device.read_range, 0, vp.EEPROM_SIZE)
+    assert len(data) == vp.EEPROM_SIZE
+
+
+def test_full_read_with_drops(benchmark):
+    device = simulated_device(drop_rate=0.02, seed=7)
+    try:
+        benchmark.pedantic(device.read_range, args=(0, vp.EEPROM_SIZE, vp.READ_WINDOW, 50),
+                           rounds=3)
+    finally:
+        device.close()
+
+
+def test_profile_export(benchmark, device):
+    regions = benchmark(dd.read_profile_regions, "venus_pro", device)
+    assert regions
+
+
+@pytest.mark.parametrize("adaptive", [False, True], ids=["fixed", "adaptive"])
+def test_macro_upload(benchmark, adaptive):
+    events = []
+    for keycode in range(0x04, 0x1E):
+        events += [vp.MacroEvent(keycode, True, 10), vp.MacroEvent(keycode, False, 10)]
+    reports = vp.build_macro_upload(0, "bench", events)
+    device = simulated_device(pacer=vp.ReportPacer() if adaptive else None)
+
+    def upload():
+        assert device.begin_write()
+        for report in reports:
+            assert device.send_reliable(report), device.last_error
+
+    try:
+        benchmark.pedantic(upload, rounds=3)
+    finally:
+        device.close()
+
+
+def test_apply_sixteen_buttons(benchmark, device):
+    changes = {"buttons": {f"Button {index}": {"action": "Keyboard Key",
+                                                "params": {"key": 0x03 + index, "mod": 0}}
+                           for index in range(1, 17)}}
+    result = benchmark.pedantic(venusctl.apply_config, args=("venus_pro", device, changes),
+                                rounds=3)
+    assert len(result["written"]) == 16
+
+
+def test_battery_poll(benchmark, device):
+    status = benchmark(device.query_status)
+    assert status.level == 7
+
+
+def test_vendor_session_replay(benchmark, device):
+    if not VENDOR_SESSION.exists():
+        pytest.skip("capture corpus not present")
+    exchanges = capture_replay.load_capture(VENDOR_SESSION)
+    summary = benchmark.pedantic(capture_replay.replay, args=(device, exchanges), rounds=3)
+    assert not summary.counts()["timeout"]
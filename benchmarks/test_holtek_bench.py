@@ -0,0 +1,56 @@
+"""Benchmarks of the Holtek I/O paths against the simulated firmware.
+
+Every benchmark also asserts that the simulator saw no report arrive while
+it was still busy, so a pacing change that is faster but unsafe fails here
+instead of on a mouse.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import holtek_protocol as hp
+import holtek_sim
+
+
+@pytest.fixture
+def sim():
+    sim = holtek_sim.SimulatedHoltek(reenumerate_time=0.0)
+    yield sim
+    assert sum(sim.too_fast.values()) == 0
+    assert sim.stale_reads == 0
+
+
+def open_device(sim) -> hp.HoltekDevice:
+    device = hp.HoltekDevice(sim.path, handle_factory=sim.handle)
+    device.open()
+    return device
+
+
+def test_image_read(benchmark, sim):
+    device = open_device(sim)
+    image = benchmark(hp.HoltekImage.read, device)
+    assert image.config(0)["dpi_stages"] == holtek_sim.FACTORY_DPI
+
+
+def test_full_profile_apply(benchmark, sim):
+    buttons = [("Left Click", {})] * 20
+    plan = hp.WritePlan.from_packets(
+        hp.build_button_map_packets(buttons)
+        + hp.build_dpi_packets([400, 800, 1600])
+        + hp.build_led_packets(1, 2, 3))
+
+    def apply(device):
+        device.apply_plan(plan)
+        device.close()
+
+    benchmark.pedantic(apply, setup=lambda: ((open_device(sim),), {}), rounds=5)
+    assert sim.commits[hp.CATEGORY_DPI] == 5
+
+
+def test_polling_rate_change(benchmark, sim):
+    device = open_device(sim)
+    benchmark.pedantic(device.set_polling_rate, args=(500,), rounds=5)
+    assert sim.polling_rate == 500
@@ -0,0 +1,167 @@
+"""Replay the host side of a captured Areson session and check the answers.
+
+A capture is loaded as a list of :class:`Exchange` -- each request the host
+sent, paired with the answer the mouse gave in the capture -- and replayed
+through :meth:`venus_protocol.VenusDevice.exchange_pipelined` in one of two
+ways:
+
+* ``timing="original"`` sends every request at its captured offset (scaled
+  by ``speed``), whether or not earlier ones were answered, as the vendor
+  application did;
+* ``timing="ack"`` sends each request as soon as one of ``window``
+  outstanding requests is answered, with no settle gap.
+
+Every answer is compared with the captured one, and :class:`ReplaySummary`
+reports the mismatches and the ACK latency distribution::
+
+    exchanges = load_capture("usbcap/rebind 1 from 1 to a.pcapng")
+    summary = replay(device, exchanges, timing="ack")
+    print(summary.format())
+
+Replaying writes to the EEPROM exactly what the captured session wrote,
+including any factory reset; ``exclude`` drops commands from the replay.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Sequence
+
+import pcap_reader
+import venus_protocol as vp
+
+# Answers that legitimately differ between sessions: the battery level and
+# cable state.
+VOLATILE_COMMANDS = frozenset({vp.CMD_STATUS})
+TIMINGS = ("original", "ack")
+
+
+@dataclass(frozen=True)
+class Exchange:
+    frame: int
+    time: float  # seconds since the start of the capture
+    request: bytes
+    response: bytes | None  # the captured answer, if the capture has one
+
+
+@dataclass(frozen=True)
+class ReplayResult:
+    exchange: Exchange
+    response: bytes | None  # None when the mouse did not answer in time
+    latency: float | None  # seconds from sending to the answer
+    status: str  # "match", "mismatch", "timeout" or "unchecked"
+
+
+def pair_exchanges(reports: Iterable[tuple[int, float, str, bytes]]) -> list[Exchange]:
+    """Pair each Areson request with the next answer carrying its response key.
+
+    ``reports`` are ``(frame, time, direction, data)`` tuples in capture
+    order, as stored by :class:`packet_index.PacketIndex`.  Answers nobody
+    asked for, such as notifications, are dropped.
+    """
+    requests: list[list] = []
+    unanswered: dict[tuple[int, bytes | None], deque[int]] = {}
+    for frame, timestamp, direction, data in reports:
+        data = bytes(data)
+        if pcap_reader.report_protocol(data) != "areson":
+            continue
+        key = vp.response_key(data)
+        if direction == "H2M" and data[0] == vp.REPORT_ID:
+            unanswered.setdefault(key, deque()).append(len(requests))
+            requests.append([frame, timestamp, data, None])
+        elif direction == "M2H" and data[0] == vp.RESPONSE_REPORT_ID and unanswered.get(key):
+            requests[unanswered[key].popleft()][3] = data
+    return [Exchange(*request) for request in requests]
+
+
+def load_capture(source: str | Path | BinaryIO) -> list[Exchange]:
+    """The Areson exchanges of a pcap or pcapng capture."""
+    return pair_exchanges((report.frame, report.elapsed, report.direction, report.data)
+                          for report in pcap_reader.read_reports(source, ("areson",)))
+
+
+def check(exchange: Exchange, response: bytes | None) -> str:
+    if response is None:
+        return "timeout"
+    if exchange.response is None or exchange.request[1] in VOLATILE_COMMANDS:
+        return "unchecked"
+    return "match" if response == exchange.response else "mismatch"
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted ``values``."""
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+@dataclass(frozen=True)
+class ReplaySummary:
+    results: list[ReplayResult]
+    elapsed: float  # seconds the replay took
+    captured: float  # seconds the same exchanges took in the capture
+
+    def counts(self) -> Counter[str]:
+        return Counter(result.status for result in self.results)
+
+    @property
+    def ok(self) -> bool:
+        counts = self.counts()
+        return not counts["mismatch"] and not counts["timeout"]
+
+    def latency(self) -> dict[str, float]:
+        """ACK latency statistics in milliseconds; empty if nothing answered."""
+        values = sorted(result.latency * 1000 for result in self.results
+                        if result.latency is not None)
+        if not values:
+            return {}
+        return {"min": values[0], "p50": percentile(values, 50),
+                "p90": percentile(values, 90), "p99": percentile(values, 99),
+                "max": values[-1], "mean": sum(values) / len(values)}
+
+    def format(self) -> str:
+        counts = self.counts()
+        lines = [f"{len(self.results)} exchanges in {self.elapsed:.3f}s "
+                 f"(captured: {self.captured:.3f}s): "
+                 + ", ".join(f"{counts[status]} {status}"
+                             for status in ("match", "mismatch", "timeout", "unchecked"))]
+        latency = self.latency()
+        if latency:
+            lines.append("latency ms: " + " ".join(f"{name}={value:.2f}"
+                                                   for name, value in latency.items()))
+        for result in self.results:
+            if result.status in ("mismatch", "timeout"):
+                got = result.response.hex() if result.response else "-"
+                expected = result.exchange.response.hex() if result.exchange.response else "-"
+                lines.append(f"  frame {result.exchange.frame} {result.status}: "
+                             f"sent {result.exchange.request.hex()} "
+                             f"expected {expected} got {got}")
+        return "\n".join(lines)
+
+
+def replay(device: vp.VenusDevice, exchanges: Sequence[Exchange], *,
+           timing: str = "ack", window: int = 1, speed: float = 1.0,
+           timeout_ms: int = 500, exclude: Iterable[int] = ()) -> ReplaySummary:
+    """Replay ``exchanges`` on an open device and verify every answer."""
+    if timing not in TIMINGS:
+        raise ValueError(f"timing must be one of {', '.join(TIMINGS)}")
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    excluded = set(exclude)
+    exchanges = [exchange for exchange in exchanges if exchange.request[1] not in excluded]
+    if not exchanges:
+        return ReplaySummary([], 0.0, 0.0)
+    send_at = None
+    if timing == "original":
+        send_at = [(exchange.time - exchanges[0].time) / speed for exchange in exchanges]
+        window = len(exchanges)
+    started = time.monotonic()
+    answers = device.exchange_pipelined([exchange.request for exchange in exchanges],
+                                        window=window, timeout_ms=timeout_ms,
+                                        send_at=send_at)
+    elapsed = time.monotonic() - started
+    results = [ReplayResult(exchange, response, latency, check(exchange, response))
+               for exchange, (response, latency) in zip(exchanges, answers)]
+    return ReplaySummary(results, elapsed, exchanges[-1].time - exchanges[0].time)
@@ -1,22 +1,87 @@
+"""Capture the mouse's USB traffic into new-usbcap/.
+
+By default this runs dumpcap on the mouse's usbmon bus and echoes the
+usbmon text interface.  With --live it reads the binary interface
+/dev/usbmonN instead, through the kernel's memory-mapped ring buffer: every
+event on the bus goes to the pcapng file, and the mouse's Areson or Holtek
+reports are decoded and printed as they arrive, all in this one process.
+
+    sudo python3 capture_usb.py --live
+    sudo python3 capture_usb.py --live --device 04d9:fc55 --events holtek.txt
+"""
+import argparse
+import ctypes
+import fcntl
+import mmap
 import subprocess
 import re
+import struct
 import time
 import os
 import signal
 import sys
 from datetime import datetime
 
+import holtek_protocol as hp
+import pcap_reader
+import venus_protocol as vp
+
 # Configuration
 TARGET_VENDOR_PRODUCT = "25a7:fa07"
 OUTPUT_DIR = "new-usbcap"
 USBMON_DEBUG_PATH = "/sys/kernel/debug/usb/usbmon"
 
-def get_device_info():
+# Binary usbmon interface (Documentation/usb/usbmon.rst).  The kernel caps
+# the ring at 1200 KiB; at the largest size a burst of mouse movement can
+# not overrun it between two fetches.
+RING_SIZE = 1200 * 1024
+FETCH_BATCH = 256
+USBMON_HEADER_LEN = 64
+_MON_IOC_MAGIC = 0x92
+
+
+class _MfetchArg(ctypes.Structure):
+    _fields_ = [("offvec", ctypes.POINTER(ctypes.c_uint32)),
+                ("nfetch", ctypes.c_uint32),
+                ("nflush", ctypes.c_uint32)]
+
+
+class _BinStats(ctypes.Structure):
+    _fields_ = [("queued", ctypes.c_uint32), ("dropped", ctypes.c_uint32)]
+
+
+def _ioc(direction, number, size=0):
+    return (direction << 30) | (size << 16) | (_MON_IOC_MAGIC << 8) | number
+
+
+MON_IOCG_STATS = _ioc(2, 3, ctypes.sizeof(_BinStats))
+MON_IOCT_RING_SIZE = _ioc(0, 4)
+MON_IOCQ_RING_SIZE = _ioc(0, 5)
+MON_IOCX_MFETCH = _ioc(3, 7, ctypes.sizeof(_MfetchArg))
+
+# Command names, matching COMMANDS in tools/decode_areson_pcap.py.
+ARESON_COMMANDS = {
+    vp.CMD_CHALLENGE: "challenge",
+    vp.CMD_NOTIFY: "notify/driver-state",
+    vp.CMD_READY: "ready",
+    vp.CMD_STATUS: "battery/status",
+    vp.CMD_WRITE: "EEPROM write",
+    vp.CMD_READ: "EEPROM read",
+    vp.CMD_FACTORY_RESET: "FACTORY RESET",
+}
+HOLTEK_COMMANDS = {
+    hp.CMD_WRITE_CTRL: "control",
+    hp.CMD_READ: "flash read",
+    hp.CMD_WRITE_DATA: "flash write",
+    hp.CMD_POLLING: "polling rate",
+}
+
+def get_device_info(target=TARGET_VENDOR_PRODUCT):
     """Finds the bus and device number for the target device."""
     try:
         lsusb_output = subprocess.check_output(["lsusb"], text=True)
         for line in lsusb_output.splitlines():
-            if TARGET_VENDOR_PRODUCT in line:
+            if target in line:
                 # Example: Bus 003 Device 062: ID 25a7:fa07 Areson Technology Corp 2.4G Wireless Receiver
                 match = re.search(r"Bus (\d+) Device (\d+):", line)
                 if match:
@@ -25,7 +90,164 @@ def get_device_info():
         print("Error running lsusb")
     return None, None
 
+def describe(direction, report):
+    """One line for an Areson or Holtek report, in the style of
+    describe() in tools/decode_areson_pcap.py."""
+    if pcap_reader.report_protocol(report) == "areson":
+        command, length = report[1], report[5]
+        valid = "ok" if vp.report_checksum_valid(report) else "BAD-CHECKSUM"
+        text = (f"{direction} areson cmd={command:02x} "
+                f"{ARESON_COMMANDS.get(command, 'unknown')} checksum={valid}")
+        if command in (vp.CMD_WRITE, vp.CMD_READ):
+            text += f" addr={int.from_bytes(report[3:5], 'big'):04x}"
+        if length:
+            text += f" len={length} data={bytes(report[6:6 + min(length, vp.MAX_DATA_LEN)]).hex()}"
+        return text
+
+    command = report[1]
+    if direction == "M2H":
+        # Read answer: [rid, 08, addr_lo, status, len, 00, FA, FA, data...]
+        length = report[4]
+        return (f"{direction} holtek answer addr_lo={report[2]:02x} status={report[3]:02x} "
+                f"len={length} data={bytes(report[8:8 + length]).hex() or '-'}")
+    text = f"{direction} holtek cmd={command:02x} {HOLTEK_COMMANDS.get(command, 'unknown')}"
+    if command in (hp.CMD_READ, hp.CMD_WRITE_DATA):
+        length = report[4]
+        text += f" addr={report[2] | (report[3] << 8):04x} len={length}"
+        if command == hp.CMD_WRITE_DATA:
+            text += f" data={bytes(report[8:8 + length]).hex()}"
+    elif command == hp.CMD_WRITE_CTRL:
+        text += f" mode={report[2]:02x} mask={report[3]:02x}"
+    elif command == hp.CMD_POLLING:
+        rate = hp.POLLING_CODE_TO_RATE.get(report[2])
+        text += f" rate={rate}Hz" if rate else f" code={report[2]:02x}"
+    return text
+
+
+class UsbmonRing:
+    """Events from /dev/usbmonN, read through the mmap'ed ring buffer.
+
+    Each event is the 64-byte usbmon header followed by the captured data,
+    which is also exactly a LINKTYPE_USB_LINUX_MMAPPED pcap frame.
+    """
+
+    def __init__(self, path, size=RING_SIZE):
+        self._fd = os.open(path, os.O_RDONLY)
+        try:
+            fcntl.ioctl(self._fd, MON_IOCT_RING_SIZE, size)
+            self.size = fcntl.ioctl(self._fd, MON_IOCQ_RING_SIZE)
+            self._ring = mmap.mmap(self._fd, self.size, mmap.MAP_SHARED, mmap.PROT_READ)
+        except OSError:
+            os.close(self._fd)
+            raise
+        self._offsets = (ctypes.c_uint32 * FETCH_BATCH)()
+
+    def close(self):
+        self._ring.close()
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def dropped(self):
+        """Events the kernel dropped because the ring was full."""
+        stats = _BinStats()
+        fcntl.ioctl(self._fd, MON_IOCG_STATS, stats)
+        return stats.dropped
+
+    def events(self):
+        """Yield each event as bytes; blocks until the next one arrives.
+
+        Events stay in the ring until the following fetch flushes them, so
+        a whole batch is copied out before the kernel can reuse its space.
+        """
+        flush = 0
+        while True:
+            fetch = _MfetchArg(self._offsets, FETCH_BATCH, flush)
+            fcntl.ioctl(self._fd, MON_IOCX_MFETCH, fetch)
+            for offset in self._offsets[:fetch.nfetch]:
+                if self._ring[offset + 8] == ord("@"):
+                    continue  # filler left where the ring wrapped
+                captured = struct.unpack_from("<I", self._ring, offset + 36)[0]
+                yield self._ring[offset:offset + USBMON_HEADER_LEN + captured]
+            flush = fetch.nfetch
+
+
+class PcapngWriter:
+    """Write usbmon events as a pcapng file with one usbmon interface."""
+
+    def __init__(self, stream, snaplen=0x40000):
+        self._stream = stream
+        self._block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1))
+        self._block(1, struct.pack("<HHI", pcap_reader.LINKTYPE_USB_LINUX_MMAPPED, 0, snaplen))
+
+    def write(self, record, micros):
+        """Append one event with a timestamp in microseconds."""
+        self._block(6, struct.pack("<IIIII", 0, micros >> 32, micros & 0xFFFFFFFF,
+                                   len(record), len(record)) + record)
+
+    def _block(self, block_type, body):
+        body = body.ljust((len(body) + 3) // 4 * 4, b"\x00")
+        length = len(body) + 12
+        self._stream.write(struct.pack("<II", block_type, length) + body
+                           + struct.pack("<I", length))
+
+
+def live_reports(events, raw, bus, dev):
+    """Write every event to ``raw`` and yield the reports of device ``dev``."""
+    writer = PcapngWriter(raw)
+
+    def packets():
+        for frame, record in enumerate(events, 1):
+            seconds, micros = struct.unpack_from("<qi", record, 16)
+            writer.write(record, seconds * 1_000_000 + micros)
+            packet = pcap_reader.decode_usbmon(memoryview(record), frame,
+                                               seconds + micros / 1e6)
+            if packet is not None and packet.bus == bus and packet.device == dev:
+                yield packet
+
+    yield from pcap_reader.reports(packets())
+
+
+def live_capture(bus, dev, filename, events_file=None):
+    """Capture and decode in-process until Ctrl+C."""
+    ring = UsbmonRing(f"/dev/usbmon{bus}")
+    log = open(events_file, "w", buffering=1) if events_file else None
+    try:
+        with open(filename, "wb") as raw:
+            for report in live_reports(ring.events(), raw, bus, dev):
+                if report.protocol is None:
+                    continue
+                line = (f"{report.frame:7d} {report.elapsed:10.6f} "
+                        f"{describe(report.direction, report.data)}")
+                print(line, flush=True)
+                if log:
+                    log.write(line + "\n")
+    except KeyboardInterrupt:
+        print("\nStopping capture...")
+    finally:
+        dropped = ring.dropped()
+        ring.close()
+        if log:
+            log.close()
+    print(f"Capture saved to {filename}")
+    if dropped:
+        print(f"Warning: the kernel dropped {dropped} events; the capture is incomplete.")
+
+
 def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--live", action="store_true",
+                        help="read /dev/usbmonN and decode reports in-process")
+    parser.add_argument("--device", default=TARGET_VENDOR_PRODUCT, metavar="VID:PID",
+                        help=f"USB ID to capture (default: {TARGET_VENDOR_PRODUCT})")
+    parser.add_argument("--events", metavar="FILE",
+                        help="with --live, also write the decoded reports to FILE")
+    args = parser.parse_args()
+
     if os.geteuid() != 0:
         print("This script must be run as root (use sudo).")
         sys.exit(1)
@@ -33,9 +255,9 @@ def main():
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
 
-    bus, dev = get_device_info()
+    bus, dev = get_device_info(args.device)
     if bus is None:
-        print(f"Device {TARGET_VENDOR_PRODUCT} not found.")
+        print(f"Device {args.device} not found.")
         sys.exit(1)
 
     print(f"Found device on Bus {bus}, Device {dev}")
@@ -53,19 +275,27 @@ def main():
     print(f"Saving to {filename}")
     print("Press Ctrl+C to stop.")
 
-    # Start dumpcap
-    # -i usbmonX: interface
-    # -w filename: write to file
-    dumpcap_cmd = ["dumpcap", "-i", usbmon_dev, "-w", filename] 
-    
-    dumpcap_process = subprocess.Popen(dumpcap_cmd)
-    
     # Signal handling for graceful exit on timeout or kill
     def signal_handler(sig, frame):
         print("\nReceived signal to stop.")
         raise KeyboardInterrupt
     
     signal.signal(signal.SIGTERM, signal_handler)
+
+    if args.live:
+        try:
+            live_capture(bus, dev, filename, args.events)
+        except OSError as exc:
+            print(f"Cannot read /dev/{usbmon_dev}: {exc} (is the usbmon module loaded?)")
+            sys.exit(1)
+        return
+
+    # Start dumpcap
+    # -i usbmonX: interface
+    # -w filename: write to file
+    dumpcap_cmd = ["dumpcap", "-i", usbmon_dev, "-w", filename] 
+    
+    dumpcap_process = subprocess.Popen(dumpcap_cmd)
     
     dev_str = f":{dev:03d}:" 
     
@@ -5,20 +5,34 @@ and create the appropriate device/protocol objects.
 """
 from __future__ import annotations
 
+import time
+from concurrent import futures
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+
+import profile_container as pc
 import venus_protocol as vp
 import holtek_protocol as hp
 
 
-def detect_device_type(device_info: vp.DeviceInfo) -> str:
+def device_type_for_ids(vendor_id: int, product_id: int) -> str:
     """Determine device type from VID/PID.
 
-    Returns 'holtek' for 04D9:FC55, 'venus_pro' otherwise.
+    Returns 'holtek' for 04D9:FC55, 'venus_pro' otherwise.  Profiles are
+    interchangeable within a type: the wired (FA08) and wireless (FA07)
+    Venus Pro share one EEPROM layout.
     """
-    if device_info.vendor_id == hp.VENDOR_ID and device_info.product_id == hp.PRODUCT_ID:
+    if vendor_id == hp.VENDOR_ID and product_id == hp.PRODUCT_ID:
         return 'holtek'
     return 'venus_pro'
 
 
+def detect_device_type(device_info: vp.DeviceInfo) -> str:
+    """Determine device type from a device's VID/PID."""
+    return device_type_for_ids(device_info.vendor_id, device_info.product_id)
+
+
 def get_button_profiles(device_type: str) -> dict:
     """Return the appropriate BUTTON_PROFILES dict for the device type."""
     if device_type == 'holtek':
@@ -34,3 +48,140 @@ def create_device(device_type: str, path: bytes | str):
     if device_type == 'holtek':
         return hp.HoltekDevice(path)
     return vp.VenusDevice(path)
+
+
+@contextmanager
+def open_device(device_type: str, path: bytes | str,
+                pool: vp.DeviceSessionPool | None = None,
+                authenticate: bool = False):
+    """Yield an open device for the variant and release it afterwards.
+
+    Areson handles are leased from ``pool`` when one is given so repeated
+    operations skip the open and handshake.  Holtek handles are always
+    transient: a commit resets the device and invalidates its hidraw node.
+    """
+    if device_type != 'holtek' and pool is not None:
+        with pool.lease(path, authenticate=authenticate) as device:
+            yield device
+        return
+    device = create_device(device_type, path)
+    device.open()
+    try:
+        if authenticate and device_type != 'holtek':
+            if not device.start_session():
+                raise vp.ProtocolError("startup challenge was rejected")
+        yield device
+    finally:
+        try:
+            device.close()
+        except Exception:
+            pass
+
+
+def read_profile_regions(device_type: str, device) -> list[tuple[int, bytes]]:
+    """Read the regions a profile file stores from an open device."""
+    if device_type == 'holtek':
+        return hp.HoltekImage.read(device).profile_regions()
+    return [(region.start, device.read_range(region.start, region.length))
+            for region in pc.PROFILE_REGIONS]
+
+
+def write_profile_regions(device_type: str, device,
+                          regions: list[tuple[int, bytes]],
+                          progress: Callable[[int, int], None] | None = None) -> int:
+    """Write ``(start, data)`` regions to an open device; return reports sent.
+
+    Areson writes persist packet by packet after ``begin_write()``.  Holtek
+    writes are coalesced into one plan, committed once, and reset the mouse,
+    so its handle is unusable afterwards.
+    """
+    if device_type == 'holtek':
+        plan = hp.WritePlan()
+        for start, data in regions:
+            plan.add(start, bytes(data))
+        reports = len(plan.reports())
+        device.apply_plan(plan)
+        if progress:
+            progress(reports, reports)
+        return reports
+
+    packets = [vp.build_memory_write(start + offset,
+                                     bytes(data[offset:offset + vp.MAX_DATA_LEN]))
+               for start, data in regions
+               for offset in range(0, len(data), vp.MAX_DATA_LEN)]
+    if not device.begin_write():
+        raise vp.ProtocolError(device.last_error or "Mouse did not enter ready state")
+    for index, packet in enumerate(packets):
+        if not device.send_reliable(packet):
+            address = (packet[3] << 8) | packet[4]
+            raise vp.ProtocolError(
+                device.last_error or f"Write failed at 0x{address:04x}")
+        if progress:
+            progress(index + 1, len(packets))
+    return len(packets)
+
+
+@dataclass
+class ProvisionResult:
+    """Outcome of writing a profile to one attached mouse."""
+    info: vp.DeviceInfo
+    device_type: str
+    ok: bool = False
+    reports: int = 0
+    seconds: float = 0.0
+    error: str = ""
+
+
+def provision_device(info: vp.DeviceInfo, regions: list[tuple[int, bytes]],
+                     progress: Callable[[int, int], None] | None = None
+                     ) -> ProvisionResult:
+    """Write ``regions`` to one device, reporting failure instead of raising."""
+    device_type = detect_device_type(info)
+    result = ProvisionResult(info, device_type)
+    started = time.monotonic()
+    try:
+        with open_device(device_type, info.path,
+                         authenticate=device_type != 'holtek') as device:
+            result.reports = write_profile_regions(
+                device_type, device, regions, progress)
+        result.ok = True
+    except Exception as exc:
+        result.error = str(exc) or type(exc).__name__
+    result.seconds = time.monotonic() - started
+    return result
+
+
+def provision(profiles: dict[str, list[tuple[int, bytes]]],
+              devices: list[vp.DeviceInfo] | None = None,
+              progress: Callable[[vp.DeviceInfo, int, int], None] | None = None
+              ) -> list[ProvisionResult]:
+    """Write the matching profile to every attached mouse in parallel.
+
+    ``profiles`` maps a device type (see :func:`device_type_for_ids`) to the
+    regions of a profile exported from a mouse of that type.  Each device
+    runs on its own thread; I/O locks are per hidraw node, so a rack of mice
+    takes about as long as one.
+    Devices without a matching profile, or that could not be opened during
+    enumeration, are reported as failed without being touched.
+    """
+    if devices is None:
+        devices = vp.list_devices()
+    results: list[ProvisionResult | None] = [None] * len(devices)
+    jobs = {}
+    with futures.ThreadPoolExecutor(max_workers=max(1, len(devices))) as pool:
+        for index, info in enumerate(devices):
+            device_type = detect_device_type(info)
+            regions = profiles.get(device_type)
+            if info.access_error or regions is None:
+                results[index] = ProvisionResult(
+                    info, device_type,
+                    error=info.access_error or
+                    f"no profile for {info.vendor_id:04x}:{info.product_id:04x} "
+                    f"({device_type})")
+                continue
+            report = (None if progress is None else
+                      lambda done, total, info=info: progress(info, done, total))
+            jobs[pool.submit(provision_device, info, regions, report)] = index
+        for job in futures.as_completed(jobs):
+            results[jobs[job]] = job.result()
+    return results
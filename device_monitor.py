@@ -0,0 +1,264 @@
+"""Background hidraw hotplug and battery monitor.
+
+One :class:`DeviceMonitor` thread replaces the scattered timers and sleep
+loops that used to discover devices:
+
+* hidraw nodes are watched through the kernel's uevent netlink socket, so an
+  added or removed node is seen the moment the kernel announces it.  Where
+  netlink is unavailable (containers, non-Linux), ``/sys/class/hidraw`` is
+  rescanned every :attr:`DeviceMonitor.scan_interval` seconds instead.
+* :meth:`DeviceMonitor.report_listener` plugs into
+  :class:`venus_protocol.DeviceSessionPool` and turns every status report an
+  open Areson handle receives unasked (the notification stream enabled by
+  ``enable_notifications()``) into a battery event.
+
+Subscribers are called on the monitor's (or the reader's) thread; the GUI
+relays them to the Qt thread with a signal.
+"""
+from __future__ import annotations
+
+import select
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, TypeVar
+
+import venus_protocol as vp
+
+T = TypeVar("T")
+
+NETLINK_KOBJECT_UEVENT = 15
+# Multicast group of raw kernel uevents; udevd re-broadcasts on group 2 in
+# its own binary format, which only libudev parses.
+UEVENT_GROUP_KERNEL = 1
+SYSFS_HIDRAW = Path("/sys/class/hidraw")
+SCAN_INTERVAL_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class DeviceEvent:
+    """``kind`` is ``"added"``, ``"removed"`` or ``"battery"``."""
+    kind: str
+    node: str = ""
+    vendor_id: int | None = None
+    product_id: int | None = None
+    path: bytes | str | None = None
+    status: vp.BatteryStatus | None = None
+    timestamp: float = 0.0
+
+
+def parse_uevent(message: bytes) -> dict[str, str] | None:
+    """Split a kernel ``ACTION@DEVPATH\\0KEY=VALUE\\0...`` message."""
+    header, _, body = message.partition(b"\0")
+    if b"@" not in header:
+        return None
+    fields: dict[str, str] = {}
+    for item in body.split(b"\0"):
+        key, sep, value = item.partition(b"=")
+        if sep:
+            fields[key.decode(errors="replace")] = value.decode(errors="replace")
+    return fields
+
+
+def hidraw_nodes(root: Path = SYSFS_HIDRAW) -> set[str]:
+    try:
+        return {f"/dev/{entry.name}" for entry in root.iterdir()}
+    except OSError:
+        return set()
+
+
+def hidraw_ids(node: str, root: Path = SYSFS_HIDRAW) -> tuple[int, int] | None:
+    """Vendor and product ID of a hidraw node, from its parent HID device."""
+    try:
+        text = (root / Path(node).name / "device" / "uevent").read_text()
+    except OSError:
+        return None
+    for line in text.splitlines():
+        if line.startswith("HID_ID="):
+            try:
+                _bus, vendor, product = line[7:].split(":")
+                return int(vendor, 16), int(product, 16)
+            except ValueError:
+                return None
+    return None
+
+
+def _node_path(path: bytes | str) -> str:
+    return path.decode(errors="replace") if isinstance(path, bytes) else path
+
+
+class DeviceMonitor:
+    """Publish hidraw hotplug and battery events from one background thread."""
+
+    def __init__(self, scan_interval: float = SCAN_INTERVAL_SECONDS,
+                 sysfs_root: Path = SYSFS_HIDRAW):
+        self.scan_interval = scan_interval
+        self.sysfs_root = sysfs_root
+        # "netlink", "sysfs", or None while stopped.
+        self.source: str | None = None
+        self.nodes: dict[str, tuple[int, int] | None] = {}
+        self.battery: dict[bytes | str, DeviceEvent] = {}
+        self._subscribers: list[Callable[[DeviceEvent], None]] = []
+        self._condition = threading.Condition()
+        self._added = 0
+        self._socket: socket.socket | None = None
+        self._wake_r: socket.socket | None = None
+        self._wake_w: socket.socket | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.nodes = {node: hidraw_ids(node, self.sysfs_root)
+                      for node in hidraw_nodes(self.sysfs_root)}
+        self._socket = self._open_netlink()
+        self.source = "netlink" if self._socket is not None else "sysfs"
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="device-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        if self._wake_w is not None:
+            self._wake_w.send(b"\0")
+        thread.join()
+        for sock in (self._socket, self._wake_r, self._wake_w):
+            if sock is not None:
+                sock.close()
+        self._socket = self._wake_r = self._wake_w = None
+        self.source = None
+
+    @staticmethod
+    def _open_netlink() -> socket.socket | None:
+        family = getattr(socket, "AF_NETLINK", None)
+        if family is None:
+            return None
+        try:
+            sock = socket.socket(family, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        except OSError:
+            return None
+        try:
+            sock.bind((0, UEVENT_GROUP_KERNEL))
+        except OSError:
+            sock.close()
+            return None
+        return sock
+
+    def snapshot(self) -> dict[str, tuple[int, int] | None]:
+        """Copy of :attr:`nodes`, safe to read from any thread."""
+        with self._condition:
+            return dict(self.nodes)
+
+    def subscribe(self, callback: Callable[[DeviceEvent], None]) -> None:
+        self._subscribers.append(callback)
+
+    def publish(self, event: DeviceEvent) -> None:
+        with self._condition:
+            if event.kind == "added":
+                self.nodes[event.node] = (
+                    None if event.vendor_id is None else (event.vendor_id, event.product_id))
+                self._added += 1
+            elif event.kind == "removed":
+                self.nodes.pop(event.node, None)
+            elif event.kind == "battery" and event.path is not None:
+                self.battery[event.path] = event
+            self._condition.notify_all()
+        for callback in list(self._subscribers):
+            callback(event)
+
+    def _run(self) -> None:
+        if self._socket is not None:
+            self._watch_netlink()
+        else:
+            self._scan_sysfs()
+
+    def _watch_netlink(self) -> None:
+        assert self._socket is not None and self._wake_r is not None
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._socket, self._wake_r], [], [])
+            if self._socket not in readable:
+                continue
+            try:
+                message = self._socket.recv(65536)
+            except OSError:
+                continue
+            fields = parse_uevent(message)
+            if not fields or fields.get("SUBSYSTEM") != "hidraw":
+                continue
+            node = "/dev/" + fields.get("DEVNAME", "").rsplit("/", 1)[-1]
+            if fields.get("ACTION") == "add":
+                self._publish_added(node)
+            elif fields.get("ACTION") == "remove":
+                self._publish_removed(node)
+
+    def _scan_sysfs(self) -> None:
+        while not self._stop.wait(self.scan_interval):
+            current = hidraw_nodes(self.sysfs_root)
+            known = set(self.snapshot())
+            for node in sorted(known - current):
+                self._publish_removed(node)
+            for node in sorted(current - known):
+                self._publish_added(node)
+
+    def _publish_added(self, node: str) -> None:
+        ids = hidraw_ids(node, self.sysfs_root)
+        vendor_id, product_id = ids if ids else (None, None)
+        self.publish(DeviceEvent("added", node, vendor_id, product_id,
+                                 timestamp=time.monotonic()))
+
+    def _publish_removed(self, node: str) -> None:
+        ids = self.snapshot().get(node)
+        vendor_id, product_id = ids if ids else (None, None)
+        self.publish(DeviceEvent("removed", node, vendor_id, product_id,
+                                 timestamp=time.monotonic()))
+
+    def report_listener(self, path: bytes | str, report: bytes) -> None:
+        """Turn a status report pushed by ``path`` into a battery event."""
+        response = report[:vp.REPORT_LEN]
+        if (len(response) < vp.REPORT_LEN or
+                response[0] != vp.RESPONSE_REPORT_ID or
+                response[1] != vp.CMD_STATUS or
+                not vp.report_checksum_valid(response)):
+            return
+        try:
+            status = vp.parse_status(response)
+        except vp.ProtocolError:
+            return
+        self.publish(DeviceEvent("battery", _node_path(path), path=path,
+                                 status=status, timestamp=time.monotonic()))
+
+    def battery_age(self, path: bytes | str) -> float | None:
+        """Seconds since the last battery event for ``path``, if any."""
+        event = self.battery.get(path)
+        return None if event is None else time.monotonic() - event.timestamp
+
+    def wait_for(self, probe: Callable[[], T | None], timeout: float) -> T | None:
+        """Return ``probe()``'s first result after a hidraw node is added.
+
+        ``probe`` runs once for every node added after the call, and once
+        more at the deadline, so a device that is still present from before
+        (for example, one that has not finished resetting) is not mistaken
+        for its re-enumerated successor.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            seen = self._added
+        while True:
+            with self._condition:
+                while self._added == seen:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return probe()
+                    self._condition.wait(remaining)
+                seen = self._added
+            result = probe()
+            if result:
+                return result
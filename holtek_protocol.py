@@ -16,9 +16,18 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
-import hid
 import time
 
+import tracing
+
+try:
+    import hid
+    HIDAPI_AVAILABLE = True
+except ImportError:
+    # The protocol tables stay importable for capture and decode tools.
+    hid = None
+    HIDAPI_AVAILABLE = False
+
 
 # -- Device Constants --
 VENDOR_ID = 0x04D9
@@ -257,6 +266,156 @@ DPI_PRESETS = {
 }
 
 
+def build_read_request(addr: int, length: int) -> bytes:
+    """Build the short F2 request whose answer is fetched as a feature report."""
+    req = bytearray(16)
+    req[0] = RID_SHORT
+    req[1] = CMD_READ
+    req[2] = addr & 0xFF
+    req[3] = (addr >> 8) & 0xFF
+    req[4] = length & 0xFF
+    return bytes(req)
+
+
+def check_read_response(resp: bytes, addr: int, length: int) -> bytes:
+    """Return the data of an F2 answer after checking its header.
+
+    Header: [rid, 0x08, addr_lo, status, length, 0x00, 0xFA, 0xFA]. An answer
+    left over from an earlier request carries a different address or length.
+    """
+    if not resp:
+        raise RuntimeError(f"Read failed at 0x{addr:04X}: no response")
+    resp = bytes(resp)
+    if len(resp) < 8 + length:
+        raise RuntimeError(f"Read failed at 0x{addr:04X}: short response ({len(resp)} bytes)")
+    if resp[2] != addr & 0xFF or resp[4] != length:
+        raise RuntimeError(
+            f"Read failed at 0x{addr:04X}: unexpected header {resp[:8].hex()}")
+    return resp[8:8 + length]
+
+
+def build_memory_write(addr: int, data: bytes) -> bytes:
+    """Build an F3 write: short report for up to 8 bytes, long for up to 56.
+
+    Byte 5 MUST be 0x00 or the device will STALL (EPIPE).
+    """
+    if len(data) <= 8:
+        # Short report (16 bytes): 8 header + 8 data max
+        pkt = bytearray(16)
+        pkt[0] = RID_SHORT
+    else:
+        # Long report (64 bytes): 8 header + 56 data max
+        pkt = bytearray(64)
+        pkt[0] = RID_LONG
+    pkt[1] = CMD_WRITE_DATA
+    pkt[2] = addr & 0xFF
+    pkt[3] = (addr >> 8) & 0xFF
+    pkt[4] = len(data)
+    # pkt[5:8] = 0x00 (already zero)
+    pkt[8:8 + len(data)] = data
+    return bytes(pkt)
+
+
+# F1 commit categories (byte 3 of the commit commands above)
+CATEGORY_BUTTONS = 0x02
+CATEGORY_DPI = 0x04
+CATEGORY_LED = 0x08
+
+SHORT_DATA_LEN = 8   # F3 data bytes in a RID_SHORT report
+LONG_DATA_LEN = 56   # F3 data bytes in a RID_LONG report
+
+# Address ranges per commit category: [start, end)
+_CATEGORY_RANGES = (
+    [(CATEGORY_BUTTONS, addr, addr + 2 + 20 * 4) for addr in ADDR_BUTTONS_PROFILE]
+    + [(CATEGORY_DPI, base, base + 0x40) for base in PROFILE_BASE_ADDRS]
+    + [(CATEGORY_DPI, ADDR_DPI_SUMMARY, ADDR_DPI_SUMMARY + 10),
+       (CATEGORY_DPI, ADDR_DPI_STAGE, ADDR_DPI_STAGE + 2),
+       (CATEGORY_LED, ADDR_LED_SETTINGS, ADDR_LED_SETTINGS + 5),
+       (CATEGORY_LED, ADDR_LED_EXTRA, ADDR_LED_EXTRA + 3),
+       (CATEGORY_LED, ADDR_LED_COLOR_TABLE, ADDR_LED_PROFILE[-1] + 8)]
+)
+_CATEGORY_ORDER = (CATEGORY_BUTTONS, CATEGORY_DPI, CATEGORY_LED, 0)
+
+
+def write_category(addr: int) -> int:
+    """Commit category covering ``addr``, or 0 if no commit applies."""
+    for category, start, end in _CATEGORY_RANGES:
+        if start <= addr < end:
+            return category
+    return 0
+
+
+class WritePlan:
+    """Coalesce F3 writes into the fewest reports, ordered by commit category.
+
+    Bytes are collected by address, so later writes replace earlier ones and
+    adjacent writes merge.  :meth:`reports` emits each contiguous run of one
+    category as long reports of up to 56 data bytes (a short report when
+    8 bytes suffice); :attr:`categories` is the F1 commit mask they need.
+    """
+
+    def __init__(self):
+        self._bytes: dict[int, int] = {}
+
+    def add(self, addr: int, data: bytes) -> None:
+        if addr < 0 or addr + len(data) > 0x10000:
+            raise ValueError("Holtek writes must lie within 0x0000..0xFFFF")
+        for offset, value in enumerate(data):
+            self._bytes[addr + offset] = value
+
+    def add_packets(self, packets: list[bytes]) -> None:
+        """Add F3 packets as produced by the ``build_*_packets`` helpers."""
+        for pkt in packets:
+            if len(pkt) < 8 or pkt[1] != CMD_WRITE_DATA:
+                raise ValueError(f"not an F3 write packet: {bytes(pkt[:8]).hex()}")
+            self.add(pkt[2] | (pkt[3] << 8), bytes(pkt[8:8 + pkt[4]]))
+
+    @classmethod
+    def from_packets(cls, packets: list[bytes]) -> "WritePlan":
+        plan = cls()
+        plan.add_packets(packets)
+        return plan
+
+    @property
+    def categories(self) -> int:
+        mask = 0
+        for addr in self._bytes:
+            mask |= write_category(addr)
+        return mask
+
+    def runs(self) -> list[tuple[int, bytes]]:
+        """Contiguous ``(addr, data)`` runs, grouped in commit-category order."""
+        by_category: dict[int, list[int]] = {}
+        for addr in sorted(self._bytes):
+            by_category.setdefault(write_category(addr), []).append(addr)
+        runs: list[tuple[int, bytes]] = []
+        for category in _CATEGORY_ORDER:
+            start = previous = None
+            data = bytearray()
+            for addr in by_category.get(category, ()):
+                if previous is not None and addr != previous + 1:
+                    runs.append((start, bytes(data)))
+                    data = bytearray()
+                if not data:
+                    start = addr
+                data.append(self._bytes[addr])
+                previous = addr
+            if data:
+                runs.append((start, bytes(data)))
+        return runs
+
+    def reports(self) -> list[bytes]:
+        reports = []
+        for addr, data in self.runs():
+            for offset in range(0, len(data), LONG_DATA_LEN):
+                reports.append(build_memory_write(
+                    addr + offset, data[offset:offset + LONG_DATA_LEN]))
+        return reports
+
+    def __len__(self) -> int:
+        return len(self._bytes)
+
+
 class HoltekDevice:
     """Device wrapper for Holtek Venus MMO (04D9:FC55).
 
@@ -264,14 +423,19 @@ class HoltekDevice:
     Communication: send_feature_report + get_feature_report (no interrupt reads).
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, handle_factory=None):
         self._path = path
         self._dev: Optional[hid.device] = None
+        # Builds the hid.device-like handle; a simulator can stand in for
+        # hidapi here.
+        self._handle_factory = handle_factory
 
     def open(self) -> None:
         if self._dev is not None:
             return
-        dev = hid.device()
+        if self._handle_factory is None and not HIDAPI_AVAILABLE:
+            raise RuntimeError("python-hidapi is not installed")
+        dev = self._handle_factory() if self._handle_factory else hid.device()
         dev.open_path(self._path.encode() if isinstance(self._path, str) else self._path)
         dev.set_nonblocking(True)
         self._dev = dev
@@ -286,15 +450,19 @@ class HoltekDevice:
         """Send a feature report (raw bytes including report ID)."""
         if self._dev is None:
             raise RuntimeError("device not open")
-        self._dev.send_feature_report(data)
+        args = {"command": f"0x{data[1]:02x}", "bytes": len(data)}
+        if data[1] in (CMD_READ, CMD_WRITE_DATA):
+            args["address"] = f"0x{data[3]:02x}{data[2]:02x}"
+        with tracing.span("send_feature", "holtek", **args):
+            self._dev.send_feature_report(data)
 
     def get_feature(self, report_id: int, size: int) -> bytes:
         """Get a feature report response."""
         if self._dev is None:
             raise RuntimeError("device not open")
-        # Prepend report ID for get_feature_report
-        buf = bytes([report_id]) + bytes(size - 1)
-        result = self._dev.get_feature_report(report_id, size)
+        with tracing.span("get_feature", "holtek", report_id=report_id,
+                          bytes=size):
+            result = self._dev.get_feature_report(report_id, size)
         return bytes(result) if result else b""
 
     def send_reliable(self, report: bytes, timeout_ms: int = 500) -> bool:
@@ -303,8 +471,10 @@ class HoltekDevice:
         Holtek has no ACK mechanism. We just send and wait briefly.
         Always returns True unless an exception occurs.
         """
-        self.send_feature(report)
-        time.sleep(0.008)  # 8ms inter-packet delay
+        with tracing.span("send_reliable", "holtek",
+                          command=f"0x{report[1]:02x}", settle_ms=8):
+            self.send_feature(report)
+            time.sleep(0.008)  # 8ms inter-packet delay
         return True
 
     def read_memory(self, addr: int, length: int) -> bytes:
@@ -316,63 +486,37 @@ class HoltekDevice:
         if self._dev is None:
             raise RuntimeError("device not open")
 
-        addr_lo = addr & 0xFF
-        addr_hi = (addr >> 8) & 0xFF
-
-        # Build read request
-        req = bytearray(16)
-        req[0] = RID_SHORT
-        req[1] = CMD_READ
-        req[2] = addr_lo
-        req[3] = addr_hi
-        req[4] = length & 0xFF
-
-        self._dev.send_feature_report(bytes(req))
+        self.send_feature(build_read_request(addr, length))
         time.sleep(0.005)
 
-        # Get response
-        resp = self._dev.get_feature_report(RID_SHORT, 16)
-        if not resp:
-            raise RuntimeError(f"Read failed at 0x{addr:04X}: no response")
-
-        resp = bytes(resp)
-        # Verify response header
-        if len(resp) < 8 + length:
-            raise RuntimeError(f"Read failed at 0x{addr:04X}: short response ({len(resp)} bytes)")
-
-        # Data starts at offset 8 (after header: rid, 0x08, addr_lo, status, length, 0x00, 0xFA, 0xFA)
-        return resp[8:8 + length]
+        resp = self.get_feature(RID_SHORT, 16)
+        return check_read_response(resp, addr, length)
 
     def read_memory_long(self, addr: int, length: int) -> bytes:
-        """Read device memory using long (64-byte) feature reports for larger reads."""
+        """Read up to 56 bytes, answered on the long (64-byte) report."""
         if self._dev is None:
             raise RuntimeError("device not open")
+        if length > LONG_DATA_LEN:
+            raise ValueError(f"At most {LONG_DATA_LEN} bytes per read, got {length}")
 
-        addr_lo = addr & 0xFF
-        addr_hi = (addr >> 8) & 0xFF
-
-        # Build read request using short report
-        req = bytearray(16)
-        req[0] = RID_SHORT
-        req[1] = CMD_READ
-        req[2] = addr_lo
-        req[3] = addr_hi
-        req[4] = length & 0xFF
-
-        self._dev.send_feature_report(bytes(req))
+        # The request is always a short report
+        self.send_feature(build_read_request(addr, length))
         time.sleep(0.005)
 
         # For larger reads, get response on long report ID
-        if length > 8:
-            resp = self._dev.get_feature_report(RID_LONG, 64)
+        if length > SHORT_DATA_LEN:
+            resp = self.get_feature(RID_LONG, 64)
         else:
-            resp = self._dev.get_feature_report(RID_SHORT, 16)
-
-        if not resp:
-            raise RuntimeError(f"Read failed at 0x{addr:04X}: no response")
+            resp = self.get_feature(RID_SHORT, 16)
+        return check_read_response(resp, addr, length)
 
-        resp = bytes(resp)
-        return resp[8:8 + length]
+    def read_range(self, addr: int, length: int) -> bytes:
+        """Read any span in as few long-report round-trips as possible."""
+        data = bytearray()
+        while len(data) < length:
+            size = min(LONG_DATA_LEN, length - len(data))
+            data.extend(self.read_memory_long(addr + len(data), size))
+        return bytes(data)
 
     def write_memory(self, addr: int, data: bytes) -> None:
         """Write data to device memory using F3 command.
@@ -381,31 +525,7 @@ class HoltekDevice:
         Data starts at byte 8. Max 8 data bytes for short report, 56 for long.
         Byte 5 MUST be 0x00 or the device will STALL (EPIPE).
         """
-        addr_lo = addr & 0xFF
-        addr_hi = (addr >> 8) & 0xFF
-
-        if len(data) <= 8:
-            # Short report (16 bytes): 8 header + 8 data max
-            pkt = bytearray(16)
-            pkt[0] = RID_SHORT
-            pkt[1] = CMD_WRITE_DATA
-            pkt[2] = addr_lo
-            pkt[3] = addr_hi
-            pkt[4] = len(data)
-            # pkt[5:8] = 0x00 (already zero)
-            pkt[8:8 + len(data)] = data
-            self.send_feature(bytes(pkt))
-        else:
-            # Long report (64 bytes): 8 header + 56 data max
-            pkt = bytearray(64)
-            pkt[0] = RID_LONG
-            pkt[1] = CMD_WRITE_DATA
-            pkt[2] = addr_lo
-            pkt[3] = addr_hi
-            pkt[4] = len(data)
-            # pkt[5:8] = 0x00 (already zero)
-            pkt[8:8 + len(data)] = data
-            self.send_feature(bytes(pkt))
+        self.send_feature(build_memory_write(addr, data))
         time.sleep(0.008)
 
     def enter_write_mode(self) -> None:
@@ -466,6 +586,19 @@ class HoltekDevice:
         if reset:
             self.reset_device()
 
+    def apply_plan(self, plan: WritePlan, reset: bool = True) -> None:
+        """Send a :class:`WritePlan` in one write session with one commit."""
+        self.enter_write_mode()
+        for report in plan.reports():
+            self.send_reliable(report)
+        self.commit_writes(categories=plan.categories, reset=reset)
+
+    def coalesce_writes(self, packets: list[bytes]) -> list[bytes]:
+        """Merge F3 packets into long reports; other reports pass unchanged."""
+        writes = [pkt for pkt in packets if pkt[1] == CMD_WRITE_DATA]
+        others = [pkt for pkt in packets if pkt[1] != CMD_WRITE_DATA]
+        return WritePlan.from_packets(writes).reports() + others
+
     def reset_device(self) -> None:
         """Trigger a device reset so firmware reloads settings from flash.
 
@@ -509,41 +642,17 @@ class HoltekDevice:
 
         base = PROFILE_BASE_ADDRS[profile]
 
-        # Read header to get stage count
         header = self.read_memory(base, 4)
-        num_stages = header[0]
-        if num_stages == 0 or num_stages > 10:
-            num_stages = 5  # fallback
-
         # Read DPI entries (6 bytes each, starting at base+4)
         entry_addr = base + 4
-        total_bytes = num_stages * DPI_ENTRY_SIZE
+        total_bytes = dpi_stage_count(header) * DPI_ENTRY_SIZE
         # Read in chunks
         raw_data = bytearray()
         for offset in range(0, total_bytes, 8):
             addr = entry_addr + offset
             chunk = self.read_memory(addr, min(8, total_bytes - offset))
             raw_data.extend(chunk)
-
-        dpi_list: list[int] = []
-        color_indices: list[int] = []
-        for i in range(num_stages):
-            entry_start = i * DPI_ENTRY_SIZE
-            if entry_start + 2 >= len(raw_data):
-                break
-            raw_dpi = raw_data[entry_start + 1]  # byte 1 = raw DPI value
-            if raw_dpi == 0:
-                break
-            dpi_list.append(raw_to_dpi(raw_dpi))
-            color_indices.append(raw_data[entry_start + 2])
-        current_stage = min(header[2], max(0, len(dpi_list) - 1))
-        return {
-            "stages": dpi_list,
-            "colors": color_indices,
-            "current_stage": current_stage,
-            "header": bytes(header),
-            "raw_entries": bytes(raw_data),
-        }
+        return parse_dpi_profile(header, raw_data)
 
     def read_dpi_stages(self, profile: int = 0) -> list[int]:
         """Read DPI stage values from the per-profile region."""
@@ -614,17 +723,7 @@ class HoltekDevice:
             raise ValueError(f"Profile must be 0-4, got {profile}")
 
         addr = ADDR_LED_PROFILE[profile]
-        data = self.read_memory(addr, 8)
-
-        return {
-            'r': data[1],
-            'g': data[2],
-            'b': data[3],
-            'mode': data[4],
-            'brightness': data[5],
-            'speed': data[6],
-            'raw': bytes(data),
-        }
+        return parse_led_settings(self.read_memory(addr, 8))
 
     def write_led_settings(self, r: int, g: int, b: int,
                            mode: int = 3, brightness: int = 5,
@@ -662,6 +761,164 @@ class HoltekDevice:
         self.reset_device()
 
 
+def dpi_stage_count(header: bytes) -> int:
+    """Stage count from a per-profile DPI header, 5 if it is implausible."""
+    num_stages = header[0]
+    if num_stages == 0 or num_stages > 10:
+        return 5  # fallback
+    return num_stages
+
+
+def parse_dpi_profile(header: bytes, raw_data: bytes) -> dict:
+    """Decode a DPI header and its 6-byte stage entries."""
+    dpi_list: list[int] = []
+    color_indices: list[int] = []
+    for i in range(dpi_stage_count(header)):
+        entry_start = i * DPI_ENTRY_SIZE
+        if entry_start + 2 >= len(raw_data):
+            break
+        raw_dpi = raw_data[entry_start + 1]  # byte 1 = raw DPI value
+        if raw_dpi == 0:
+            break
+        dpi_list.append(raw_to_dpi(raw_dpi))
+        color_indices.append(raw_data[entry_start + 2])
+    current_stage = min(header[2], max(0, len(dpi_list) - 1))
+    return {
+        "stages": dpi_list,
+        "colors": color_indices,
+        "current_stage": current_stage,
+        "header": bytes(header),
+        "raw_entries": bytes(raw_data),
+    }
+
+
+def parse_led_settings(data: bytes) -> dict:
+    """Decode an 8-byte per-profile LED record."""
+    return {
+        'r': data[1],
+        'g': data[2],
+        'b': data[3],
+        'mode': data[4],
+        'brightness': data[5],
+        'speed': data[6],
+        'raw': bytes(data),
+    }
+
+
+BUTTON_MAP_LEN = 2 + 20 * 4  # 2-byte count + 20×4 data bytes
+
+# Everything read_all_config needs for all five profiles: the settings block
+# (DPI summary, LED summary, active profile), the five DPI and button records,
+# and the per-profile LED table.
+IMAGE_SPANS = (
+    (ADDR_DPI_SUMMARY, ADDR_BUTTONS_PROFILE[-1] + BUTTON_MAP_LEN - ADDR_DPI_SUMMARY),
+    (ADDR_LED_PROFILE[0], len(ADDR_LED_PROFILE) * 8),
+)
+
+# What a profile file carries: each profile's DPI and button records and the
+# per-profile LED table.  The gaps between records are not written back.
+PROFILE_SPANS = tuple(
+    (base, button_map + BUTTON_MAP_LEN - base)
+    for base, button_map in zip(PROFILE_BASE_ADDRS, ADDR_BUTTONS_PROFILE)
+) + ((ADDR_LED_PROFILE[0], len(ADDR_LED_PROFILE) * 8),)
+
+
+class HoltekImage:
+    """Cached copy of the configuration regions of every profile.
+
+    :meth:`read` fetches :data:`IMAGE_SPANS` with 56-byte long reports, about
+    twenty round-trips in all; :meth:`config` then decodes any profile from
+    memory, so switching profiles does not touch USB.  A read that fails
+    leaves a gap, recorded in :attr:`errors`, instead of aborting the image.
+    """
+
+    def __init__(self, spans: dict[int, bytes],
+                 errors: dict[int, tuple[int, Exception]] | None = None):
+        self.spans = {start: bytes(data) for start, data in spans.items()}
+        # Start address of each chunk that failed -> (length, error).
+        self.errors = dict(errors or {})
+
+    @classmethod
+    def read(cls, device: HoltekDevice) -> "HoltekImage":
+        spans: dict[int, bytes] = {}
+        errors: dict[int, tuple[int, Exception]] = {}
+        for start, length in IMAGE_SPANS:
+            for addr in range(start, start + length, LONG_DATA_LEN):
+                size = min(LONG_DATA_LEN, start + length - addr)
+                try:
+                    spans[addr] = device.read_memory_long(addr, size)
+                except Exception as exc:
+                    errors[addr] = (size, exc)
+        return cls(spans, errors)
+
+    def read_memory(self, addr: int, length: int) -> bytes:
+        data = bytearray()
+        while len(data) < length:
+            at = addr + len(data)
+            for start, chunk in self.spans.items():
+                if start <= at < start + len(chunk):
+                    data += chunk[at - start:at - start + length - len(data)]
+                    break
+            else:
+                for start, (size, error) in self.errors.items():
+                    if start <= at < start + size:
+                        raise RuntimeError(
+                            f"Read failed at 0x{at:04X}: {error}") from error
+                raise ValueError(f"0x{addr:04X}+{length} is outside the cached image")
+        return bytes(data)
+
+    @property
+    def active_profile(self) -> int:
+        return self.read_memory(ADDR_ACTIVE_PROFILE, 1)[0] & 0x7F
+
+    def profile_regions(self) -> list[tuple[int, bytes]]:
+        """``(start, data)`` for every :data:`PROFILE_SPANS` entry."""
+        return [(start, self.read_memory(start, length))
+                for start, length in PROFILE_SPANS]
+
+    def config(self, profile: int | None = None) -> dict:
+        """Decode one profile with the same keys as :func:`read_all_config`."""
+        config = {'active_profile': self.active_profile}
+        if profile is not None and 0 <= profile <= 4:
+            read_profile = profile
+        else:
+            read_profile = config['active_profile']
+        # Firmware stores 0-4; a corrupt byte must not index past the table.
+        read_profile = min(read_profile, 4)
+
+        # Read all DPI metadata together so applying an edit can preserve the
+        # per-stage color indices and current-stage field.
+        base = PROFILE_BASE_ADDRS[read_profile]
+        try:
+            header = self.read_memory(base, 4)
+            dpi_profile = parse_dpi_profile(header, self.read_memory(
+                base + 4, dpi_stage_count(header) * DPI_ENTRY_SIZE))
+            config['dpi_stages'] = dpi_profile['stages']
+            config['dpi_colors'] = dpi_profile['colors']
+            config['dpi_stage_current'] = dpi_profile['current_stage']
+        except RuntimeError:
+            config['dpi_stages'] = []
+            config['dpi_colors'] = []
+            config['dpi_stage_current'] = 0
+
+        try:
+            config['led'] = parse_led_settings(
+                self.read_memory(ADDR_LED_PROFILE[read_profile], 8))
+        except RuntimeError:
+            config['led'] = {}
+
+        # DPI and LED summary region (0x20-0x3F) for backward compat
+        settings_data = self.read_memory(ADDR_DPI_SUMMARY, 0x20)
+        config['dpi_raw'] = settings_data[0:16]
+        config['led_raw'] = settings_data[16:32]
+
+        button_data = self.read_memory(
+            ADDR_BUTTONS_PROFILE[read_profile], BUTTON_MAP_LEN)
+        config['raw_button_data'] = button_data
+        config['buttons'] = parse_button_map(button_data)
+        return config
+
+
 def read_all_config(device: HoltekDevice, profile: int | None = None) -> dict:
     """Read full device configuration for a specific profile.
 
@@ -670,59 +927,10 @@ def read_all_config(device: HoltekDevice, profile: int | None = None) -> dict:
         profile: Profile index (0-4). If None, reads the active profile from device.
 
     Returns dict with keys: 'dpi_stages', 'dpi_stage_current', 'active_profile',
-    'led', 'buttons', 'raw_button_data', 'dpi_raw', 'led_raw'
+    'led', 'buttons', 'raw_button_data', 'dpi_raw', 'led_raw'. Callers that
+    switch profiles should keep a :class:`HoltekImage` instead.
     """
-    config = {}
-
-    # Read active profile from device
-    config['active_profile'] = device.read_active_profile()
-
-    # Use specified profile or fall back to active
-    if profile is not None and 0 <= profile <= 4:
-        read_profile = profile
-    else:
-        read_profile = config['active_profile']
-
-    # Read all DPI metadata together so applying an edit can preserve the
-    # per-stage color indices and current-stage field.
-    try:
-        dpi_profile = device.read_dpi_profile(read_profile)
-        config['dpi_stages'] = dpi_profile['stages']
-        config['dpi_colors'] = dpi_profile['colors']
-        config['dpi_stage_current'] = dpi_profile['current_stage']
-    except Exception:
-        config['dpi_stages'] = []
-        config['dpi_colors'] = []
-        config['dpi_stage_current'] = 0
-
-    # Read LED settings from per-profile address
-    try:
-        config['led'] = device.read_led_settings(read_profile)
-    except Exception:
-        config['led'] = {}
-
-    # Read DPI summary region (0x20-0x2F) for backward compat
-    settings_data = bytearray()
-    for addr in range(0x20, 0x40, 8):
-        chunk = device.read_memory(addr, 8)
-        settings_data.extend(chunk)
-    config['dpi_raw'] = bytes(settings_data[0:16])
-    config['led_raw'] = bytes(settings_data[16:32])
-
-    # Read button map region for the selected profile
-    btn_base = ADDR_BUTTONS_PROFILE[read_profile]
-    btn_end = btn_base + 2 + 20 * 4  # 2-byte count + 20×4 data bytes
-    button_data = bytearray()
-    for addr in range(btn_base, btn_end, 8):
-        chunk_len = min(8, btn_end - addr)
-        chunk = device.read_memory(addr, chunk_len)
-        button_data.extend(chunk)
-
-    # Parse buttons
-    config['raw_button_data'] = bytes(button_data)
-    config['buttons'] = parse_button_map(button_data)
-
-    return config
+    return HoltekImage.read(device).config(profile)
 
 
 def parse_button_map(data: bytes) -> list[dict]:
@@ -1015,6 +1223,8 @@ def find_device_path() -> Optional[str]:
 
     Returns the path string, or None if not found.
     """
+    if not HIDAPI_AVAILABLE:
+        return None
     for info in hid.enumerate(VENDOR_ID, PRODUCT_ID):
         if info["interface_number"] == INTERFACE:
             path = info["path"]
@@ -0,0 +1,240 @@
+"""Simulated Holtek firmware (04D9:FC55) behind the ``hid.device`` surface.
+
+:class:`SimulatedHoltek` answers the feature reports
+:class:`holtek_protocol.HoltekDevice` sends the way the mouse is understood
+to: F3 writes land in a 64 KiB flash image but only reach the settings the
+firmware runs with (:attr:`SimulatedHoltek.active`) on the matching F1
+category commit or a reset; F2 reads are answered on the short or long
+report ID depending on their length; F5 changes the polling rate at once;
+and the F1 reset drops the USB connection, after which the mouse
+re-enumerates on a new hidraw path with its settings reloaded from flash.
+
+Holtek reports are never acknowledged, which is why the protocol module
+sleeps after each one.  The simulator enforces how long the firmware is
+busy after each command; a report arriving earlier is ignored and counted
+in :attr:`SimulatedHoltek.too_fast`, and a read answer fetched before it is
+ready is the previous one.  The default times are assumptions rather than
+measurements -- they exist so pacing changes can be compared and
+regressions caught offline::
+
+    sim = SimulatedHoltek()
+    device = hp.HoltekDevice(sim.path, handle_factory=sim.handle)
+"""
+from __future__ import annotations
+
+import errno
+import threading
+import time
+from collections import Counter
+
+import holtek_protocol as hp
+
+ADDRESS_SPACE = 0x10000
+FACTORY_DPI = [800, 1600, 3200, 6400, 12000]
+FACTORY_COLORS = [(0xFF, 0x00, 0x00), (0x00, 0x00, 0xFF), (0x00, 0xFF, 0x00),
+                  (0xFF, 0x00, 0xFF), (0xFF, 0xFF, 0x00)]
+
+
+def factory_image() -> bytes:
+    """Flash holding the factory profiles: five DPI stages, the default
+    button map and one LED colour per profile."""
+    image = bytearray(ADDRESS_SPACE)
+    for profile, (r, g, b) in enumerate(FACTORY_COLORS):
+        packets = hp.build_dpi_packets(FACTORY_DPI, profile=profile)
+        packets += hp.build_led_packets(r, g, b, profile=profile)
+        for pkt in packets:
+            addr = pkt[2] | (pkt[3] << 8)
+            image[addr:addr + pkt[4]] = pkt[8:8 + pkt[4]]
+        base = hp.ADDR_BUTTONS_PROFILE[profile]
+        image[base:base + 2] = len(hp.DEFAULT_BUTTON_MAP).to_bytes(2, "little")
+        image[base + 2:base + hp.BUTTON_MAP_LEN] = bytes(
+            value for entry in hp.DEFAULT_BUTTON_MAP for value in entry)
+    return bytes(image)
+
+
+class SimulatedHoltek:
+    """Firmware state shared by every handle opened on the simulated mouse."""
+
+    def __init__(self, image: bytes | None = None, *,
+                 write_time: float = 0.005, read_time: float = 0.003,
+                 commit_time: float = 0.008, polling_time: float = 0.05,
+                 reenumerate_time: float = 1.0):
+        if image is not None and len(image) != ADDRESS_SPACE:
+            raise ValueError(f"flash image must be {ADDRESS_SPACE} bytes")
+        self.flash = bytearray(image if image is not None else factory_image())
+        self.active = bytearray(self.flash)
+        self.write_time = write_time
+        self.read_time = read_time
+        self.commit_time = commit_time
+        self.polling_time = polling_time
+        self.reenumerate_time = reenumerate_time
+        self.polling_rate = 1000
+        self.write_mode = False
+        # Reports received and reports ignored for arriving while the
+        # firmware was busy, by command byte; F1 commits by category; answers
+        # fetched before they were ready; resets.
+        self.received: Counter[int] = Counter()
+        self.too_fast: Counter[int] = Counter()
+        self.commits: Counter[int] = Counter()
+        self.stale_reads = 0
+        self.resets = 0
+        self._uncommitted: set[int] = set()
+        self._answers: dict[int, bytes] = {}
+        self._previous: dict[int, bytes] = {}
+        self._ready_at = 0.0
+        self._busy_until = float("-inf")
+        self._generation = 0
+        self._present_at = float("-inf")
+        self._lock = threading.Lock()
+
+    # -- bus ---------------------------------------------------------------
+
+    @property
+    def path(self) -> str | None:
+        """Current hidraw path, or None while the mouse is re-enumerating."""
+        if time.monotonic() < self._present_at:
+            return None
+        return f"/dev/hidraw-holtek{self._generation}"
+
+    def enumerate(self, vendor_id: int = 0, product_id: int = 0) -> list[dict]:
+        """What ``hid.enumerate`` would list for the mouse's config interface."""
+        path = self.path
+        if path is None or vendor_id not in (0, hp.VENDOR_ID) \
+                or product_id not in (0, hp.PRODUCT_ID):
+            return []
+        return [{"path": path.encode(), "vendor_id": hp.VENDOR_ID,
+                 "product_id": hp.PRODUCT_ID, "interface_number": hp.INTERFACE}]
+
+    def handle(self) -> "_Handle":
+        """Factory for ``HoltekDevice(handle_factory=...)``."""
+        return _Handle(self)
+
+    # -- firmware ----------------------------------------------------------
+
+    def _feature(self, generation: int, report: bytes) -> int:
+        now = time.monotonic()
+        with self._lock:
+            self._check_connected(generation)
+            rid, command = report[0], report[1]
+            if (rid, len(report)) not in ((hp.RID_SHORT, 16), (hp.RID_LONG, 64)):
+                raise OSError(errno.EPIPE, "feature report stalled")
+            self.received[command] += 1
+            if now < self._busy_until:
+                self.too_fast[command] += 1
+                return len(report)
+            if command == hp.CMD_WRITE_DATA:
+                self._write(report)
+                self._busy_until = now + self.write_time
+            elif command == hp.CMD_READ:
+                self._read(report, now)
+                self._busy_until = now + self.read_time
+            elif command == hp.CMD_WRITE_CTRL:
+                self._control(report, now)
+            elif command == hp.CMD_POLLING:
+                self.polling_rate = hp.POLLING_CODE_TO_RATE.get(report[2], self.polling_rate)
+                self._busy_until = now + self.polling_time
+        return len(report)
+
+    def _write(self, report: bytes) -> None:
+        addr = report[2] | (report[3] << 8)
+        length = report[4]
+        capacity = hp.SHORT_DATA_LEN if report[0] == hp.RID_SHORT else hp.LONG_DATA_LEN
+        if any(report[5:8]) or length > capacity or addr + length > ADDRESS_SPACE:
+            raise OSError(errno.EPIPE, "F3 write stalled")
+        self.flash[addr:addr + length] = report[8:8 + length]
+        self._uncommitted.update(range(addr, addr + length))
+
+    def _read(self, report: bytes, now: float) -> None:
+        addr = report[2] | (report[3] << 8)
+        length = min(report[4], hp.LONG_DATA_LEN)
+        rid, size = (hp.RID_LONG, 64) if length > hp.SHORT_DATA_LEN else (hp.RID_SHORT, 16)
+        # [rid, 0x08, addr_lo, status, length, 0x00, 0xFA, 0xFA, data...]
+        answer = bytes((rid, 0x08, addr & 0xFF, 0x00, length, 0x00, 0xFA, 0xFA))
+        answer += bytes(self.flash[addr:addr + length])
+        self._previous = dict(self._answers)
+        self._answers[rid] = answer.ljust(size, b"\x00")
+        self._ready_at = now + self.read_time
+
+    def _control(self, report: bytes, now: float) -> None:
+        mode, mask = report[2], report[3]
+        if mode == 0x00 and mask == 0x00:
+            self._reset(now)
+            return
+        self._busy_until = now + self.commit_time
+        if mode != 0x02:
+            return
+        if mask & 0x01:
+            self.write_mode = True
+        for category in (hp.CATEGORY_BUTTONS, hp.CATEGORY_DPI, hp.CATEGORY_LED):
+            if mask & category:
+                self.commits[category] += 1
+                self._apply(lambda addr, category=category:
+                            hp.write_category(addr) == category)
+        if mask & 0x10:
+            self.write_mode = False
+
+    def _apply(self, selected) -> None:
+        for addr in [addr for addr in self._uncommitted if selected(addr)]:
+            self.active[addr] = self.flash[addr]
+            self._uncommitted.discard(addr)
+
+    def _reset(self, now: float) -> None:
+        """Drop off the bus, reload from flash and come back on a new node."""
+        self.resets += 1
+        self.active[:] = self.flash
+        self._uncommitted.clear()
+        self._answers.clear()
+        self._previous.clear()
+        self.write_mode = False
+        self._generation += 1
+        self._present_at = now + self.reenumerate_time
+        self._busy_until = float("-inf")
+
+    def _get_feature(self, generation: int, report_id: int, size: int) -> list[int]:
+        with self._lock:
+            self._check_connected(generation)
+            answers = self._answers
+            if time.monotonic() < self._ready_at:
+                self.stale_reads += 1
+                answers = self._previous
+            answer = answers.get(report_id, bytes([report_id]))
+        return list(answer[:size].ljust(size, b"\x00"))
+
+    def _check_connected(self, generation: int) -> None:
+        if generation != self._generation:
+            raise OSError(errno.ENODEV, "device disconnected")
+
+    def _connect(self, path: bytes | str) -> int:
+        if isinstance(path, bytes):
+            path = path.decode()
+        if path != self.path:
+            raise OSError(errno.ENOENT, f"no simulated Holtek mouse at {path}")
+        return self._generation
+
+
+class _Handle:
+    """One open hidraw node; it stops working when the mouse resets."""
+
+    def __init__(self, sim: SimulatedHoltek):
+        self._sim = sim
+        self._generation: int | None = None
+
+    def open_path(self, path: bytes | str) -> None:
+        self._generation = self._sim._connect(path)
+
+    def set_nonblocking(self, value: bool) -> None:
+        pass
+
+    def close(self) -> None:
+        self._generation = None
+
+    def send_feature_report(self, report) -> int:
+        return self._sim._feature(self._opened(), bytes(report))
+
+    def get_feature_report(self, report_id: int, size: int) -> list[int]:
+        return self._sim._get_feature(self._opened(), report_id, size)
+
+    def _opened(self) -> int:
+        if self._generation is None:
+            raise OSError(errno.EBADF, "device not open")
+        return self._generation
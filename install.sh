@@ -10,6 +10,10 @@ sudo install -Dm644 holtek_protocol.py /usr/share/venusprolinux/holtek_protocol.
 sudo install -Dm644 device_driver.py /usr/share/venusprolinux/device_driver.py
 sudo install -Dm644 staging_manager.py /usr/share/venusprolinux/staging_manager.py
 sudo install -Dm644 transaction_controller.py /usr/share/venusprolinux/transaction_controller.py
+sudo install -Dm644 profile_container.py /usr/share/venusprolinux/profile_container.py
+sudo install -Dm644 device_monitor.py /usr/share/venusprolinux/device_monitor.py
+sudo install -Dm644 venusctl.py /usr/share/venusprolinux/venusctl.py
+sudo install -Dm644 tracing.py /usr/share/venusprolinux/tracing.py
 sudo install -Dm644 mouseimg.png /usr/share/venusprolinux/mouseimg.png
 
 # Install icon
@@ -20,6 +24,7 @@ sudo install -Dm644 packaging/linux/venusprolinux.desktop /usr/share/application
 
 # Install the same launcher used by distribution packages.
 sudo install -Dm755 packaging/linux/venusprolinux /usr/bin/venusprolinux
+sudo install -Dm755 packaging/linux/venusctl /usr/bin/venusctl
 
 # Install metadata used by desktop software centers.
 sudo install -Dm644 com.github.es00bac.venusprolinux.appdata.xml \
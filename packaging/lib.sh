@@ -48,12 +48,18 @@ venus_install_payload() {
         "${VENUS_REPO_ROOT}/device_driver.py" \
         "${VENUS_REPO_ROOT}/staging_manager.py" \
         "${VENUS_REPO_ROOT}/transaction_controller.py" \
+        "${VENUS_REPO_ROOT}/profile_container.py" \
+        "${VENUS_REPO_ROOT}/device_monitor.py" \
+        "${VENUS_REPO_ROOT}/venusctl.py" \
+        "${VENUS_REPO_ROOT}/tracing.py" \
         "${VENUS_REPO_ROOT}/mouseimg.png" \
         "${VENUS_REPO_ROOT}/icon.png" \
         "${app_dir}/"
 
     install -m755 "${VENUS_REPO_ROOT}/packaging/linux/venusprolinux" \
         "${root}${prefix}/bin/venusprolinux"
+    install -m755 "${VENUS_REPO_ROOT}/packaging/linux/venusctl" \
+        "${root}${prefix}/bin/venusctl"
     install -m644 "${VENUS_REPO_ROOT}/packaging/linux/${VENUS_APP_ID}.desktop" \
         "${applications_dir}/${VENUS_APP_ID}.desktop"
     install -m644 "${VENUS_REPO_ROOT}/icon.png" \
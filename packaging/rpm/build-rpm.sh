@@ -22,6 +22,10 @@ install -m644 \
     "${VENUS_REPO_ROOT}/device_driver.py" \
     "${VENUS_REPO_ROOT}/staging_manager.py" \
     "${VENUS_REPO_ROOT}/transaction_controller.py" \
+    "${VENUS_REPO_ROOT}/profile_container.py" \
+    "${VENUS_REPO_ROOT}/device_monitor.py" \
+    "${VENUS_REPO_ROOT}/venusctl.py" \
+    "${VENUS_REPO_ROOT}/tracing.py" \
     "${VENUS_REPO_ROOT}/mouseimg.png" \
     "${VENUS_REPO_ROOT}/icon.png" \
     "${VENUS_REPO_ROOT}/${VENUS_APP_ID}.appdata.xml" \
@@ -35,6 +39,8 @@ install -m644 "${VENUS_REPO_ROOT}/packaging/linux/${VENUS_APP_ID}.desktop" \
     "${SOURCE_DIR}/packaging/linux/"
 install -m755 "${VENUS_REPO_ROOT}/packaging/linux/venusprolinux" \
     "${SOURCE_DIR}/packaging/linux/venusprolinux"
+install -m755 "${VENUS_REPO_ROOT}/packaging/linux/venusctl" \
+    "${SOURCE_DIR}/packaging/linux/venusctl"
 
 tar -C "${BUILD_ROOT}" -czf \
     "${TOPDIR}/SOURCES/${VENUS_PACKAGE_NAME}-${VERSION}.tar.gz" \
@@ -38,10 +38,13 @@ install -d \
 
 install -m644 \
     venus_gui.py venus_protocol.py holtek_protocol.py device_driver.py \
-    staging_manager.py transaction_controller.py mouseimg.png icon.png \
+    staging_manager.py transaction_controller.py profile_container.py \
+    device_monitor.py venusctl.py tracing.py mouseimg.png icon.png \
     %{buildroot}%{_datadir}/%{name}/
 install -m755 packaging/linux/venusprolinux \
     %{buildroot}%{_bindir}/venusprolinux
+install -m755 packaging/linux/venusctl \
+    %{buildroot}%{_bindir}/venusctl
 install -m644 packaging/linux/%{app_id}.desktop \
     %{buildroot}%{_datadir}/applications/%{app_id}.desktop
 install -m644 icon.png \
@@ -55,6 +58,7 @@ install -m644 packaging/linux/99-venus-pro.rules \
 %license LICENSE
 %doc README.md PROTOCOL.md docs/MACRO_EDITOR.md
 %{_bindir}/venusprolinux
+%{_bindir}/venusctl
 %{_datadir}/%{name}/
 %{_datadir}/applications/%{app_id}.desktop
 %{_datadir}/icons/hicolor/1024x1024/apps/%{app_id}.png
@@ -0,0 +1,199 @@
+"""SQLite index of the reports in decoded USB captures.
+
+Each Areson or Holtek report becomes one row of the ``packets`` table, with
+the fields a protocol question is usually asked about pulled out of the raw
+bytes and indexed: command, address, capture label and, for writes to the
+Areson button table, the action type.  :meth:`PacketIndex.query` then answers
+things like "every write to 0x0060-0x009F with type 0x06" without rescanning
+any capture::
+
+    with PacketIndex("artifacts/decoded/packets.sqlite") as index:
+        for packet in index.query(command=vp.CMD_WRITE, address=(0x60, 0x9F),
+                                  button_type=vp.BUTTON_TYPE_MACRO):
+            print(packet.capture, packet.data.hex())
+
+``tools/batch_decode.py`` keeps the index in step with the capture corpus.
+Captures are stored with the hash of their file, so re-adding an unchanged
+capture is a no-op.
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import pcap_reader
+
+SCHEMA_VERSION = 1
+BUTTON_TABLE = (0x0060, 0x009F)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    sha256 TEXT
+);
+CREATE TABLE IF NOT EXISTS packets (
+    capture_id INTEGER NOT NULL REFERENCES captures(id) ON DELETE CASCADE,
+    frame INTEGER NOT NULL,
+    time REAL NOT NULL,
+    direction TEXT NOT NULL,
+    protocol TEXT NOT NULL,
+    report_id INTEGER NOT NULL,
+    command INTEGER NOT NULL,
+    address INTEGER,
+    length INTEGER,
+    button_type INTEGER,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS captures_label ON captures(label);
+CREATE INDEX IF NOT EXISTS packets_capture ON packets(capture_id, frame);
+CREATE INDEX IF NOT EXISTS packets_command ON packets(command, direction);
+CREATE INDEX IF NOT EXISTS packets_address ON packets(address);
+CREATE INDEX IF NOT EXISTS packets_button_type ON packets(button_type, address);
+"""
+
+_COLUMNS = ("captures.label, packets.frame, packets.time, packets.direction, "
+            "packets.protocol, packets.report_id, packets.command, packets.address, "
+            "packets.length, packets.button_type, packets.data")
+
+
+@dataclass(frozen=True)
+class Packet:
+    capture: str
+    frame: int
+    time: float  # seconds since the start of the capture
+    direction: str  # "H2M" or "M2H"
+    protocol: str
+    report_id: int
+    command: int
+    address: int | None
+    length: int | None
+    button_type: int | None  # action type of a write to the button table
+    data: bytes
+
+
+def report_fields(data) -> tuple[int | None, int | None, int | None]:
+    """``(address, length, button_type)`` of one Areson or Holtek report."""
+    protocol = pcap_reader.report_protocol(data)
+    address = length = button_type = None
+    if protocol == "areson":
+        length = data[5]
+        if data[1] in (0x07, 0x08):
+            address = (data[3] << 8) | data[4]
+            if data[0] == 0x08 and data[1] == 0x07 and length >= 1 \
+                    and BUTTON_TABLE[0] <= address <= BUTTON_TABLE[1]:
+                button_type = data[6]
+    elif protocol == "holtek" and data[1] in (0xF2, 0xF3):
+        address = data[2] | (data[3] << 8)
+        length = data[4]
+    return address, length, button_type
+
+
+def capture_label(path: str | Path) -> str:
+    """The name captures are referred to by: the file name without suffix."""
+    return Path(path).stem
+
+
+class PacketIndex:
+    """A packet database on disk, or in memory by default."""
+
+    def __init__(self, path: str | Path = ":memory:"):
+        self._db = sqlite3.connect(str(path))
+        self._db.execute("PRAGMA foreign_keys = ON")
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            self._db.executescript("DROP TABLE IF EXISTS packets; DROP TABLE IF EXISTS captures;")
+        self._db.executescript(_SCHEMA)
+        self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "PacketIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- building ----------------------------------------------------------
+
+    def is_current(self, path: str, sha256: str) -> bool:
+        row = self._db.execute("SELECT sha256 FROM captures WHERE path = ?", (path,)).fetchone()
+        return row is not None and row[0] == sha256
+
+    def add_capture(self, path: str, reports: Iterable[tuple[int, float, str, bytes]],
+                    sha256: str | None = None, label: str | None = None) -> int:
+        """Replace the packets of capture ``path``; return how many were added.
+
+        ``reports`` are ``(frame, time, direction, data)`` tuples in capture
+        order.  Reports of neither protocol are skipped.
+        """
+        rows = []
+        with self._db:
+            self._db.execute("DELETE FROM captures WHERE path = ?", (path,))
+            capture_id = self._db.execute(
+                "INSERT INTO captures (label, path, sha256) VALUES (?, ?, ?)",
+                (label or capture_label(path), path, sha256)).lastrowid
+            for frame, time, direction, data in reports:
+                data = bytes(data)
+                protocol = pcap_reader.report_protocol(data)
+                if protocol is None:
+                    continue
+                rows.append((capture_id, frame, time, direction, protocol, data[0],
+                             data[1], *report_fields(data), data))
+            self._db.executemany("INSERT INTO packets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 rows)
+        return len(rows)
+
+    def index_capture(self, path: str | Path, sha256: str | None = None) -> int:
+        """Decode a pcap/pcapng file straight into the index."""
+        return self.add_capture(str(path), ((r.frame, r.elapsed, r.direction, r.data)
+                                            for r in pcap_reader.read_reports(path)), sha256)
+
+    # -- querying ----------------------------------------------------------
+
+    def captures(self) -> list[str]:
+        return [row[0] for row in self._db.execute("SELECT label FROM captures ORDER BY id")]
+
+    def query(self, *, command: int | Iterable[int] | None = None,
+              direction: str | None = None, protocol: str | None = None,
+              address: int | tuple[int, int] | None = None,
+              capture: str | None = None, button_type: int | None = None,
+              limit: int | None = None) -> list[Packet]:
+        """Packets matching every given filter, in capture and frame order.
+
+        ``address`` is one address or an inclusive ``(first, last)`` range
+        and matches the start address of the report.  ``capture`` is a label,
+        with ``*`` and ``?`` wildcards as in a shell glob.
+        """
+        clauses, params = [], []
+        if command is not None:
+            commands = [command] if isinstance(command, int) else list(command)
+            clauses.append(f"packets.command IN ({', '.join('?' * len(commands))})")
+            params += commands
+        if direction is not None:
+            clauses.append("packets.direction = ?")
+            params.append(direction)
+        if protocol is not None:
+            clauses.append("packets.protocol = ?")
+            params.append(protocol)
+        if address is not None:
+            first, last = (address, address) if isinstance(address, int) else address
+            clauses.append("packets.address BETWEEN ? AND ?")
+            params += [first, last]
+        if capture is not None:
+            clauses.append("captures.label GLOB ?")
+            params.append(capture)
+        if button_type is not None:
+            clauses.append("packets.button_type = ?")
+            params.append(button_type)
+        sql = (f"SELECT {_COLUMNS} FROM packets JOIN captures ON captures.id = packets.capture_id"
+               + (" WHERE " + " AND ".join(clauses) if clauses else "")
+               + " ORDER BY packets.capture_id, packets.frame")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [Packet(*row) for row in self._db.execute(sql, params)]
@@ -0,0 +1,256 @@
+"""Streaming reader for USB captures: pcapng or pcap, USBPcap or usbmon.
+
+Decodes the captures in ``usbcap/`` and ``new-usbcap/`` without Wireshark.
+:func:`read_packets` walks the file block by block and yields every USB
+packet with its setup and data as ``memoryview`` slices of the block just
+read.  :func:`read_reports` narrows that down to the HID reports this
+project cares about:
+
+* host-to-mouse (``H2M``): SET_REPORT data on the control endpoint;
+* mouse-to-host (``M2H``): interrupt-IN data and GET_REPORT answers,
+
+each classified as an Areson report (17 bytes, ID 0x08 or 0x09) or a Holtek
+feature report (16 bytes on ID 0x02, 64 bytes on ID 0x03).
+
+Windows captures use USBPcap (link type 249); Linux captures taken through
+``usbmon`` use link type 220, or 189 for the older 48-byte header.
+"""
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
+
+LINKTYPE_USB_LINUX = 189
+LINKTYPE_USB_LINUX_MMAPPED = 220
+LINKTYPE_USBPCAP = 249
+
+TRANSFER_ISOCHRONOUS = 0
+TRANSFER_INTERRUPT = 1
+TRANSFER_CONTROL = 2
+TRANSFER_BULK = 3
+
+SET_REPORT = (0x21, 0x09)
+GET_REPORT = (0xA1, 0x01)
+
+ARESON_REPORT_LEN = 17
+HOLTEK_REPORTS = {(0x02, 16), (0x03, 64)}
+
+_PCAPNG_SHB = 0x0A0D0D0A
+_PCAPNG_IDB = 1
+_PCAPNG_SPB = 3
+_PCAPNG_EPB = 6
+_PCAPNG_MAGIC = 0x1A2B3C4D
+_PCAP_MAGICS = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6), b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9), b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+_USBMON_HEADER = struct.Struct("<QcBBBHccqiiII")
+_USBPCAP_HEADER = struct.Struct("<HQIHBHHBBI")
+
+
+class CaptureFormatError(ValueError):
+    """The file is not a capture this module can decode."""
+
+
+@dataclass(frozen=True)
+class UsbPacket:
+    frame: int
+    timestamp: float
+    bus: int
+    device: int
+    endpoint: int  # with the IN bit, 0x80
+    transfer: int
+    completion: bool  # URB completion rather than submission
+    urb: int  # pairs a completion with its submission
+    setup: memoryview | None
+    data: memoryview
+
+
+@dataclass(frozen=True)
+class Report:
+    frame: int
+    timestamp: float
+    elapsed: float  # seconds since the first packet in the capture
+    direction: str  # "H2M" or "M2H"
+    bus: int
+    device: int
+    endpoint: int
+    data: memoryview
+
+    @property
+    def protocol(self) -> str | None:
+        return report_protocol(self.data)
+
+
+def report_protocol(data) -> str | None:
+    """``"areson"``, ``"holtek"`` or None for anything else."""
+    if len(data) == ARESON_REPORT_LEN and data[0] in (0x08, 0x09):
+        return "areson"
+    if len(data) and (data[0], len(data)) in HOLTEK_REPORTS:
+        return "holtek"
+    return None
+
+
+def decode_usbmon(record: memoryview, frame: int, timestamp: float,
+                  header_len: int = 64) -> UsbPacket | None:
+    """Decode one usbmon record (a pcap frame or a ``/dev/usbmonN`` event)."""
+    if len(record) < header_len:
+        return None
+    (urb, event, transfer, endpoint, device, bus, flag_setup, _flag_data,
+     _seconds, _micros, _status, _length, captured) = _USBMON_HEADER.unpack_from(record)
+    setup = record[40:48] if flag_setup == b"\x00" else None
+    return UsbPacket(frame, timestamp, bus, device, endpoint, transfer,
+                     event != b"S", urb, setup,
+                     record[header_len:header_len + captured])
+
+
+def decode_usbpcap(record: memoryview, frame: int, timestamp: float) -> UsbPacket | None:
+    if len(record) < _USBPCAP_HEADER.size:
+        return None
+    (header_len, irp, _status, _function, info, bus, device, endpoint, transfer,
+     length) = _USBPCAP_HEADER.unpack_from(record)
+    payload = record[header_len:header_len + length]
+    setup = None
+    if transfer == TRANSFER_CONTROL and header_len > _USBPCAP_HEADER.size \
+            and record[_USBPCAP_HEADER.size] == 0 and len(payload) >= 8:
+        # Setup stage: the setup packet, then any OUT data.
+        setup, payload = payload[:8], payload[8:]
+    return UsbPacket(frame, timestamp, bus, device, endpoint, transfer,
+                     bool(info & 0x01), irp, setup, payload)
+
+
+def _decode(linktype: int, record: memoryview, frame: int,
+            timestamp: float) -> UsbPacket | None:
+    if linktype == LINKTYPE_USBPCAP:
+        return decode_usbpcap(record, frame, timestamp)
+    if linktype == LINKTYPE_USB_LINUX_MMAPPED:
+        return decode_usbmon(record, frame, timestamp)
+    if linktype == LINKTYPE_USB_LINUX:
+        return decode_usbmon(record, frame, timestamp, header_len=48)
+    return None
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes | None:
+    data = stream.read(size)
+    return data if len(data) == size else None
+
+
+def _pcapng_records(stream: BinaryIO, first: bytes) -> Iterator[tuple[int, float, memoryview]]:
+    order = "<"
+    interfaces: list[tuple[int, float]] = []
+    header = first
+    while header is not None:
+        block_type = struct.unpack(order + "I", header[:4])[0]
+        if block_type == _PCAPNG_SHB:
+            order = "<" if struct.unpack("<I", header[8:12])[0] == _PCAPNG_MAGIC else ">"
+            interfaces = []
+        length = struct.unpack(order + "I", header[4:8])[0]
+        if length < 12 or length % 4:
+            raise CaptureFormatError(f"corrupt pcapng block length {length}")
+        body = _read_exact(stream, length - len(header))
+        if body is None:
+            return  # truncated final block, as left by an interrupted capture
+        block = memoryview(header + body)
+        if block_type == _PCAPNG_IDB:
+            interfaces.append((struct.unpack_from(order + "H", block, 8)[0],
+                               _tsresol(block[16:length - 4], order)))
+        elif block_type == _PCAPNG_EPB:
+            interface, high, low, captured = struct.unpack_from(order + "IIII", block, 8)
+            linktype, resolution = interfaces[interface]
+            yield linktype, ((high << 32) | low) * resolution, block[28:28 + captured]
+        elif block_type == _PCAPNG_SPB and interfaces:
+            captured = min(struct.unpack_from(order + "I", block, 8)[0], length - 16)
+            yield interfaces[0][0], 0.0, block[12:12 + captured]
+        header = _read_exact(stream, 12)
+
+
+def _tsresol(options: memoryview, order: str) -> float:
+    offset = 0
+    while offset + 4 <= len(options):
+        code, size = struct.unpack_from(order + "HH", options, offset)
+        if code == 0:
+            break
+        if code == 9 and size >= 1:
+            value = options[offset + 4]
+            return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0 ** -value
+        offset += 4 + (size + 3) // 4 * 4
+    return 1e-6
+
+
+def _pcap_records(stream: BinaryIO, first: bytes) -> Iterator[tuple[int, float, memoryview]]:
+    order, resolution = _PCAP_MAGICS[first[:4]]
+    rest = _read_exact(stream, 24 - len(first))
+    if rest is None:
+        raise CaptureFormatError("truncated pcap header")
+    linktype = struct.unpack(order + "I", (first + rest)[20:24])[0] & 0x0FFFFFFF
+    while (header := _read_exact(stream, 16)) is not None:
+        seconds, fraction, captured, _length = struct.unpack(order + "IIII", header)
+        data = _read_exact(stream, captured)
+        if data is None:
+            return
+        yield linktype, seconds + fraction * resolution, memoryview(data)
+
+
+def read_packets(source: str | Path | BinaryIO) -> Iterator[UsbPacket]:
+    """Yield every USB packet in a pcapng or pcap capture, in file order.
+
+    ``frame`` numbers count every captured frame from 1, as Wireshark does.
+    Frames of other link types are counted but not yielded.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as stream:
+            yield from read_packets(stream)
+        return
+    first = source.read(12)
+    if len(first) >= 4 and first[:4] in _PCAP_MAGICS:
+        records = _pcap_records(source, first)
+    elif len(first) == 12 and struct.unpack("<I", first[:4])[0] == _PCAPNG_SHB:
+        records = _pcapng_records(source, first)
+    else:
+        raise CaptureFormatError("not a pcap or pcapng capture")
+    for frame, (linktype, timestamp, record) in enumerate(records, 1):
+        packet = _decode(linktype, record, frame, timestamp)
+        if packet is not None:
+            yield packet
+
+
+def reports(packets: Iterable[UsbPacket]) -> Iterator[Report]:
+    """Pick the HID reports out of a packet stream.
+
+    GET_REPORT answers arrive on a completion without a setup packet, so
+    submissions are remembered by URB until their completion is seen.
+    """
+    pending_gets: set[tuple[int, int]] = set()
+    start = None
+    for packet in packets:
+        if start is None:
+            start = packet.timestamp
+        direction = None
+        if packet.transfer == TRANSFER_CONTROL:
+            key = (packet.bus, packet.urb)
+            request = (packet.setup[0], packet.setup[1]) if packet.setup is not None else None
+            if not packet.completion and request == SET_REPORT and len(packet.data):
+                direction = "H2M"
+            elif not packet.completion and request == GET_REPORT:
+                pending_gets.add(key)
+            elif packet.completion and key in pending_gets:
+                pending_gets.discard(key)
+                direction = "M2H" if len(packet.data) else None
+        elif packet.transfer == TRANSFER_INTERRUPT and packet.completion \
+                and packet.endpoint & 0x80 and len(packet.data):
+            direction = "M2H"
+        if direction is not None:
+            yield Report(packet.frame, packet.timestamp, packet.timestamp - start,
+                         direction, packet.bus, packet.device, packet.endpoint,
+                         packet.data)
+
+
+def read_reports(source: str | Path | BinaryIO,
+                 protocols: Iterable[str] = ("areson", "holtek")) -> Iterator[Report]:
+    """Yield the Areson and/or Holtek reports of a capture."""
+    wanted = set(protocols)
+    for report in reports(read_packets(source)):
+        if report.protocol in wanted:
+            yield report
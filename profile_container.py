@@ -0,0 +1,181 @@
+"""Compact Areson profile files.
+
+A full EEPROM dump is 64 KiB, but the firmware only uses page 0
+(configuration), pages 1-2 (event definitions) and the sixteen macro slots
+at 0x0300-0x1AFF.  A profile container stores just those regions behind a
+small table carrying each region's address, length and CRC-32, plus the
+USB IDs of the mouse it came from.
+
+Layout (little-endian)::
+
+    header  "VPPF" version:u8 reserved:u8 vendor_id:u16 product_id:u16 count:u16
+    table   count x (start:u16 length:u16 data_offset:u32 crc32:u32)
+    data    region bytes at their data_offset
+
+:class:`ProfileContainer` maps a file and only touches a region's bytes when
+it is asked for, so inspecting the header of a profile is free.
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+MAGIC = b"VPPF"
+VERSION = 1
+SUFFIX = ".vpp"
+
+# Size of a raw dump written by older exports and tools/dump_memory.py.
+LEGACY_DUMP_SIZE = 0x10000
+
+_HEADER = struct.Struct("<4sBBHHH")
+_ENTRY = struct.Struct("<HHII")
+
+
+class ProfileFormatError(ValueError):
+    """Raised for truncated, foreign or corrupted profile files."""
+
+
+@dataclass(frozen=True)
+class ProfileRegion:
+    name: str
+    start: int
+    length: int
+
+    @property
+    def end(self) -> int:
+        return self.start + self.length
+
+
+# Mapped regions, matching region() in tools/decode_areson_pcap.py.
+PROFILE_REGIONS: tuple[ProfileRegion, ...] = (
+    ProfileRegion("config", 0x0000, 0x0100),
+    ProfileRegion("events", 0x0100, 0x0200),
+    *(ProfileRegion(f"macro{slot + 1}", 0x0300 + slot * 0x180, 0x180)
+      for slot in range(16)),
+)
+
+
+def region_named(name: str) -> ProfileRegion:
+    for region in PROFILE_REGIONS:
+        if region.name == name:
+            return region
+    raise KeyError(name)
+
+
+def encode_profile(vendor_id: int, product_id: int,
+                   regions: Iterable[tuple[int, bytes]]) -> bytes:
+    """Return a container holding ``(start, data)`` regions."""
+    regions = [(start, bytes(data)) for start, data in regions]
+    for start, data in regions:
+        if not 0 <= start <= start + len(data) <= LEGACY_DUMP_SIZE:
+            raise ValueError(f"region at 0x{start:04x} exceeds the address space")
+    offset = _HEADER.size + _ENTRY.size * len(regions)
+    table = bytearray()
+    for start, data in regions:
+        table += _ENTRY.pack(start, len(data), offset, zlib.crc32(data))
+        offset += len(data)
+    header = _HEADER.pack(MAGIC, VERSION, 0, vendor_id, product_id, len(regions))
+    return header + bytes(table) + b"".join(data for _, data in regions)
+
+
+def is_profile_container(path: str | Path) -> bool:
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+@dataclass(frozen=True)
+class _Entry:
+    start: int
+    length: int
+    offset: int
+    crc32: int
+
+
+class ProfileContainer:
+    """Lazily mapped, checksum-verified view of a profile container."""
+
+    def __init__(self, buffer):
+        self._mmap = buffer if isinstance(buffer, mmap.mmap) else None
+        self._view = memoryview(buffer)
+        self._verified: set[int] = set()
+        if len(self._view) < _HEADER.size:
+            raise ProfileFormatError("file is too short for a profile header")
+        magic, version, _reserved, vendor_id, product_id, count = \
+            _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ProfileFormatError("not a Venus profile container")
+        if version != VERSION:
+            raise ProfileFormatError(f"unsupported profile version {version}")
+        if len(self._view) < _HEADER.size + count * _ENTRY.size:
+            raise ProfileFormatError("region table is truncated")
+        self.vendor_id = vendor_id
+        self.product_id = product_id
+        self.entries: list[_Entry] = []
+        for index in range(count):
+            entry = _Entry(*_ENTRY.unpack_from(
+                self._view, _HEADER.size + index * _ENTRY.size))
+            if entry.offset + entry.length > len(self._view):
+                raise ProfileFormatError(
+                    f"region at 0x{entry.start:04x} runs past the end of the file")
+            self.entries.append(entry)
+
+    @classmethod
+    def open(cls, path: str | Path) -> "ProfileContainer":
+        with open(path, "rb") as handle:
+            try:
+                mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise ProfileFormatError("profile file is empty") from exc
+        try:
+            return cls(mapped)
+        except ProfileFormatError:
+            mapped.close()
+            raise
+
+    def close(self) -> None:
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> "ProfileContainer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _entry(self, start: int) -> _Entry:
+        for entry in self.entries:
+            if entry.start == start:
+                return entry
+        raise KeyError(f"no region at 0x{start:04x}")
+
+    def region(self, key: int | str) -> memoryview:
+        """Return a zero-copy view of a region by start address or name."""
+        start = region_named(key).start if isinstance(key, str) else key
+        entry = self._entry(start)
+        data = self._view[entry.offset:entry.offset + entry.length]
+        if start not in self._verified:
+            if zlib.crc32(data) != entry.crc32:
+                raise ProfileFormatError(f"checksum mismatch in region at 0x{start:04x}")
+            self._verified.add(start)
+        return data
+
+    def regions(self) -> list[tuple[int, memoryview]]:
+        """Return every region, verifying each checksum."""
+        return [(entry.start, self.region(entry.start)) for entry in self.entries]
+
+
+def legacy_regions(image: bytes) -> list[tuple[int, bytes]]:
+    """Slice the mapped regions out of a flat 64 KiB dump."""
+    if len(image) != LEGACY_DUMP_SIZE:
+        raise ProfileFormatError(
+            f"raw dumps must be exactly 64 KiB (got {len(image)} bytes)")
+    return [(region.start, bytes(image[region.start:region.end]))
+            for region in PROFILE_REGIONS]
@@ -2,10 +2,15 @@
 
 from __future__ import annotations
 
+import queue
 import random
+import tempfile
+import threading
 import unittest
+from pathlib import Path
 from unittest import mock
 
+import tracing
 import venus_protocol as vp
 
 
@@ -261,15 +266,328 @@ class DeviceTests(unittest.TestCase):
         handle = FakeHandle()
         device = vp.VenusDevice(b"/dev/fake")
         device._dev = handle
-        with mock.patch.object(vp.time, "sleep") as sleep:
+        tracer = tracing.Tracer()
+        with mock.patch.object(vp.time, "sleep") as sleep, \
+                mock.patch.object(tracing, "TRACER", tracer):
             self.assertTrue(
                 device.send_reliable(vp.build_simple(vp.CMD_READY)))
             sleep.assert_called_once_with(vp.REPORT_SETTLE_SECONDS)
+            exchange, reliable = tracer.spans()
+            self.assertEqual((exchange.name, exchange.args["command"]),
+                             ("exchange", "0x03"))
+            self.assertEqual(reliable.args["settle_ms"],
+                             vp.REPORT_SETTLE_SECONDS * 1000)
 
             sleep.reset_mock()
             self.assertTrue(device.begin_write())
             sleep.assert_called_once_with(vp.REPORT_SETTLE_SECONDS)
 
+    def test_pacer_shrinks_on_clean_acks_and_backs_off_on_failure(self):
+        pacer = vp.ReportPacer()
+        for _ in range(200):
+            pacer.record_ack(vp.CMD_WRITE, 0.004)
+        self.assertEqual(pacer.settle_seconds(vp.CMD_WRITE), vp.PACING_MIN_SECONDS)
+        # Other commands keep the conservative gap until they earn their own.
+        self.assertEqual(pacer.settle_seconds(vp.CMD_READY), vp.REPORT_SETTLE_SECONDS)
+
+        pacer.record_failure(vp.CMD_WRITE)
+        self.assertEqual(pacer.settle_seconds(vp.CMD_WRITE),
+                         vp.PACING_MIN_SECONDS * 2)
+        for _ in range(10):
+            pacer.record_failure(vp.CMD_WRITE)
+        self.assertEqual(pacer.settle_seconds(vp.CMD_WRITE), vp.PACING_MAX_SECONDS)
+
+        # A much slower ACK than usual breaks the clean run instead of shrinking.
+        pacer = vp.ReportPacer()
+        for _ in range(pacer.SHRINK_AFTER - 1):
+            pacer.record_ack(vp.CMD_WRITE, 0.004)
+        pacer.record_ack(vp.CMD_WRITE, 0.2)
+        self.assertEqual(pacer.settle_seconds(vp.CMD_WRITE), vp.REPORT_SETTLE_SECONDS)
+
+    def test_pacer_drives_reliable_gap_and_records_timeouts(self):
+        handle = FakeHandle()
+        pacer = vp.ReportPacer()
+        pacer.stats[vp.CMD_READY] = vp.CommandPacing(gap=0.03)
+        device = vp.VenusDevice(b"/dev/fake", pacer=pacer)
+        device._dev = handle
+        with mock.patch.object(vp.time, "sleep") as sleep:
+            self.assertTrue(device.send_reliable(vp.build_simple(vp.CMD_READY)))
+            sleep.assert_called_once_with(0.03)
+        self.assertEqual(pacer.stats[vp.CMD_READY].acks, 1)
+
+        handle.read = lambda size, timeout: []
+        self.assertFalse(device.send_reliable(vp.build_simple(vp.CMD_READY),
+                                              timeout_ms=1))
+        self.assertEqual(pacer.stats[vp.CMD_READY].failures, 1)
+        self.assertEqual(pacer.stats[vp.CMD_READY].gap, 0.06)
+
+    def test_pacer_persists_per_device_key(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "pacing.json"
+            pacer = vp.ReportPacer()
+            pacer.stats[vp.CMD_WRITE] = vp.CommandPacing(gap=0.03, acks=40)
+            vp.save_pacer(path, "SERIAL-A", pacer)
+            vp.save_pacer(path, "SERIAL-B", vp.ReportPacer())
+
+            loaded = vp.load_pacer(path, "SERIAL-A")
+            self.assertEqual(loaded.settle_seconds(vp.CMD_WRITE), 0.03)
+            self.assertEqual(loaded.stats[vp.CMD_WRITE].acks, 40)
+            self.assertEqual(vp.load_pacer(path, "SERIAL-B").stats, {})
+            self.assertEqual(vp.load_pacer(path, "missing").stats, {})
+
+            path.write_text("not json", encoding="utf-8")
+            self.assertEqual(vp.load_pacer(path, "SERIAL-A").stats, {})
+
+    def test_shadow_skips_writes_the_eeprom_already_holds(self):
+        handle = FakeHandle()
+        device = vp.VenusDevice(b"/dev/fake", shadow=vp.EepromShadow())
+        device._dev = handle
+        with mock.patch.object(vp.time, "sleep"):
+            # Reads teach the shadow; FakeHandle returns zero-filled data.
+            self.assertEqual(device.read_flash(0x03, 0x00, 10), bytes(10))
+            self.assertTrue(device.send_reliable(vp.build_memory_write(0x0300, bytes(10))))
+            self.assertEqual(handle.commands, [vp.CMD_READ])
+            self.assertEqual(device.skipped_writes, 1)
+
+            changed = vp.build_memory_write(0x0300, b"\x01" + bytes(9))
+            self.assertTrue(device.send_reliable(changed))
+            self.assertTrue(device.send_reliable(changed))
+            self.assertEqual(handle.commands, [vp.CMD_READ, vp.CMD_WRITE])
+            self.assertEqual(device.skipped_writes, 2)
+
+            # Partially unknown ranges are always sent.
+            self.assertTrue(device.send_reliable(vp.build_memory_write(0x0305, bytes(10))))
+            self.assertEqual(handle.commands[-1], vp.CMD_WRITE)
+
+    def test_shadow_forgets_failed_writes_and_factory_reset(self):
+        handle = FakeHandle()
+        shadow = vp.EepromShadow()
+        shadow.update(0x0060, bytes.fromhex("01010053"))
+        device = vp.VenusDevice(b"/dev/fake", shadow=shadow)
+        device._dev = handle
+        write = vp.build_memory_write(0x0060, bytes.fromhex("01020052"))
+        handle.read = lambda size, timeout: []
+        self.assertFalse(device.send_reliable(write, timeout_ms=1))
+        # The failed write may have landed, so the old bytes are not trusted.
+        self.assertFalse(shadow.matches(0x0060, bytes.fromhex("01010053")))
+
+        shadow.update(0x0060, bytes.fromhex("01010053"))
+        self.assertFalse(device.send_reliable(vp.build_simple(vp.CMD_FACTORY_RESET),
+                                              timeout_ms=1))
+        self.assertFalse(shadow.matches(0x0060, bytes.fromhex("01010053")))
+        self.assertTrue(shadow.covers(0x0060, 4))
+        self.assertFalse(shadow.covers(vp.EEPROM_SIZE - 2, 4))
+        self.assertFalse(shadow.covers(-1, 1))
+
+    def test_read_range_pipelines_and_rerequests_only_lost_chunks(self):
+        memory = bytes(range(256)) * 2
+
+        class MemoryHandle(FakeHandle):
+            def __init__(self):
+                super().__init__()
+                self.requests = []
+                self.dropped = False
+
+            def send_feature_report(self, request):
+                request = bytes(request)
+                address = (request[3] << 8) | request[4]
+                self.requests.append(address)
+                if address == 0x0114 and not self.dropped:
+                    self.dropped = True
+                    return len(request)
+                data = memory[address:address + request[5]]
+                # Newest first: responses may overtake each other.
+                self.pending.insert(0, response_for(request, data))
+                return len(request)
+
+        handle = MemoryHandle()
+        device = vp.VenusDevice(b"/dev/fake", shadow=vp.EepromShadow())
+        device._dev = handle
+        clock = iter(i * 0.01 for i in range(100_000))
+        tracer = tracing.Tracer()
+        with mock.patch.object(vp.time, "monotonic", side_effect=lambda: next(clock)), \
+                mock.patch.object(tracing, "TRACER", tracer):
+            data = device.read_range(0x0100, 0x100, window=4, timeout_ms=500)
+        self.assertEqual(data, memory[0x100:0x200])
+        self.assertEqual(handle.requests.count(0x0114), 2)
+        self.assertEqual(len(handle.requests), 27)
+        self.assertTrue(device.shadow.matches(0x0100, memory[0x100:0x200]))
+        self.assertEqual(tracer.spans()[-1].args, {
+            "address": "0x0100", "bytes": 0x100, "requests": 27, "retries": 1})
+
+        handle.read = lambda size, timeout: []
+        with mock.patch.object(vp.time, "monotonic", side_effect=lambda: next(clock)), \
+                mock.patch.object(tracing, "TRACER", tracer):
+            with self.assertRaisesRegex(vp.ProtocolTimeout, "after 2 attempts"):
+                device.read_range(0x0000, 10, attempts=2)
+        self.assertIn("after 2 attempts", tracer.spans()[-1].args["error"])
+
+    def test_cached_read_refetches_only_bytes_written_since(self):
+        handle = FakeHandle()
+        device = vp.VenusDevice(b"/dev/fake", shadow=vp.EepromShadow())
+        device._dev = handle
+        with mock.patch.object(vp.time, "sleep"):
+            self.assertEqual(device.read_cached(0x0000, 0xA0), bytes(0xA0))
+            self.assertEqual(handle.commands.count(vp.CMD_READ), 16)
+
+            handle.commands.clear()
+            self.assertEqual(device.read_cached(0x0000, 0xA0), bytes(0xA0))
+            self.assertEqual(handle.commands, [])
+
+            self.assertTrue(device.send_reliable(
+                vp.build_memory_write(0x0060, bytes.fromhex("01020052"))))
+            self.assertEqual(device.shadow.version, 1)
+            self.assertEqual(device.shadow.stale_runs(0x0000, 0xA0), [(0x0060, 4)])
+            handle.commands.clear()
+            device.read_cached(0x0000, 0xA0)
+            self.assertEqual(handle.commands, [vp.CMD_READ])
+            self.assertEqual(device.shadow.stale_runs(0x0000, 0xA0), [])
+
+            handle.commands.clear()
+            device.read_cached(0x0000, 0xA0, verify=True)
+            self.assertEqual(handle.commands.count(vp.CMD_READ), 16)
+
+    def test_reader_thread_matches_responses_without_polling(self):
+        memory = bytes(range(256))
+
+        class BlockingHandle(FakeHandle):
+            """Answers from a timer thread; read() blocks like hidapi's."""
+
+            def __init__(self):
+                super().__init__()
+                self.queue = queue.Queue()
+                self.read_timeouts = []
+                self.silent = set()
+
+            def send_feature_report(self, request):
+                request = bytes(request)
+                self.commands.append(request[1])
+                if request[1] in self.silent:
+                    return len(request)
+                address = (request[3] << 8) | request[4]
+                data = memory[address:address + request[5]] if request[1] == vp.CMD_READ else b"\x01"
+                # Later requests answer first.
+                delay = 0.02 / (len(self.commands) % 3 + 1)
+                threading.Timer(delay, self.queue.put, (response_for(request, data),)).start()
+                return len(request)
+
+            def read(self, length, timeout_ms=0):
+                self.read_timeouts.append(timeout_ms)
+                try:
+                    return list(self.queue.get(timeout=timeout_ms / 1000))
+                except queue.Empty:
+                    return []
+
+        handle = BlockingHandle()
+        handle.open_path = mock.Mock()
+        fake_hid = mock.Mock()
+        fake_hid.device.return_value = handle
+        seen = []
+        with mock.patch.object(vp, "hid", fake_hid), \
+             mock.patch.object(vp, "HIDAPI_AVAILABLE", True):
+            device = vp.VenusDevice(b"/dev/fake")
+            device.open()
+            try:
+                device.subscribe(seen.append)
+                self.assertTrue(device.ready())
+                self.assertEqual(device.read_range(0x0000, 0x64, window=4), memory[:0x64])
+                # Only the reader thread touches the queue, always blocking.
+                self.assertEqual(set(handle.read_timeouts), {50})
+                # Answered requests never reach listeners; pushed reports do.
+                self.assertEqual(seen, [])
+                pushed = response_for(vp.build_simple(vp.CMD_STATUS), b"\x05\x00")
+                handle.queue.put(pushed)
+                for _ in range(200):
+                    if seen:
+                        break
+                    threading.Event().wait(0.005)
+                self.assertEqual(seen, [pushed])
+
+                handle.silent.add(vp.CMD_STATUS)
+                with self.assertRaisesRegex(vp.ProtocolTimeout, "0x04 timed out"):
+                    device.exchange(vp.build_simple(vp.CMD_STATUS), timeout_ms=20)
+                self.assertEqual(device._waiters, {})
+            finally:
+                device.close()
+        self.assertIsNone(device._reader)
+        self.assertFalse(vp.io_lock(b"/dev/fake").locked())
+
+    def _pooled_hid(self):
+        handles = []
+
+        def make_handle():
+            handle = FakeHandle()
+            handle.open_path = mock.Mock()
+            handles.append(handle)
+            return handle
+
+        fake_hid = mock.Mock()
+        fake_hid.device.side_effect = make_handle
+        return fake_hid, handles
+
+    def test_session_pool_reuses_one_authenticated_handle(self):
+        fake_hid, handles = self._pooled_hid()
+        pool = vp.DeviceSessionPool()
+        with mock.patch.object(vp, "hid", fake_hid), \
+             mock.patch.object(vp, "HIDAPI_AVAILABLE", True):
+            with pool.lease(b"/dev/fake") as device:
+                device.read_flash(0, 0, 10)
+            with pool.lease(b"/dev/fake") as device:
+                device.read_flash(0, 10, 10)
+            with pool.lease(b"/dev/fake", authenticate=False) as device:
+                device.query_status()
+
+        self.assertEqual(len(handles), 1)
+        self.assertEqual(handles[0].commands.count(vp.CMD_CHALLENGE), 1)
+        self.assertFalse(vp.io_lock(b"/dev/fake").locked())
+
+    def test_session_pool_keeps_a_shadow_per_session(self):
+        fake_hid, _handles = self._pooled_hid()
+        pool = vp.DeviceSessionPool(shadow_factory=lambda path: vp.EepromShadow())
+        with mock.patch.object(vp, "hid", fake_hid), \
+             mock.patch.object(vp, "HIDAPI_AVAILABLE", True):
+            with pool.lease(b"/dev/fake") as device:
+                device.read_flash(0, 0, 10)
+                first = device.shadow
+            self.assertTrue(first.matches(0, bytes(10)))
+            with pool.lease(b"/dev/other") as device:
+                self.assertIsNot(device.shadow, first)
+
+            with self.assertRaises(vp.ProtocolTimeout):
+                with pool.lease(b"/dev/fake"):
+                    raise vp.ProtocolTimeout("command 0x08 timed out")
+            with pool.lease(b"/dev/fake") as device:
+                self.assertFalse(device.shadow.matches(0, bytes(10)))
+                device.read_flash(0, 0, 10)
+
+            pool.close(b"/dev/fake")
+            with pool.lease(b"/dev/fake") as device:
+                self.assertIsNot(device.shadow, first)
+                self.assertFalse(device.shadow.matches(0, bytes(10)))
+            pool.close_all()
+
+    def test_session_pool_rehandshakes_after_timeout_or_idle(self):
+        fake_hid, handles = self._pooled_hid()
+        pool = vp.DeviceSessionPool()
+        with mock.patch.object(vp, "hid", fake_hid), \
+             mock.patch.object(vp, "HIDAPI_AVAILABLE", True):
+            with self.assertRaises(vp.ProtocolTimeout):
+                with pool.lease(b"/dev/fake") as device:
+                    raise vp.ProtocolTimeout("command 0x08 timed out")
+            with pool.lease(b"/dev/fake"):
+                pass
+            self.assertEqual(len(handles), 2)
+            self.assertEqual(handles[1].commands.count(vp.CMD_CHALLENGE), 1)
+
+            pool.idle_seconds = 0.0
+            with pool.lease(b"/dev/fake"):
+                pass
+            pool.close_all()
+
+        self.assertEqual(len(handles), 2)
+        self.assertEqual(handles[1].commands.count(vp.CMD_CHALLENGE), 2)
+        self.assertEqual(pool.paths(), [])
+
     def test_enumeration_selects_real_config_interface(self):
         entries = [
             {"vendor_id": 0x25A7, "product_id": 0xFA08,
@@ -288,7 +606,7 @@ class DeviceTests(unittest.TestCase):
 
         fake_hid = mock.Mock()
         fake_hid.enumerate.side_effect = lambda vid, pid: (
-            entries if (vid, pid) == (0x25A7, 0xFA08) else [])
+            entries if (vid, pid) == (0, 0) else [])
         fake_handle = mock.Mock()
         fake_hid.device.return_value = fake_handle
         with mock.patch.object(vp, "hid", fake_hid), \
@@ -300,6 +618,41 @@ class DeviceTests(unittest.TestCase):
         self.assertEqual(devices[0].usage_page, 0xFF02)
         fake_handle.open_path.assert_called_with(b"/dev/hidraw-config")
 
+    def test_enumeration_scans_once_and_reprobes_only_changed_nodes(self):
+        entries = [
+            {"vendor_id": 0x046D, "product_id": 0xC52B, "path": b"/dev/hidraw0",
+             "interface_number": 2},
+            {"vendor_id": 0x25A7, "product_id": 0xFA07, "path": b"/dev/hidraw4",
+             "interface_number": 1, "usage_page": 0xFF02},
+            {"vendor_id": 0x04D9, "product_id": 0xFC55, "path": b"/dev/hidraw7",
+             "interface_number": 2},
+        ]
+        signatures = {b"/dev/hidraw4": ("a",), b"/dev/hidraw7": ("b",)}
+        fake_hid = mock.Mock()
+        fake_hid.enumerate.return_value = entries
+        opened = []
+        fake_hid.device.side_effect = lambda: mock.Mock(open_path=opened.append)
+        with mock.patch.object(vp, "hid", fake_hid), \
+             mock.patch.object(vp, "HIDAPI_AVAILABLE", True), \
+             mock.patch.object(vp, "_node_signature", side_effect=signatures.get), \
+             mock.patch.dict(vp._probe_cache, clear=True):
+            first = vp.list_devices()
+            self.assertEqual(fake_hid.enumerate.call_args_list, [mock.call(0, 0)])
+            self.assertEqual(sorted(opened), [b"/dev/hidraw4", b"/dev/hidraw7"])
+
+            opened.clear()
+            self.assertEqual(vp.list_devices(), first)
+            self.assertEqual(opened, [])
+
+            # Re-plugged receiver: new node incarnation, new probe.
+            signatures[b"/dev/hidraw4"] = ("c",)
+            vp.list_devices()
+            self.assertEqual(opened, [b"/dev/hidraw4"])
+
+            entries.pop()
+            vp.list_devices()
+            self.assertNotIn(b"/dev/hidraw7", vp._probe_cache)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,59 @@
+"""VenusDevice against the simulated Areson firmware, without hardware."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+import areson_sim
+import venus_protocol as vp
+
+
+class SimulatedAresonTests(unittest.TestCase):
+    def open(self, sim: areson_sim.SimulatedAreson) -> vp.VenusDevice:
+        device = vp.VenusDevice(b"/dev/sim-areson", handle_factory=sim.handle)
+        device.open()
+        self.addCleanup(device.close)
+        return device
+
+    def test_session_status_and_pipelined_read(self):
+        image = bytes(index & 0xFF for index in range(areson_sim.ADDRESS_SPACE))
+        sim = areson_sim.SimulatedAreson(image, battery_level=4, cable_connected=True)
+        device = self.open(sim)
+
+        self.assertTrue(device.start_session())
+        self.assertTrue(sim.notifications)
+        status = device.query_status()
+        self.assertEqual((status.level, status.cable_connected), (4, True))
+        self.assertEqual(device.read_range(0x0100, 0x95), image[0x0100:0x0195])
+
+    def test_writes_land_in_the_eeprom_and_factory_reset_restores_it(self):
+        sim = areson_sim.SimulatedAreson()
+        device = self.open(sim)
+        with mock.patch.object(vp.time, "sleep"):
+            self.assertTrue(device.send_reliable(vp.build_memory_write(0x0060, b"\x11" * 4)))
+        self.assertEqual(device.read_range(0x0060, 6), b"\x11" * 4 + b"\x00\x00")
+
+        device.send(vp.build_simple(vp.CMD_FACTORY_RESET))
+        self.assertEqual(device.read_range(0x0060, 4), bytes(4))
+
+    def test_dropped_answers_are_retried(self):
+        sim = areson_sim.SimulatedAreson(drop_rate=0.2, seed=1)
+        device = self.open(sim)
+        self.assertEqual(device.read_range(0x0000, 0x200, timeout_ms=20), bytes(0x200))
+        self.assertGreater(sum(sim.dropped.values()), 0)
+        self.assertEqual(sim.received[vp.CMD_READ],
+                         0x200 // vp.MAX_DATA_LEN + 1 + sum(sim.dropped.values()))
+
+    def test_reports_inside_the_write_settle_time_are_ignored(self):
+        sim = areson_sim.SimulatedAreson(min_gap=5.0)
+        device = self.open(sim)
+        with mock.patch.object(vp.time, "sleep"):
+            self.assertTrue(device.send_reliable(vp.build_memory_write(0x0000, b"\x01")))
+            device.send(vp.build_memory_write(0x0010, b"\x02"))
+        self.assertEqual(sim.too_fast[vp.CMD_WRITE], 1)
+        self.assertEqual(sim.eeprom[0x0010], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
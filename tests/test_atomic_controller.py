@@ -57,6 +57,20 @@ class TestTransactionController(unittest.TestCase):
         # Should not have committed
         self.assertTrue(self.staging.has_changes())
 
+    def test_execute_coalesces_before_sending(self):
+        """Test that an optional coalescer replaces the built packets."""
+        self.staging.stage_change("btn_1", "Macro", {"index": 1})
+        self.staging.stage_change("btn_2", "Middle Click", {})
+        self.mock_protocol.build_packets.return_value = [b'\x01']
+        self.mock_device.send_reliable.return_value = True
+        coalesce = MagicMock(return_value=[b'\x01\x01'])
+        controller = TransactionController(
+            self.mock_device, self.mock_protocol, coalesce=coalesce)
+
+        self.assertTrue(controller.execute_transaction(self.staging))
+        coalesce.assert_called_once_with([b'\x01', b'\x01'])
+        self.mock_device.send_reliable.assert_called_once_with(b'\x01\x01')
+
     def test_execute_empty(self):
         """Test execution with no changes does nothing."""
         success = self.controller.execute_transaction(self.staging)
@@ -0,0 +1,138 @@
+"""Offline tests for the cached corpus decoder in tools/batch_decode.py."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import holtek_protocol as hp
+import packet_index
+import pcap_reader
+import venus_protocol as vp
+from tests.test_pcap_reader import pcapng, usbpcap
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+import batch_decode  # noqa: E402
+
+SET_REPORT = bytes.fromhex("2109080301001100")
+
+
+def capture_bytes(data: bytes) -> bytes:
+    """A USBPcap capture with one Areson write and the mouse's answer."""
+    request = vp.build_memory_write(0x0060, data)
+    answer = bytes([vp.RESPONSE_REPORT_ID]) + request[1:16]
+    answer += bytes([vp.calc_checksum(answer)])
+    return pcapng(pcap_reader.LINKTYPE_USBPCAP, [
+        (1_000_000, usbpcap(1, False, 0x00, 2, SET_REPORT + request, 0)),
+        (1_002_000, usbpcap(2, True, 0x82, 1, answer)),
+        (1_003_000, usbpcap(3, True, 0x81, 1, bytes(8))),  # mouse movement
+    ])
+
+
+def report(data: bytes, direction: str = "H2M") -> pcap_reader.Report:
+    return pcap_reader.Report(4, 1.5, 0.25, direction, 1, 7, 0x00, memoryview(data))
+
+
+class BatchDecodeTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.capture = self.root / "bind.pcapng"
+        self.capture.write_bytes(capture_bytes(bytes.fromhex("05000050")))
+
+    def test_report_record_fields(self):
+        write = vp.build_memory_write(0x0064, bytes.fromhex("06000149"))
+        record = batch_decode.report_record("usbcap/a.pcapng", report(write))
+        self.assertEqual({key: record[key] for key in
+                          ("frame", "time", "protocol", "command", "address", "length",
+                           "region")},
+                         {"frame": 4, "time": 0.25, "protocol": "areson", "command": 7,
+                          "address": 0x0064, "length": 4, "region": "button action 1"})
+        self.assertEqual(record["data"], write.hex())
+
+        holtek = batch_decode.report_record("x", report(hp.build_read_request(0x0140, 8)))
+        self.assertEqual((holtek["protocol"], holtek["address"], holtek["region"]),
+                         ("holtek", 0x0140, None))
+        status = batch_decode.report_record("x", report(vp.build_simple(vp.CMD_STATUS)))
+        self.assertEqual((status["address"], status["region"]), (None, None))
+
+    def test_cache_reuses_digests_and_entries(self):
+        cache_dir = self.root / "cache"
+        cache = batch_decode.DecodeCache(cache_dir)
+        with mock.patch.object(batch_decode, "capture_hash",
+                               wraps=batch_decode.capture_hash) as hashed:
+            entries = batch_decode.decode_all([self.capture], cache, jobs=1, log=lambda _: None)
+            digest = cache.digest(self.capture)
+            self.assertEqual(hashed.call_count, 1)
+
+            # A new process reads the saved index and skips hashing and decoding.
+            logged = []
+            again = batch_decode.decode_all([self.capture], batch_decode.DecodeCache(cache_dir),
+                                            jobs=1, log=logged.append)
+            self.assertEqual((again, logged, hashed.call_count), (entries, [], 1))
+
+            stat = self.capture.stat()
+            os.utime(self.capture, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(batch_decode.DecodeCache(cache_dir).digest(self.capture), digest)
+            self.assertEqual(hashed.call_count, 2)
+
+        [(capture, entry)] = entries
+        self.assertEqual(capture, "bind.pcapng")
+        self.assertTrue(entry.name.startswith(digest))
+        records = [json.loads(line) for line in entry.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([(r["direction"], r["region"]) for r in records],
+                         [("H2M", "button action 0"), ("M2H", "button action 0")])
+
+        # A different capture name never reuses the entry.
+        self.assertNotEqual(cache.entry(digest, "other.pcapng"), entry)
+        index_path = cache_dir / "index.json"
+        index_path.write_text(json.dumps({"version": 0, "files": {"x": {}}}), encoding="utf-8")
+        self.assertEqual(batch_decode.DecodeCache(cache_dir)._index["files"], {})
+
+    def test_update_index_loads_only_changed_captures(self):
+        cache = batch_decode.DecodeCache(self.root / "cache")
+        entries = batch_decode.decode_all([self.capture], cache, jobs=1, log=lambda _: None)
+        with packet_index.PacketIndex() as index:
+            self.assertEqual(batch_decode.update_index(index, entries), 1)
+            self.assertEqual(batch_decode.update_index(index, entries), 0)
+            [write] = index.query(command=vp.CMD_WRITE, direction="H2M")
+            self.assertEqual((write.address, write.length), (0x0060, 4))
+
+            self.capture.write_bytes(capture_bytes(bytes.fromhex("05000151")))
+            stat = self.capture.stat()
+            os.utime(self.capture, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            entries = batch_decode.decode_all([self.capture], cache, jobs=1,
+                                              log=lambda _: None)
+            self.assertEqual(batch_decode.update_index(index, entries), 1)
+            [write] = index.query(command=vp.CMD_WRITE, direction="H2M")
+            self.assertEqual(bytes(write.data[6:10]), bytes.fromhex("05000151"))
+
+    def test_main_writes_reports_index_and_log(self):
+        cache_dir = self.root / "cache"
+        log_path = self.root / "log.txt"
+        argv = ["batch_decode.py", "--jobs", "1", "--cache", str(cache_dir),
+                "--index", str(self.root / "packets.sqlite"), "--log", str(log_path),
+                str(self.capture)]
+        with mock.patch.object(sys, "argv", argv), \
+             mock.patch("builtins.print"):
+            self.assertEqual(batch_decode.main(), 0)
+
+        self.assertEqual(len((cache_dir / "reports.jsonl").read_text().splitlines()), 2)
+        with packet_index.PacketIndex(self.root / "packets.sqlite") as index:
+            self.assertEqual(len(index.query(protocol="areson")), 2)
+        log = log_path.read_text()
+        self.assertIn("[bind.pcapng]", log)
+        self.assertIn("--> H2M | WRITE      | 08 07 00 00 60 04 05 00 00 50", log)
+        self.assertIn("[Page:0x00 Off:0x60 Len:4]", log)
+
+
+if __name__ == "__main__":
+    unittest.main()
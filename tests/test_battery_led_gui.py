@@ -42,6 +42,7 @@ class BatteryLedControllerTests(unittest.TestCase):
         self.device_patch.start()
         self.tray_patch.start()
         self.window = gui.MainWindow()
+        self.window._ensure_tab("RGB")
         self.window.device_type = "venus_pro"
         self.window.device_path = b"/dev/fake"
         self.window._request_battery_refresh = mock.Mock()
@@ -98,6 +99,20 @@ class BatteryLedControllerTests(unittest.TestCase):
         saved = json.loads(self.window.settings_file.read_text(encoding="utf-8"))
         self.assertFalse(saved["battery_led_enabled"])
 
+    def test_startup_defers_device_connect_and_unopened_tabs(self):
+        self.assertTrue(self.window._initial_connect_pending)
+        self.assertFalse(hasattr(self.window, "macro_event_table"))
+        QtWidgets.QApplication.processEvents()
+        self.assertFalse(self.window._initial_connect_pending)
+
+        titles = [self.window.tabs.tabText(index)
+                  for index in range(self.window.tabs.count())]
+        self.window.tabs.setCurrentIndex(titles.index("Macros"))
+        self.assertTrue(self.window.tabs.currentWidget().isAncestorOf(
+            self.window.macro_event_table))
+        self.assertEqual(titles, [self.window.tabs.tabText(index)
+                                  for index in range(self.window.tabs.count())])
+
     def test_automatic_connect_requests_a_silent_read(self):
         info = vp.DeviceInfo(
             path=b"/dev/fake",
@@ -149,6 +164,17 @@ class BatteryLedControllerTests(unittest.TestCase):
         self.assertIsNone(self.window._battery_thread)
         thread.deleteLater.assert_called_once_with()
 
+    def test_holtek_reconnect_waits_off_the_gui_thread(self):
+        self.window.device_type = "holtek"
+        with mock.patch.object(self.window.device_monitor, "source", None), \
+                mock.patch.object(gui.time, "sleep"), \
+                mock.patch.object(gui.hp, "wait_for_device",
+                                  return_value="/dev/hidraw7") as wait:
+            self.window._holtek_reconnect()
+        wait.assert_called_once_with(8.0)
+        self.assertEqual(self.window.device_path, "/dev/hidraw7")
+        self.assertFalse(self.window._holtek_reconnecting)
+
 
 if __name__ == "__main__":
     unittest.main()
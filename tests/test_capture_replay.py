@@ -0,0 +1,104 @@
+"""Offline tests for the capture-replay engine, against the simulated mouse."""
+
+from __future__ import annotations
+
+import time
+import unittest
+from pathlib import Path
+
+import areson_sim
+import capture_replay
+import venus_protocol as vp
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def answer(request: bytes, data: bytes = b"") -> bytes:
+    return areson_sim.SimulatedAreson._answer(request, data)
+
+
+class CaptureReplayTests(unittest.TestCase):
+    def open_device(self, path: bytes = b"sim", **options
+                    ) -> tuple[areson_sim.SimulatedAreson, vp.VenusDevice]:
+        sim = areson_sim.SimulatedAreson(**options)
+        device = vp.VenusDevice(path, handle_factory=sim.handle)
+        device.open()
+        self.addCleanup(device.close)
+        return sim, device
+
+    def test_pairs_requests_with_their_answers(self):
+        first = vp.build_flash_read(0, 0x60, 4)
+        second = vp.build_flash_read(0, 0x64, 4)
+        status = vp.build_simple(vp.CMD_STATUS)
+        exchanges = capture_replay.pair_exchanges([
+            (1, 0.0, "H2M", first), (2, 0.1, "H2M", second),
+            (3, 0.2, "M2H", answer(second, b"\x01\x02\x03\x04")),
+            (4, 0.3, "M2H", answer(status, b"\x07\x00")),  # notification
+            (5, 0.4, "M2H", answer(first, b"\x05\x06\x07\x08")),
+            (6, 0.5, "H2M", status),
+        ])
+        self.assertEqual([(e.frame, e.response) for e in exchanges],
+                         [(1, answer(first, b"\x05\x06\x07\x08")),
+                          (2, answer(second, b"\x01\x02\x03\x04")), (6, None)])
+
+    def test_ack_paced_replay_verifies_answers(self):
+        writes = [vp.build_memory_write(0x0060 + 4 * i, bytes((5, i, 0, 0x50 - i)))
+                  for i in range(4)]
+        read = vp.build_flash_read(0, 0x60, 8)
+        exchanges = [capture_replay.Exchange(i, i * 0.1, report, answer(report))
+                     for i, report in enumerate(writes)]
+        stored = b"".join(report[6:10] for report in writes[:2])
+        exchanges.append(capture_replay.Exchange(9, 1.0, read, answer(read, stored)))
+        status = vp.build_simple(vp.CMD_STATUS)
+        exchanges.append(capture_replay.Exchange(10, 1.1, status, answer(status, b"\x0a\x01")))
+        _sim, device = self.open_device()
+
+        summary = capture_replay.replay(device, exchanges)
+        self.assertEqual(summary.counts(), {"match": 5, "unchecked": 1})
+        self.assertTrue(summary.ok)
+        self.assertLess(summary.elapsed, summary.captured)
+        self.assertLessEqual(summary.latency()["p50"], summary.latency()["max"])
+
+        _sim, device = self.open_device(b"blank")
+        summary = capture_replay.replay(device, exchanges[4:5])  # nothing written yet
+        self.assertEqual(summary.counts(), {"mismatch": 1})
+        self.assertIn("frame 9 mismatch", summary.format())
+
+    def test_unanswered_requests_time_out(self):
+        sim, device = self.open_device(drop_rate=1.0)
+        ready = vp.build_simple(vp.CMD_READY)
+        exchanges = [capture_replay.Exchange(1, 0.0, ready, answer(ready, b"\x01"))] * 2
+        summary = capture_replay.replay(device, exchanges, window=2, timeout_ms=50)
+        self.assertEqual(summary.counts(), {"timeout": 2})
+        self.assertFalse(summary.ok)
+        self.assertEqual(summary.latency(), {})
+        self.assertEqual(sim.dropped[vp.CMD_READY], 2)
+
+    def test_original_timing_and_pipelining(self):
+        reads = [vp.build_flash_read(0, 10 * i, 10) for i in range(8)]
+        _sim, device = self.open_device(ack_latency=0.02)
+        started = time.monotonic()
+        results = device.exchange_pipelined(reads, window=8)
+        self.assertLess(time.monotonic() - started, 0.1)  # serially: 8 x 20 ms
+        self.assertTrue(all(latency >= 0.015 for _, latency in results))
+
+        exchanges = [capture_replay.Exchange(i, 10.0 + i * 0.06, report,
+                                             answer(report, bytes(10)))
+                     for i, report in enumerate(reads[:3])]
+        summary = capture_replay.replay(device, exchanges, timing="original", speed=2)
+        self.assertEqual(summary.counts(), {"match": 3})
+        self.assertGreaterEqual(summary.elapsed, 0.06)
+
+    def test_replays_a_windows_capture(self):
+        path = REPO_ROOT / "usbcap" / "rebind 1 from 1 to a.pcapng"
+        if not path.exists():
+            self.skipTest("capture corpus not present")
+        exchanges = capture_replay.load_capture(path)
+        sim, device = self.open_device()
+        summary = capture_replay.replay(device, exchanges)
+        self.assertEqual(summary.counts(), {"match": 3, "unchecked": 1})
+        self.assertEqual(sim.eeprom[0x60:0x64], bytes.fromhex("05000050"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Offline tests for the in-process usbmon decoder in capture_usb.py."""
+
+from __future__ import annotations
+
+import io
+import struct
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+import capture_usb
+import holtek_protocol as hp
+import pcap_reader
+import venus_protocol as vp
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def event(urb: int, kind: bytes, endpoint: int, transfer: int, payload: bytes,
+          device: int = 5, micros: int = 0, setup: bytes | None = None) -> bytes:
+    """One /dev/usbmonN event: the 64-byte header, then the data."""
+    header = struct.pack("<QcBBBHccqiiII", urb, kind, transfer, endpoint, device, 3,
+                         b"\x00" if setup else b"-", b"=", 7, micros, 0,
+                         len(payload), len(payload))
+    return header + (setup or bytes(8)) + bytes(16) + payload
+
+
+class LiveDecodeTests(unittest.TestCase):
+    def test_reports_are_decoded_and_every_event_is_saved(self):
+        request = vp.build_memory_write(0x0060, bytes.fromhex("05000050"))
+        answer = bytes([vp.RESPONSE_REPORT_ID]) + request[1:16]
+        answer += bytes([vp.calc_checksum(answer)])
+        events = [
+            event(1, b"S", 0x00, 2, request, micros=100,
+                  setup=bytes.fromhex("2109080301001100")),
+            event(2, b"C", 0x81, 1, bytes(8), micros=150),  # mouse movement
+            event(3, b"C", 0x82, 1, answer, device=9, micros=180),  # another device
+            event(4, b"C", 0x82, 1, answer, micros=400),
+        ]
+        raw = io.BytesIO()
+        reports = list(capture_usb.live_reports(iter(events), raw, 3, 5))
+
+        self.assertEqual([(r.frame, r.direction, r.protocol) for r in reports],
+                         [(1, "H2M", "areson"), (2, "M2H", None), (4, "M2H", "areson")])
+        self.assertEqual(capture_usb.describe("H2M", reports[0].data),
+                         "H2M areson cmd=07 EEPROM write checksum=ok addr=0060 "
+                         "len=4 data=05000050")
+        self.assertAlmostEqual(reports[2].elapsed, 0.0003)
+
+        raw.seek(0)
+        saved = list(pcap_reader.read_packets(raw))
+        self.assertEqual([p.urb for p in saved], [1, 2, 3, 4])
+        self.assertAlmostEqual(saved[0].timestamp, 7.0001)
+
+    def test_imports_without_hidapi(self):
+        # The default dumpcap mode runs under sudo, often without hidapi.
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys; sys.modules['hid'] = None; import capture_usb; "
+             "print(capture_usb.HOLTEK_COMMANDS[0xF2])"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "flash read")
+
+    def test_describes_holtek_reports(self):
+        self.assertEqual(capture_usb.describe("H2M", hp.build_read_request(0x0140, 8)),
+                         "H2M holtek cmd=f2 flash read addr=0140 len=8")
+        answer = bytes([hp.RID_SHORT, 0x08, 0x40, 0x00, 2, 0, 0xFA, 0xFA, 1, 2]).ljust(16, b"\x00")
+        self.assertEqual(capture_usb.describe("M2H", answer),
+                         "M2H holtek answer addr_lo=40 status=00 len=2 data=0102")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Offline tests for per-device locking and parallel provisioning."""
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+import device_driver as dd
+import holtek_protocol as hp
+import venus_protocol as vp
+
+
+def device_info(path: bytes, vendor_id: int = 0x25A7, product_id: int = 0xFA08,
+                access_error: str = "") -> vp.DeviceInfo:
+    return vp.DeviceInfo(path, "Venus", "", vendor_id, product_id, "",
+                         access_error=access_error)
+
+
+class FakeAreson:
+    """Acknowledges every write after a fixed delay, as a paced mouse does."""
+
+    def __init__(self, path, delay=0.01, fail_at=None):
+        self.path = path
+        self.delay = delay
+        self.fail_at = fail_at
+        self.sent = []
+        self.last_error = ""
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def start_session(self):
+        return True
+
+    def begin_write(self):
+        return True
+
+    def send_reliable(self, packet):
+        time.sleep(self.delay)
+        if len(self.sent) == self.fail_at:
+            self.last_error = "command 0x07 timed out"
+            return False
+        self.sent.append(packet)
+        return True
+
+
+class ProvisioningTests(unittest.TestCase):
+    def test_io_locks_are_per_node(self):
+        self.assertIs(vp.io_lock(b"/dev/hidraw1"), vp.io_lock("/dev/hidraw1"))
+        first = vp.VenusDevice(b"/dev/hidraw1")
+        second = vp.VenusDevice(b"/dev/hidraw2")
+        with first._io_lock:
+            self.assertTrue(second._io_lock.acquire(blocking=False))
+            second._io_lock.release()
+            self.assertFalse(vp.VenusDevice(b"/dev/hidraw1")._io_lock.acquire(blocking=False))
+
+    def test_provision_writes_every_device_in_parallel(self):
+        regions = [(0x0000, bytes(range(40))), (0x0100, b"\x01" * 20)]
+        devices = [device_info(b"/dev/hidraw%d" % index) for index in range(5)]
+        devices.append(device_info(b"/dev/hidraw5", product_id=0xFA07))  # wireless
+        devices.append(device_info(b"/dev/hidraw-bad"))
+        devices.append(device_info(b"/dev/hidraw-holtek", hp.VENDOR_ID, hp.PRODUCT_ID))
+        devices.append(device_info(b"/dev/hidraw-denied", access_error="Permission denied"))
+        created = {}
+
+        def create(device_type, path):
+            device = FakeAreson(path, fail_at=2 if path == b"/dev/hidraw-bad" else None)
+            created[path] = device
+            return device
+
+        progress = []
+        lock = threading.Lock()
+
+        def record(info, done, total):
+            with lock:
+                progress.append((info.path, done, total))
+
+        started = time.monotonic()
+        with mock.patch.object(dd, "create_device", side_effect=create):
+            results = dd.provision({"venus_pro": regions}, devices, record)
+        elapsed = time.monotonic() - started
+
+        # Six 10 ms packets per device: about 60 ms in parallel, over
+        # 380 ms if the seven opened devices were serialized.
+        self.assertLess(elapsed, 0.25)
+        self.assertEqual([result.ok for result in results],
+                         [True] * 6 + [False, False, False])
+        self.assertEqual(results[0].reports, 6)
+        self.assertEqual(created[b"/dev/hidraw0"].sent[0],
+                         vp.build_memory_write(0x0000, bytes(range(10))))
+        self.assertIn("timed out", results[6].error)
+        self.assertIn("no profile for 04d9:fc55", results[7].error)
+        self.assertEqual(results[8].error, "Permission denied")
+        self.assertNotIn(b"/dev/hidraw-holtek", created)
+        self.assertIn((b"/dev/hidraw3", 6, 6), progress)
+
+    def test_holtek_regions_are_written_as_one_plan(self):
+        device = mock.Mock()
+        regions = [(start, bytes(length)) for start, length in hp.PROFILE_SPANS]
+        reports = dd.write_profile_regions("holtek", device, regions)
+        plan = device.apply_plan.call_args.args[0]
+        self.assertEqual(plan.categories, 0x0E)
+        self.assertEqual(reports, len(plan.reports()))
+        self.assertEqual(len(plan), sum(len(data) for _, data in regions))
+
+
+if __name__ == "__main__":
+    unittest.main()
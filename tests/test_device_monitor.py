@@ -0,0 +1,83 @@
+"""Offline tests for the hotplug and battery monitor."""
+
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import device_monitor as dm
+import venus_protocol as vp
+
+
+def add_node(root: Path, name: str, vendor_id: int, product_id: int) -> None:
+    device = root / name / "device"
+    device.mkdir(parents=True)
+    (device / "uevent").write_text(
+        f"DRIVER=hid-generic\nHID_ID=0003:{vendor_id:08X}:{product_id:08X}\n")
+
+
+class DeviceMonitorTests(unittest.TestCase):
+    def test_parse_kernel_uevent(self):
+        message = (b"add@/devices/pci0000:00/usb1/1-2/1-2:1.1/0003:25A7:FA08.0007/hidraw/hidraw5\0"
+                   b"ACTION=add\0SUBSYSTEM=hidraw\0DEVNAME=hidraw5\0SEQNUM=4242\0")
+        fields = dm.parse_uevent(message)
+        self.assertEqual(fields["ACTION"], "add")
+        self.assertEqual(fields["DEVNAME"], "hidraw5")
+        # udevd's re-broadcasts start with "libudev" and carry no ACTION@ header.
+        self.assertIsNone(dm.parse_uevent(b"libudev\0\xfe\xed"))
+
+    def test_sysfs_fallback_publishes_hotplug_and_wakes_waiters(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            add_node(root, "hidraw0", 0x046D, 0xC52B)
+            monitor = dm.DeviceMonitor(scan_interval=0.01, sysfs_root=root)
+            events = []
+            monitor.subscribe(events.append)
+            with mock.patch.object(dm.DeviceMonitor, "_open_netlink", return_value=None):
+                monitor.start()
+            try:
+                self.assertEqual(monitor.source, "sysfs")
+                snapshot = monitor.snapshot()
+                self.assertEqual(snapshot, {"/dev/hidraw0": (0x046D, 0xC52B)})
+                self.assertIsNot(snapshot, monitor.nodes)
+                # A node present before the wait is not what the caller awaits.
+                probe = mock.Mock(side_effect=lambda: "/dev/hidraw1"
+                                  if (root / "hidraw1").exists() else None)
+                timer = threading.Timer(
+                    0.05, add_node, (root, "hidraw1", 0x04D9, 0xFC55))
+                timer.start()
+                self.assertEqual(monitor.wait_for(probe, timeout=2.0), "/dev/hidraw1")
+                timer.join()
+                self.assertEqual(monitor.wait_for(lambda: None, timeout=0.01), None)
+            finally:
+                monitor.stop()
+
+        added = [event for event in events if event.kind == "added"]
+        self.assertEqual([(e.node, e.vendor_id, e.product_id) for e in added],
+                         [("/dev/hidraw1", 0x04D9, 0xFC55)])
+        self.assertIsNone(monitor.source)
+
+    def test_unsolicited_status_reports_become_battery_events(self):
+        monitor = dm.DeviceMonitor()
+        events = []
+        monitor.subscribe(events.append)
+        status = bytearray(vp.build_simple(vp.CMD_STATUS))
+        status[0] = vp.RESPONSE_REPORT_ID
+        status[5:8] = b"\x02\x06\x01"
+        status[16] = vp.calc_checksum(status[:16])
+
+        monitor.report_listener(b"/dev/hidraw3", bytes(status))
+        monitor.report_listener(b"/dev/hidraw3", bytes(status[:16]) + b"\x00")
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].status, vp.BatteryStatus(6, 60, True, b"\x06\x01"))
+        self.assertEqual(events[0].node, "/dev/hidraw3")
+        self.assertLess(monitor.battery_age(b"/dev/hidraw3"), 5.0)
+        self.assertIsNone(monitor.battery_age(b"/dev/hidraw9"))
+
+
+if __name__ == "__main__":
+    unittest.main()
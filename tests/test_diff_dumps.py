@@ -0,0 +1,80 @@
+"""Offline tests for the vectorized dump diff in tools/diff_dumps.py."""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+import diff_dumps  # noqa: E402
+import dump_store  # noqa: E402
+
+
+@unittest.skipIf(diff_dumps.np is None, "NumPy is not installed")
+class DiffDumpsTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        changed = bytearray(dump_store.DUMP_SIZE)
+        changed[0x0C:0x0E] = b"\x01\x02"
+        changed[0x0301] = 0x05
+        (self.root / "a.bin").write_bytes(bytes(dump_store.DUMP_SIZE))
+        (self.root / "b.bin").write_bytes(bytes(changed))
+        pages = self.root / "dump_c"
+        pages.mkdir()
+        page = bytearray(dump_store.PAGE_SIZE)
+        page[0x60] = 0x07
+        (pages / "page_00.bin").write_bytes(bytes(page))
+        self.paths = [self.root / "a.bin", self.root / "b.bin", pages]
+
+    def test_runs_are_grouped_by_region_over_present_bytes(self):
+        store = dump_store.DumpStore(self.root)
+        self.addCleanup(store.close)
+        values, present = diff_dumps.load_matrix(store, self.paths)
+        self.assertEqual(int(present[2].sum()), dump_store.PAGE_SIZE)
+        report = diff_dumps.build_report(
+            ["a", "b", "c"], values, present, diff_dumps.diff(values, present))
+
+        self.assertEqual(report["compared_bytes"], dump_store.DUMP_SIZE)
+        self.assertEqual(report["changed_bytes"], 4)
+        self.assertEqual(report["regions"],
+                         {"DPI slot 0": 2, "button action 0": 1, "macro 0": 1})
+        dpi, button, macro = report["runs"]
+        self.assertEqual((dpi["start"], dpi["length"], dpi["transitions"]), ("0x000c", 2, 4))
+        self.assertEqual(dpi["values"], ["0000", "0102", "0000"])
+        self.assertEqual(button["values"], ["00", "00", "07"])
+        # The page dump lacks the macro area, so only two dumps compare there.
+        self.assertEqual((macro["start"], macro["transitions"]), ("0x0301", 1))
+        self.assertEqual(macro["values"], ["00", "05", None])
+
+    def test_variance_covers_present_bytes_of_changed_addresses(self):
+        store = dump_store.DumpStore(self.root)
+        self.addCleanup(store.close)
+        values, present = diff_dumps.load_matrix(store, self.paths)
+        variance = diff_dumps.diff(values, present)["variance"]
+        self.assertEqual(variance.shape, (dump_store.DUMP_SIZE,))
+        self.assertAlmostEqual(variance[0x0D], 8 / 9)
+        # Only a.bin and b.bin hold the macro area: values 0 and 5.
+        self.assertAlmostEqual(variance[0x0301], 6.25)
+        self.assertEqual(int((variance != 0).sum()), 4)
+
+    def test_main_writes_the_report(self):
+        output = self.root / "report.json"
+        argv = ["diff_dumps.py", "--root", str(self.root), "--output", str(output)]
+        with mock.patch.object(sys, "argv", argv):
+            self.assertEqual(diff_dumps.main(), 0)
+        report = json.loads(output.read_text(encoding="utf-8"))
+        self.assertEqual([Path(name).name for name in report["dumps"]],
+                         ["a.bin", "b.bin", "dump_c"])
+        self.assertEqual(report["changed_bytes"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Offline tests for the memory-mapped dump access in tools/dump_store.py."""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import profile_container as pc
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "tools"))
+
+import dump_store  # noqa: E402
+
+
+class DumpStoreTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.store = dump_store.DumpStore(self.root)
+        self.addCleanup(self.store.close)
+
+    def test_flat_pages_and_profile_layouts(self):
+        image = bytes(range(256)) * 256
+        (self.root / "flat.bin").write_bytes(image)
+        pages = self.root / "dump_1"
+        pages.mkdir()
+        (pages / "page_00.bin").write_bytes(image[:0x100])
+        (pages / "page_01.bin").write_bytes(b"\x11" * 0x100)
+        (self.root / "profile.vpp").write_bytes(
+            pc.encode_profile(0x25A7, 0xFA08, [(0x0060, image[0x60:0xA0])]))
+        (self.root / "short.bin").write_bytes(b"\x00" * 10)
+
+        self.assertEqual([path.name for path in self.store.paths()],
+                         ["dump_1", "flat.bin", "profile.vpp"])
+        flat = self.store.open(self.root / "flat.bin")
+        self.assertEqual(flat.kind, "flat")
+        self.assertEqual(bytes(flat.region("buttons")), image[0x60:0xA0])
+        self.assertEqual(bytes(flat.macro_slot(1)), image[0x480:0x600])
+
+        directory = self.store.open(pages)
+        self.assertEqual(directory.pages(), [0, 1])
+        self.assertEqual(bytes(directory.view(0xFE, 4)), image[0xFE:0x100] + b"\x11\x11")
+        self.assertFalse(directory.has(0x0200))
+
+        profile = self.store.open(self.root / "profile.vpp")
+        self.assertEqual(profile.kind, "profile")
+        self.assertEqual(bytes(profile.button_action(2)), image[0x68:0x6C])
+        with self.assertRaises(KeyError):
+            profile.region("config")
+
+    def test_truncated_page_file_raises_key_error(self):
+        pages = self.root / "dump_2"
+        pages.mkdir()
+        (pages / "page_00.bin").write_bytes(b"\x22" * 0x40)
+        dump = self.store.open(pages)
+        self.assertEqual(bytes(dump.view(0x10, 0x30)), b"\x22" * 0x30)
+        with self.assertRaises(KeyError):
+            dump.view(0x30, 0x20)
+        with self.assertRaises(KeyError):
+            dump.page(0)
+
+    def test_parsed_results_are_dropped_when_the_file_changes(self):
+        path = self.root / "flat.bin"
+        path.write_bytes(bytes(dump_store.DUMP_SIZE))
+        calls = []
+
+        def parser(dump):
+            calls.append(dump.path)
+            return bytes(dump.view(0, 1))
+
+        self.assertEqual(self.store.parsed(path, "first", parser), b"\x00")
+        self.assertEqual(self.store.parsed(path, "first", parser), b"\x00")
+        self.assertEqual(len(calls), 1)
+
+        path.write_bytes(b"\x01" * dump_store.DUMP_SIZE)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.store.parsed(path, "first", parser), b"\x01")
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import unittest
+from unittest import mock
 
 import holtek_protocol as hp
 
@@ -72,5 +73,126 @@ class HoltekProtocolTests(unittest.TestCase):
         self.assertEqual(profile["current_stage"], 2)
 
 
+    def test_write_plan_coalesces_a_full_profile_into_long_reports(self):
+        buttons = [("Left Click", {})] * 20
+        packets = (
+            hp.build_led_packets(1, 2, 3, profile=1)
+            + hp.build_button_map_packets(buttons, profile=1)
+            + hp.build_dpi_packets([800, 1600, 3200, 6400, 12800], profile=1)
+        )
+        plan = hp.WritePlan.from_packets(packets)
+        reports = plan.reports()
+
+        self.assertEqual(len(packets), 27)
+        self.assertEqual(len(reports), 4)
+        self.assertEqual(plan.categories, 0x0E)
+        self.assertEqual(
+            [hp.write_category(report[2] | (report[3] << 8)) for report in reports],
+            [hp.CATEGORY_BUTTONS, hp.CATEGORY_BUTTONS, hp.CATEGORY_DPI, hp.CATEGORY_LED])
+        self.assertEqual([report[0] for report in reports],
+                         [hp.RID_LONG, hp.RID_LONG, hp.RID_LONG, hp.RID_SHORT])
+        self.assertTrue(all(report[5:8] == bytes(3) for report in reports))
+
+        def apply(reports):
+            memory = bytearray(0x500)
+            for report in reports:
+                addr = report[2] | (report[3] << 8)
+                memory[addr:addr + report[4]] = report[8:8 + report[4]]
+            return memory
+
+        self.assertEqual(apply(reports), apply(packets))
+
+    def test_write_plan_keeps_last_write_and_commits_once(self):
+        plan = hp.WritePlan()
+        plan.add(hp.ADDR_LED_PROFILE[0], bytes(8))
+        plan.add(hp.ADDR_LED_PROFILE[0] + 1, b"\xff")
+        self.assertEqual(plan.runs(), [(hp.ADDR_LED_PROFILE[0], b"\x00\xff" + bytes(6))])
+        with self.assertRaisesRegex(ValueError, "F3"):
+            plan.add_packets([hp.build_polling_packet(1000)])
+
+        device = hp.HoltekDevice(b"/dev/fake")
+        device._dev = mock.Mock()
+        with mock.patch.object(hp.time, "sleep"):
+            device.apply_plan(plan, reset=False)
+        sent = [bytes(call.args[0]) for call in device._dev.send_feature_report.call_args_list]
+        self.assertEqual([report[:4] for report in sent],
+                         [hp.CTRL_ENTER_WRITE, sent[1][:4],
+                          hp.CTRL_COMMIT_LED, hp.CTRL_EXIT_WRITE])
+        self.assertEqual(sent[1], plan.reports()[0])
+
+    def test_image_reads_every_profile_in_long_reports_and_checks_headers(self):
+        memory = bytearray(0x500)
+        memory[hp.ADDR_ACTIVE_PROFILE] = 0x82
+        for profile, base in enumerate(hp.PROFILE_BASE_ADDRS):
+            memory[base:base + 4] = bytes((2, 0, 1, 0))
+            memory[base + 4:base + 16] = bytes((1, profile + 1, 3, 0, 0, 0,
+                                                1, 8, 4, 0, 0, 0))
+            button_map = hp.ADDR_BUTTONS_PROFILE[profile]
+            memory[button_map:button_map + 2] = (20).to_bytes(2, "little")
+            memory[button_map + 2:button_map + 6] = hp.build_button_entry(
+                "Profile Switch", {})
+            memory[hp.ADDR_LED_PROFILE[profile]:hp.ADDR_LED_PROFILE[profile] + 8] = (
+                bytes((0x80, profile, 0, 0, 3, 5, 1, 3)))
+        requests = []
+
+        def answer(report_id, size):
+            addr, length = requests[-1][2] | (requests[-1][3] << 8), requests[-1][4]
+            header = bytes((report_id, 0x08, addr & 0xFF, 0, length, 0, 0xFA, 0xFA))
+            return list((header + memory[addr:addr + length]).ljust(size, b"\0"))
+
+        device = hp.HoltekDevice(b"/dev/fake")
+        device._dev = mock.Mock()
+        device._dev.send_feature_report.side_effect = lambda report: requests.append(report)
+        device._dev.get_feature_report.side_effect = answer
+        with mock.patch.object(hp.time, "sleep"):
+            image = hp.HoltekImage.read(device)
+
+        self.assertEqual(len(requests), 18)
+        self.assertLessEqual(max(report[4] for report in requests), hp.LONG_DATA_LEN)
+        self.assertEqual(image.active_profile, 2)
+        for profile in range(5):
+            config = image.config(profile)
+            self.assertEqual(config["dpi_stages"], [200 * (profile + 1), 1600])
+            self.assertEqual(config["dpi_colors"], [3, 4])
+            self.assertEqual(config["led"]["r"], profile)
+            self.assertEqual(config["buttons"][0]["type"], hp.BTN_PROFILE)
+        self.assertEqual(image.config()["led"]["r"], 2)
+        self.assertEqual(len(requests), 18)
+
+        # A stale answer for another address is rejected, not decoded.
+        device._dev.get_feature_report.side_effect = None
+        device._dev.get_feature_report.return_value = list(
+            bytes((hp.RID_LONG, 0x08, 0x99, 0, 56, 0, 0xFA, 0xFA)).ljust(64, b"\0"))
+        with mock.patch.object(hp.time, "sleep"), \
+                self.assertRaisesRegex(RuntimeError, "unexpected header"):
+            device.read_range(0x0040, 56)
+
+
+    def test_image_tolerates_failed_dpi_and_led_reads(self):
+        memory = bytearray(0x500)
+        memory[hp.ADDR_ACTIVE_PROFILE] = 0x01
+        failing = {hp.PROFILE_BASE_ADDRS[1], hp.ADDR_LED_PROFILE[0]}
+
+        class Device:
+            def read_memory_long(self, addr, length):
+                if addr in failing:
+                    raise RuntimeError(f"Read failed at 0x{addr:04X}: no response")
+                return bytes(memory[addr:addr + length])
+
+        image = hp.HoltekImage.read(Device())
+        self.assertEqual(sorted(image.errors), sorted(failing))
+        config = image.config()
+        self.assertEqual((config["dpi_stages"], config["dpi_stage_current"]), ([], 0))
+        self.assertEqual(config["led"], {})
+        self.assertEqual(config["buttons"], [])
+        self.assertEqual(image.config(0)["dpi_colors"], [])
+
+        # Settings and button records stay mandatory, as they always were.
+        failing.add(hp.ADDR_BUTTONS_PROFILE[1] - 8)
+        with self.assertRaisesRegex(RuntimeError, "Read failed at 0x0140"):
+            hp.HoltekImage.read(Device()).config(1)
+        with self.assertRaisesRegex(RuntimeError, "Read failed"):
+            hp.HoltekImage.read(Device()).profile_regions()
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,97 @@
+"""HoltekDevice against the simulated Holtek firmware, without hardware."""
+
+from __future__ import annotations
+
+import errno
+import time
+import unittest
+from unittest import mock
+
+import holtek_protocol as hp
+import holtek_sim
+
+
+class SimulatedHoltekTests(unittest.TestCase):
+    def open(self, sim: holtek_sim.SimulatedHoltek) -> hp.HoltekDevice:
+        device = hp.HoltekDevice(sim.path, handle_factory=sim.handle)
+        device.open()
+        self.addCleanup(device.close)
+        return device
+
+    def test_image_read_decodes_the_factory_profiles(self):
+        sim = holtek_sim.SimulatedHoltek()
+        image = hp.HoltekImage.read(self.open(sim))
+        config = image.config(1)
+        self.assertEqual(config["dpi_stages"], holtek_sim.FACTORY_DPI)
+        self.assertEqual((config["led"]["r"], config["led"]["g"], config["led"]["b"]),
+                         holtek_sim.FACTORY_COLORS[1])
+        self.assertEqual(sim.stale_reads, 0)
+        self.assertEqual(sum(sim.too_fast.values()), 0)
+
+    def test_writes_take_effect_per_category_commit_and_on_reset(self):
+        sim = holtek_sim.SimulatedHoltek(reenumerate_time=0.0)
+        device = self.open(sim)
+        base = hp.PROFILE_BASE_ADDRS[0]
+        led = hp.ADDR_LED_PROFILE[0]
+
+        device.enter_write_mode()
+        for report in (hp.build_dpi_packets([400, 800])
+                       + hp.build_led_packets(1, 2, 3)):
+            device.send_reliable(report)
+        self.assertEqual(sim.flash[base], 2)
+        self.assertEqual(sim.active[base], len(holtek_sim.FACTORY_DPI))
+
+        device.commit_dpi()
+        self.assertEqual(sim.active[base], 2)
+        self.assertEqual(sim.active[led + 1], 0xFF)
+
+        old_path = sim.path
+        device.reset_device()
+        self.assertEqual(sim.active[led + 1:led + 4], b"\x01\x02\x03")
+        self.assertNotEqual(sim.path, old_path)
+        with self.assertRaises(OSError):
+            device.read_memory(base, 4)
+
+        with mock.patch.object(hp.hid, "enumerate", sim.enumerate):
+            path = hp.wait_for_device(timeout=1.0)
+        self.assertEqual(path, sim.path)
+        device.close()
+        device = self.open(sim)
+        self.assertEqual(device.read_dpi_stages(0), [400, 800])
+
+    def test_node_is_absent_while_re_enumerating(self):
+        sim = holtek_sim.SimulatedHoltek(reenumerate_time=0.05)
+        self.open(sim).reset_device()
+        self.assertIsNone(sim.path)
+        self.assertEqual(sim.enumerate(), [])
+        time.sleep(0.06)
+        self.assertEqual(sim.enumerate(hp.VENDOR_ID, hp.PRODUCT_ID)[0]["interface_number"],
+                         hp.INTERFACE)
+
+    def test_unpaced_reports_are_caught(self):
+        sim = holtek_sim.SimulatedHoltek()
+        device = self.open(sim)
+        with mock.patch.object(hp.time, "sleep"):
+            device.enter_write_mode()
+            for report in hp.build_led_packets(1, 2, 3):
+                device.send_reliable(report)
+        self.assertEqual(sim.too_fast[hp.CMD_WRITE_DATA], 1)
+        self.assertEqual(sim.flash[hp.ADDR_LED_PROFILE[0] + 1], 0xFF)
+
+        time.sleep(sim.commit_time)
+        with mock.patch.object(hp.time, "sleep"), \
+                self.assertRaisesRegex(RuntimeError, "unexpected header"):
+            device.read_memory(hp.PROFILE_BASE_ADDRS[1], 4)
+        self.assertEqual(sim.stale_reads, 1)
+
+    def test_reserved_header_bytes_stall_the_write(self):
+        device = self.open(holtek_sim.SimulatedHoltek())
+        report = bytearray(hp.build_memory_write(0x0040, b"\x01"))
+        report[5] = 0x01
+        with self.assertRaises(OSError) as caught:
+            device.send_feature(bytes(report))
+        self.assertEqual(caught.exception.errno, errno.EPIPE)
+
+
+if __name__ == "__main__":
+    unittest.main()
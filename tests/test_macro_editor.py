@@ -42,6 +42,7 @@ class MacroEditorTests(unittest.TestCase):
         self.device_patch.start()
         self.tray_patch.start()
         self.window = gui.MainWindow()
+        self.window._ensure_tab("Macros")
 
     def tearDown(self):
         self.window.battery_timer.stop()
@@ -243,6 +244,8 @@ class MacroEditorTests(unittest.TestCase):
         }
         self.assertFalse(self.window.tabs.isTabEnabled(tabs["Macros"]))
         self.assertFalse(self.window.tabs.isTabEnabled(tabs["Advanced"]))
+        # The DPI tab is built after detection and still picks up Holtek ranges.
+        self.window._ensure_tab("DPI")
         self.assertFalse(self.window.dpi_profile_controls.isHidden())
         self.assertEqual(self.window.dpi_rows[0][1].minimum(), 200)
         self.assertEqual(self.window.dpi_rows[0][1].maximum(), 28000)
@@ -29,6 +29,9 @@ def main():
         device = vp.VenusDevice(target_info.path)
         device.open()
         print("   Device opened.")
+        # The reader thread owns the interrupt endpoint; unmatched reports,
+        # such as answers to plain send() calls, are passed to listeners.
+        device.subscribe(lambda report: print(f"   Read: {report.hex()}"))
         
         # 4. Read Settings
         print("4. Attempting Read Settings Sequence...")
@@ -40,18 +43,11 @@ def main():
         print("   Sending Handshake (0x03)...")
         device.send(vp.build_simple(0x03))
         
-        # Read Loop manually to debug
+        # Let the listener print what arrives for 2 seconds
         print("   Reading loop...")
-        start = time.time()
-        while time.time() - start < 2.0:
-            resp = device._dev.read(128, timeout_ms=50)
-            if resp:
-                print(f"   Read: {bytes(resp).hex()}")
-            else:
-                pass
-                # print("   Read: None")
+        time.sleep(2.0)
         
-        # Read Page 0 (This will probably fail if above consumed it)
+        # Read Page 0
         # chunk = device.read_flash(0, 0, 8)
         # print(f"   Success! Data: {chunk.hex()}")
             
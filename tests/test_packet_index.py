@@ -0,0 +1,79 @@
+"""Offline tests for the SQLite packet index."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import holtek_protocol as hp
+import packet_index
+import venus_protocol as vp
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def button_write(index: int, action: bytes) -> bytes:
+    return vp.build_memory_write(0x0060 + index * 4, action)
+
+
+class PacketIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = packet_index.PacketIndex()
+        self.addCleanup(self.index.close)
+
+    def test_report_fields(self):
+        macro = button_write(2, bytes((vp.BUTTON_TYPE_MACRO, 0, 1, 0x4E)))
+        self.assertEqual(packet_index.report_fields(macro), (0x0068, 4, vp.BUTTON_TYPE_MACRO))
+        dpi = vp.build_memory_write(0x000C, bytes(4))
+        self.assertEqual(packet_index.report_fields(dpi), (0x000C, 4, None))
+        self.assertEqual(packet_index.report_fields(vp.build_simple(vp.CMD_READY)),
+                         (None, 0, None))
+        read = hp.build_read_request(0x1234, 8)
+        self.assertEqual(packet_index.report_fields(read), (0x1234, 8, None))
+
+    def test_query_filters(self):
+        ready = vp.build_simple(vp.CMD_READY)
+        macro = button_write(0, bytes((vp.BUTTON_TYPE_MACRO, 0, 1, 0x4E)))
+        key = button_write(1, bytes((vp.BUTTON_TYPE_KEYBOARD, 0x04, 0, 0x4C)))
+        self.index.add_capture("usbcap/bind macros.pcapng",
+                               [(1, 0.0, "H2M", ready), (2, 0.1, "H2M", macro),
+                                (3, 0.2, "M2H", bytes([0x09]) + macro[1:]),
+                                (4, 0.3, "H2M", key), (5, 0.4, "M2H", bytes(8))])
+        self.index.add_capture("usbcap/rebind.pcapng", [(7, 1.5, "H2M", key)])
+
+        self.assertEqual(self.index.captures(), ["bind macros", "rebind"])
+        self.assertEqual(len(self.index.query()), 5)  # the 8-byte report is skipped
+        macros = self.index.query(command=vp.CMD_WRITE, address=(0x0060, 0x009F),
+                                  button_type=vp.BUTTON_TYPE_MACRO)
+        self.assertEqual([(p.capture, p.frame, p.data) for p in macros],
+                         [("bind macros", 2, macro)])
+        self.assertEqual([p.frame for p in self.index.query(address=0x0064)], [4, 7])
+        self.assertEqual([p.frame for p in self.index.query(capture="re*")], [7])
+        self.assertEqual([p.frame for p in self.index.query(
+            command=(vp.CMD_READY, vp.CMD_WRITE), direction="H2M", limit=2)], [1, 2])
+
+    def test_re_adding_a_capture_replaces_it(self):
+        ready = vp.build_simple(vp.CMD_READY)
+        self.index.add_capture("a.pcapng", [(1, 0.0, "H2M", ready)] * 3, "old")
+        self.assertTrue(self.index.is_current("a.pcapng", "old"))
+        self.index.add_capture("a.pcapng", [(1, 0.0, "H2M", ready)], "new")
+        self.assertFalse(self.index.is_current("a.pcapng", "old"))
+        self.assertEqual(len(self.index.query(capture="a")), 1)
+
+    def test_indexes_a_capture_on_disk(self):
+        path = REPO_ROOT / "usbcap" / "rebind 1 from 1 to a.pcapng"
+        if not path.exists():
+            self.skipTest("capture corpus not present")
+        with tempfile.TemporaryDirectory() as tmp:
+            with packet_index.PacketIndex(Path(tmp) / "packets.sqlite") as index:
+                self.assertEqual(index.index_capture(path), 8)
+            with packet_index.PacketIndex(Path(tmp) / "packets.sqlite") as index:
+                [write] = index.query(command=vp.CMD_WRITE, direction="H2M",
+                                      address=(0x0060, 0x009F))
+        self.assertEqual((write.capture, write.address, write.button_type),
+                         ("rebind 1 from 1 to a", 0x0060, vp.BUTTON_TYPE_KEYBOARD))
+
+
+if __name__ == "__main__":
+    unittest.main()
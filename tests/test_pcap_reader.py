@@ -0,0 +1,115 @@
+"""Offline tests for the native pcapng/pcap USB capture reader."""
+
+from __future__ import annotations
+
+import io
+import struct
+import unittest
+from pathlib import Path
+
+import pcap_reader
+import venus_protocol as vp
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def pcapng(linktype: int, frames: list[tuple[int, bytes]], tsresol: int = 6) -> bytes:
+    """A little-endian pcapng file with one interface and ``(ticks, data)`` frames."""
+    def block(block_type: int, body: bytes) -> bytes:
+        body = body.ljust((len(body) + 3) // 4 * 4, b"\x00")
+        length = len(body) + 12
+        return struct.pack("<II", block_type, length) + body + struct.pack("<I", length)
+
+    out = block(0x0A0D0D0A, struct.pack("<IHHq", 0x1A2B3C4D, 1, 0, -1))
+    options = struct.pack("<HHB3x", 9, 1, tsresol) + struct.pack("<HH", 0, 0)
+    out += block(1, struct.pack("<HHI", linktype, 0, 0xFFFF) + options)
+    for ticks, data in frames:
+        out += block(6, struct.pack("<IIIII", 0, ticks >> 32, ticks & 0xFFFFFFFF,
+                                    len(data), len(data)) + data)
+    return out
+
+
+def usbpcap(irp: int, completion: bool, endpoint: int, transfer: int,
+            payload: bytes, stage: int | None = None) -> bytes:
+    header_len = 27 if stage is None else 28
+    header = struct.pack("<HQIHBHHBBI", header_len, irp, 0, 0, int(completion),
+                         1, 7, endpoint, transfer, len(payload))
+    if stage is not None:
+        header += bytes([stage])
+    return header + payload
+
+
+def usbmon(urb: int, event: bytes, endpoint: int, transfer: int, payload: bytes,
+           setup: bytes | None = None) -> bytes:
+    header = struct.pack("<QcBBBHccqiiII", urb, event, transfer, endpoint, 5, 3,
+                         b"\x00" if setup else b"-", b"=", 0, 0, 0,
+                         len(payload), len(payload))
+    return header + (setup or bytes(8)) + bytes(16) + payload
+
+
+class PcapReaderTests(unittest.TestCase):
+    def test_usbpcap_set_report_and_interrupt_response(self):
+        request = vp.build_simple(vp.CMD_READY)
+        response = bytes([0x09]) + request[1:16] + bytes([0])
+        setup = bytes.fromhex("2109080301001100")
+        capture = pcapng(pcap_reader.LINKTYPE_USBPCAP, [
+            (1_000_000, usbpcap(1, False, 0x80, 2, bytes.fromhex("8006000100001200"), 0)),
+            (1_250_000, usbpcap(2, False, 0x00, 2, setup + request, 0)),
+            (1_250_100, usbpcap(2, True, 0x00, 2, b"", 3)),
+            (1_253_000, usbpcap(3, True, 0x82, 1, response)),
+            (1_300_000, usbpcap(4, True, 0x81, 1, bytes(8))),
+        ])
+
+        reports = list(pcap_reader.read_reports(io.BytesIO(capture)))
+        self.assertEqual([(r.frame, r.direction, r.endpoint) for r in reports],
+                         [(2, "H2M", 0x00), (4, "M2H", 0x82)])
+        self.assertIsInstance(reports[0].data, memoryview)
+        self.assertEqual(bytes(reports[0].data), request)
+        self.assertAlmostEqual(reports[1].elapsed, 0.253)
+        self.assertEqual(reports[1].protocol, "areson")
+
+    def test_usbmon_get_report_answer_is_paired_with_its_request(self):
+        read = bytes([0x02, 0xF2, 0x40, 0x00, 0x04]).ljust(16, b"\x00")
+        answer = bytes([0x02, 0x08, 0x40, 0, 4, 0, 0xFA, 0xFA, 1, 2, 3, 4]).ljust(16, b"\x00")
+        capture = pcapng(pcap_reader.LINKTYPE_USB_LINUX_MMAPPED, [
+            (10, usbmon(1, b"S", 0x00, 2, read, bytes.fromhex("2109020302001000"))),
+            (11, usbmon(1, b"C", 0x00, 2, b"")),
+            (12, usbmon(2, b"S", 0x80, 2, b"", bytes.fromhex("a101020302001000"))),
+            (13, usbmon(2, b"C", 0x80, 2, answer)),
+            (14, usbmon(3, b"C", 0x80, 2, bytes(16))),  # no matching GET_REPORT
+        ], tsresol=3)
+
+        reports = list(pcap_reader.read_reports(io.BytesIO(capture), ("holtek",)))
+        self.assertEqual([(r.direction, bytes(r.data)) for r in reports],
+                         [("H2M", read), ("M2H", answer)])
+        self.assertAlmostEqual(reports[1].timestamp, 0.013)
+
+    def test_classic_pcap_and_truncated_final_block(self):
+        request = vp.build_simple(vp.CMD_STATUS)
+        frame = usbmon(9, b"S", 0x00, 2, request, bytes.fromhex("2109080301001100"))
+        capture = struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 0xFFFF,
+                              pcap_reader.LINKTYPE_USB_LINUX_MMAPPED)
+        capture += struct.pack("<IIII", 5, 500, len(frame), len(frame)) + frame
+        [report] = pcap_reader.read_reports(io.BytesIO(capture))
+        self.assertEqual((report.timestamp, bytes(report.data)), (5.0005, request))
+
+        ng = pcapng(pcap_reader.LINKTYPE_USB_LINUX_MMAPPED, [(1, frame), (2, frame)])
+        self.assertEqual(len(list(pcap_reader.read_reports(io.BytesIO(ng[:-10])))), 1)
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(pcap_reader.CaptureFormatError):
+            list(pcap_reader.read_packets(io.BytesIO(b"frame.number|frame.time\n")))
+
+    def test_decodes_a_windows_capture(self):
+        path = REPO_ROOT / "usbcap" / "rebind 1 from 1 to a.pcapng"
+        if not path.exists():
+            self.skipTest("capture corpus not present")
+        reports = list(pcap_reader.read_reports(path))
+        self.assertEqual(len(reports), 8)
+        self.assertTrue(all(vp.report_checksum_valid(r.data) for r in reports))
+        self.assertEqual(bytes(reports[6].data),
+                         vp.build_memory_write(0x0060, bytes.fromhex("05000050")))
+
+
+if __name__ == "__main__":
+    unittest.main()
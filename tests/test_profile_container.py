@@ -0,0 +1,63 @@
+"""Offline tests for the compact profile container."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import profile_container as pc
+
+
+def sample_image() -> bytes:
+    return bytes((address * 7) & 0xFF for address in range(pc.LEGACY_DUMP_SIZE))
+
+
+class ProfileContainerTests(unittest.TestCase):
+    def test_regions_cover_mapped_eeprom_only(self):
+        self.assertEqual(pc.PROFILE_REGIONS[0].start, 0x0000)
+        self.assertEqual(pc.PROFILE_REGIONS[-1].end, 0x1B00)
+        for previous, current in zip(pc.PROFILE_REGIONS, pc.PROFILE_REGIONS[1:]):
+            self.assertEqual(previous.end, current.start)
+        self.assertEqual(pc.region_named("macro2").start, 0x0480)
+
+    def test_round_trip_is_compact_and_lazy(self):
+        image = sample_image()
+        payload = pc.encode_profile(0x25A7, 0xFA08, pc.legacy_regions(image))
+        self.assertLess(len(payload), 7 * 1024 + 512)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / ("profile" + pc.SUFFIX)
+            path.write_bytes(payload)
+            self.assertTrue(pc.is_profile_container(path))
+            with pc.ProfileContainer.open(path) as profile:
+                self.assertEqual((profile.vendor_id, profile.product_id),
+                                 (0x25A7, 0xFA08))
+                self.assertEqual(len(profile.entries), len(pc.PROFILE_REGIONS))
+                macro = profile.region("macro16")
+                self.assertEqual(bytes(macro), image[0x1980:0x1B00])
+                macro.release()
+                for start, data in profile.regions():
+                    self.assertEqual(bytes(data), image[start:start + len(data)])
+                    data.release()
+
+    def test_corruption_and_foreign_files_are_rejected(self):
+        payload = bytearray(pc.encode_profile(
+            0x25A7, 0xFA08, pc.legacy_regions(sample_image())))
+        payload[-1] ^= 0xFF
+        profile = pc.ProfileContainer(bytes(payload))
+        # The header and untouched regions stay usable.
+        self.assertEqual(bytes(profile.region("config"))[:2], b"\x00\x07")
+        with self.assertRaisesRegex(pc.ProfileFormatError, "checksum"):
+            profile.region("macro16")
+
+        with self.assertRaisesRegex(pc.ProfileFormatError, "not a Venus"):
+            pc.ProfileContainer(b"JUNKJUNKJUNKJUNK")
+        with self.assertRaisesRegex(pc.ProfileFormatError, "truncated"):
+            pc.ProfileContainer(bytes(payload[:20]))
+        with self.assertRaisesRegex(pc.ProfileFormatError, "64 KiB"):
+            pc.legacy_regions(bytes(100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -41,35 +41,18 @@ def send_and_wait(mouse, hex_cmd):
     
     print(f"OUT: {cmd_data.hex(' ')}")
     
-    # Send Feature Report
-    # Note: hidapi.send_feature_report takes Report ID as first byte of buffer?
-    # Actually, for send_feature_report, the first byte MUST be the Report ID.
-    res = mouse._dev.send_feature_report(cmd_data)
-    if res < 0:
-        print(f"  ERROR: Send failed ({res})")
+    # Send Feature Report 0x08 and wait for the Input Report 0x09 with the
+    # same command and address; the device's reader thread routes it here.
+    try:
+        ack = mouse.exchange(cmd_data, timeout_ms=500)
+    except vp.ProtocolTimeout:
+        print("  TIMEOUT: No acknowledgment received.")
         return False
-        
-    # Wait for Input Report (ID 0x09)
-    # hid_read reads from the interrupt endpoint.
-    start = time.time()
-    while time.time() - start < 0.5: # 500ms timeout
-        ack = mouse._dev.read(17, timeout_ms=100)
-        if ack:
-            if ack[0] == 0x09:
-                # Match Cmd and Page/Offset?
-                # Usually byte 1 is Cmd, 3 is Page, 4 is Off
-                print(f"IN : {bytes(ack).hex(' ')}")
-                if ack[1] == cmd_data[1]:
-                    # Match success
-                    return True
-                else:
-                    print(f"  Warning: Cmd mismatch in ack (Exp {cmd_data[1]:02X}, Got {ack[1]:02X})")
-                    return True # Still an ack
-            else:
-                print(f"  Ignore non-0x09 packet: {bytes(ack).hex(' ')}")
-    
-    print("  TIMEOUT: No acknowledgment received.")
-    return False
+    except (OSError, vp.DeviceAccessError) as exc:
+        print(f"  ERROR: Send failed ({exc})")
+        return False
+    print(f"IN : {ack.hex(' ')}")
+    return True
 
 def test_reliable_replay():
     devs = vp.list_devices()
@@ -86,11 +69,11 @@ def test_reliable_replay():
     print(f"Connecting to {target_dev.path} (Iface {target_dev.interface_number})")
     mouse = vp.VenusDevice(target_dev.path)
     mouse.open()
+    # Reports nobody waits for (stale or unsolicited) land here.
+    mouse.subscribe(lambda report: print(f"  Ignore unmatched packet: {report.hex(' ')}"))
     
     try:
         print("Replaying sequence with Acknowledgment logic...")
-        # Clear input buffer first
-        mouse._dev.read(64, timeout_ms=10)
         
         for hex_pkt in SEQUENCE:
             if not send_and_wait(mouse, hex_pkt):
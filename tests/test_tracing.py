@@ -0,0 +1,101 @@
+"""Tests for the span ring buffer and its Chrome trace export."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import tracing
+from staging_manager import StagingManager
+from transaction_controller import TransactionController
+
+
+class Builder:
+    def build_packets(self, key, action, params):
+        return [bytes([0x08, 0x07, 0, 0, index, 1, 0]) for index in range(3)]
+
+
+class TracingTests(unittest.TestCase):
+    def test_ring_buffer_keeps_the_newest_spans(self):
+        tracer = tracing.Tracer(capacity=3)
+        for index in range(5):
+            with tracer.span("step", index=index):
+                pass
+        self.assertEqual([span.args["index"] for span in tracer.spans()], [2, 3, 4])
+
+    def test_errors_are_recorded_and_reraised(self):
+        tracer = tracing.Tracer()
+        with self.assertRaises(TimeoutError):
+            with tracer.span("exchange", "areson", command="0x07"):
+                raise TimeoutError("command 0x07 timed out")
+        span, = tracer.spans()
+        self.assertEqual(span.args, {"command": "0x07",
+                                     "error": "command 0x07 timed out"})
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = tracing.Tracer()
+        tracer.enabled = False
+        with tracer.span("exchange") as args:
+            args["retries"] = 1
+        self.assertEqual(tracer.spans(), [])
+
+    def test_traced_functions_annotate_their_own_span(self):
+        tracer = tracing.Tracer()
+
+        @tracing.traced("outer", "gui")
+        def outer(value):
+            """Docstring survives."""
+            tracing.annotate(value=value)
+            with tracing.span("inner"):
+                tracing.annotate(inner=True)
+            tracing.annotate(done=True)
+            raise ValueError("bad value")
+
+        with mock.patch.object(tracing, "TRACER", tracer):
+            with self.assertRaises(ValueError):
+                outer(3)
+            tracing.annotate(ignored=True)  # no open span
+        inner, span = tracer.spans()
+        self.assertEqual(outer.__doc__, "Docstring survives.")
+        self.assertEqual(inner.args, {"inner": True})
+        self.assertEqual((span.name, span.category), ("outer", "gui"))
+        self.assertEqual(span.args, {"value": 3, "done": True, "error": "bad value"})
+
+    def test_chrome_trace_nests_transaction_and_packet_spans(self):
+        tracer = tracing.Tracer()
+        device = mock.Mock()
+        device.skipped_writes = 0
+
+        def send(report):
+            with tracing.span("send_reliable", "areson", report=report):
+                return True
+
+        device.send_reliable.side_effect = send
+        staging = StagingManager()
+        staging.stage_change("Button 1", "Left Click", {})
+        with mock.patch.object(tracing, "TRACER", tracer):
+            controller = TransactionController(device, Builder())
+            self.assertTrue(controller.execute_transaction(staging))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "trace.json"
+            self.assertEqual(tracer.export_chrome_trace(path), 4)
+            events = json.loads(path.read_text())["traceEvents"]
+        transaction = events[-1]
+        self.assertEqual(transaction["name"], "execute_transaction")
+        self.assertEqual(transaction["ph"], "X")
+        self.assertEqual(transaction["args"],
+                         {"changes": 1, "packets": 3, "sent": 3})
+        self.assertEqual(events[0]["args"]["report"], "08070000000100")
+        for packet in events[:3]:
+            self.assertGreaterEqual(packet["ts"], transaction["ts"])
+            self.assertLessEqual(packet["ts"] + packet["dur"],
+                                 transaction["ts"] + transaction["dur"])
+        self.assertEqual(tracer.summary()["send_reliable"]["count"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
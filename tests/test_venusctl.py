@@ -0,0 +1,135 @@
+"""Offline tests for the headless venusctl front end."""
+
+from __future__ import annotations
+
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import mock
+
+import holtek_protocol as hp
+import profile_container as pc
+import venus_protocol as vp
+import venusctl
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+class FakeAreson:
+    """Applies EEPROM writes to a flat image and reads them back."""
+
+    def __init__(self):
+        self.memory = bytearray(0x10000)
+        self.sent = []
+        self.last_error = ""
+
+    def begin_write(self):
+        return True
+
+    def send_reliable(self, report):
+        self.sent.append(report)
+        if report[1] == vp.CMD_WRITE:
+            address = (report[3] << 8) | report[4]
+            self.memory[address:address + report[5]] = report[6:6 + report[5]]
+        return True
+
+    def read_range(self, start, length):
+        return bytes(self.memory[start:start + length])
+
+
+class VenusctlTests(unittest.TestCase):
+    def test_import_does_not_load_qt(self):
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, venusctl; "
+             "print(sorted(m for m in sys.modules if m.startswith('PyQt')))"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_apply_then_read_round_trips_through_the_transaction_path(self):
+        device = FakeAreson()
+        changes = {
+            "buttons": {"Button 1": {"action": "Keyboard Key",
+                                     "params": {"key": 0x04, "mod": 0x02}},
+                        "Button 2": {"action": "Macro",
+                                     "params": {"index": 3, "mode": 0xFE}}},
+            "dpi": [1000, 2000, 4000],
+            "rgb": {"r": 10, "g": 20, "b": 30, "brightness": 100},
+            "polling_rate": 500,
+        }
+        with mock.patch.object(vp.time, "sleep"):
+            written = venusctl.apply_config("venus_pro", device, changes)
+        self.assertEqual(written["written"],
+                         ["Button 1", "Button 2", "DPI", "RGB", "Polling"])
+
+        config = venusctl.read_config("venus_pro", device)
+        self.assertEqual(config["buttons"]["Button 1"],
+                         {"action": "Keyboard Key", "params": {"key": 0x04, "mod": 0x02}})
+        self.assertEqual(config["buttons"]["Button 2"]["params"]["index"], 3)
+        self.assertEqual(config["dpi"], [1000, 2000, 4000])
+        self.assertEqual((config["rgb"]["r"], config["rgb"]["g"], config["rgb"]["b"]),
+                         (10, 20, 30))
+        self.assertEqual(config["polling_rate"], 500)
+        json.dumps(config)
+
+    def test_partial_rgb_keeps_the_current_lighting(self):
+        device = FakeAreson()
+        with mock.patch.object(vp.time, "sleep"):
+            venusctl.apply_config("venus_pro", device,
+                                  {"rgb": {"r": 10, "g": 20, "b": 30}})
+            venusctl.apply_config("venus_pro", device, {"rgb": {"brightness": 50}})
+        rgb = venusctl.read_config("venus_pro", device)["rgb"]
+        self.assertEqual((rgb["r"], rgb["g"], rgb["b"], rgb["brightness"]),
+                         (10, 20, 30, 50))
+
+        # An unreadable Holtek LED record falls back to the defaults.
+        builder = venusctl.PacketBuilder("holtek", holtek_config={"led": {}})
+        self.assertEqual(builder.build_packets("RGB", "RGB", {"mode": 1}),
+                         hp.build_led_packets(255, 255, 255, 1, 5, 1))
+
+    def test_malformed_input_is_reported_as_json(self):
+        with self.assertRaisesRegex(venusctl.CommandError, 'needs an "action"'):
+            venusctl.apply_config("venus_pro", FakeAreson(),
+                                  {"buttons": {"Button 1": {"params": {}}}})
+        with self.assertRaisesRegex(venusctl.CommandError, "unknown \"rgb\" fields"):
+            venusctl.apply_config("venus_pro", FakeAreson(), {"rgb": {"red": 1}})
+
+        info = vp.DeviceInfo(b"/dev/hidraw1", "Venus", "", 0x25A7, 0xFA08, "")
+        output = io.StringIO()
+        with mock.patch.object(vp, "list_devices", return_value=[info]), \
+                mock.patch.object(sys, "stdin", io.StringIO('[{"key": 4}]')), \
+                redirect_stdout(output):
+            status = venusctl.main(["macro", "1", "--events", "-"])
+        self.assertEqual(status, 1)
+        self.assertIn("bad macro event", json.loads(output.getvalue())["error"])
+
+    def test_profiles_match_by_device_type(self):
+        wired = vp.DeviceInfo(b"/dev/hidraw1", "Venus", "", 0x25A7, 0xFA08, "")
+        regions = [(0x0100, b"\x01" * 10)]
+        with tempfile.TemporaryDirectory() as tmp:
+            wireless = Path(tmp) / "wireless.vpro"
+            wireless.write_bytes(pc.encode_profile(0x25A7, 0xFA07, regions))
+            self.assertEqual(venusctl.load_profile_regions(wireless, wired), regions)
+
+            holtek = Path(tmp) / "holtek.vpro"
+            holtek.write_bytes(pc.encode_profile(hp.VENDOR_ID, hp.PRODUCT_ID, regions))
+            with self.assertRaisesRegex(venusctl.CommandError, "exported from 04d9:fc55"):
+                venusctl.load_profile_regions(holtek, wired)
+
+    def test_errors_are_reported_as_json(self):
+        output = io.StringIO()
+        with mock.patch.object(vp, "list_devices", return_value=[]), \
+                redirect_stdout(output):
+            status = venusctl.main(["battery"])
+        self.assertEqual(status, 1)
+        self.assertEqual(json.loads(output.getvalue()),
+                         {"error": "no supported mouse found"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,22 +7,23 @@ for _parent in Path(__file__).resolve().parents:
         break
 
 
-import re
+import packet_index
+import venus_protocol as vp
+from batch_decode import DEFAULT_INDEX
 
 def analyze_bases():
-    log_file = "artifacts/txt/host_mouse_communication.txt"
-    print(f"Analyzing {log_file} for Packet Checksum Bases...")
+    print(f"Analyzing {DEFAULT_INDEX} for Packet Checksum Bases...")
+    if not DEFAULT_INDEX.exists():
+        print("Packet index not found. Please run tools/batch_decode.py first.")
+        return
     
-    with open(log_file, 'r') as f:
-        lines = f.readlines()
+    with packet_index.PacketIndex(DEFAULT_INDEX) as index:
+        writes = index.query(command=vp.CMD_WRITE, direction="H2M", protocol="areson")
         
     bases = {} # Map Type -> Set of Bases
     
-    for line in lines:
-        if "--> H2M | WRITE" not in line: continue
-        
-        parts = line.split('|')[2].strip().split()
-        pkt = [int(b, 16) for b in parts]
+    for packet in writes:
+        pkt = list(packet.data)
         
         # Must be 17 bytes
         if len(pkt) != 17: continue
@@ -10,48 +10,14 @@ for _parent in Path(__file__).resolve().parents:
         sys.path.insert(0, str(_parent))
         break
 
-import subprocess
-import re
-from pathlib import Path
+import pcap_reader
 
 
-def extract_hid_data(pcap_file: str) -> list[tuple[int, bytes]]:
-    """Extract HID feature reports from a pcap file."""
-    result = subprocess.run(
-        ["tshark", "-r", pcap_file, "-Y", "usb.data_len >= 17", "-x"],
-        capture_output=True,
-        text=True
-    )
-    
-    packets = []
-    current_hex = []
-    in_usb_control = False
-    
-    for line in result.stdout.split('\n'):
-        # Look for "USB Control" or "Packet" headers
-        if line.startswith("USB Control"):
-            in_usb_control = True
-            current_hex = []
-        elif line.startswith("Packet") or (line == "" and current_hex):
-            if current_hex and in_usb_control:
-                # Parse the hex lines
-                hex_bytes = b''
-                for hex_line in current_hex:
-                    # Pattern: 0000  xx xx xx xx...   ascii
-                    match = re.match(r'^[0-9a-f]{4}\s+((?:[0-9a-f]{2}\s+)+)', hex_line)
-                    if match:
-                        hex_str = match.group(1).replace(' ', '')
-                        hex_bytes += bytes.fromhex(hex_str)
-                if len(hex_bytes) >= 17:
-                    packets.append(hex_bytes)
-                current_hex = []
-                in_usb_control = False
-            if line.startswith("Packet"):
-                in_usb_control = False
-        elif in_usb_control and re.match(r'^[0-9a-f]{4}\s+', line):
-            current_hex.append(line)
-    
-    return packets
+def extract_hid_data(pcap_file: str) -> list[bytes]:
+    """Extract the Areson feature reports the host sent in a capture."""
+    return [bytes(report.data)
+            for report in pcap_reader.read_reports(pcap_file, ("areson",))
+            if report.direction == "H2M"]
 
 
 def analyze_modifier_key_packet(data: bytes) -> dict:
@@ -59,15 +25,7 @@ def analyze_modifier_key_packet(data: bytes) -> dict:
     if len(data) < 17:
         return {}
     
-    # Skip the first setup bytes (8 bytes for setup header: 09 08 03 01 00 11 00)
-    # The actual HID data starts after that
-    if data[0:2] == b'\x09\x08':
-        report_data = data[7:]  # Skip setup header
-    else:
-        report_data = data
-    
-    if len(report_data) < 17:
-        return {}
+    report_data = data
     
     report_id = report_data[0]
     cmd = report_data[1]
@@ -7,26 +7,23 @@ for _parent in Path(__file__).resolve().parents:
         break
 
 
-import re
+import packet_index
+import venus_protocol as vp
+from batch_decode import DEFAULT_INDEX
 
 def analyze_replay():
     target_cap = "bind macros 123"
-    with open("artifacts/txt/host_mouse_communication.txt", 'r') as f:
-        lines = f.readlines()
+    if not DEFAULT_INDEX.exists():
+        print("Packet index not found. Please run tools/batch_decode.py first.")
+        return
+    with packet_index.PacketIndex(DEFAULT_INDEX) as index:
+        writes = index.query(capture=f"*{target_cap}*", command=vp.CMD_WRITE,
+                             direction="H2M", protocol="areson")
         
     pages = {} # Map Page -> bytearray
-    in_target = False
     
-    for line in lines:
-        if line.startswith("["):
-            in_target = (target_cap in line)
-            continue
-        if not in_target: continue
-        if "--> H2M | WRITE" not in line: continue
-        
-        parts = line.split('|')[2].strip().split()
-        pkt = [int(b, 16) for b in parts]
-        if pkt[1] != 0x07: continue
+    for packet in writes:
+        pkt = list(packet.data)
         
         p = pkt[3]
         o = pkt[4]
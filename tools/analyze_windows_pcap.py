@@ -6,32 +6,15 @@ for _parent in Path(__file__).resolve().parents:
         sys.path.insert(0, str(_parent))
         break
 
-import subprocess
-import os
-import sys
+import pcap_reader
 
 def analyze_pcap():
     pcap_path = "usbcap/create simple_macro dn-1 up-1 no delay bind to button 1.pcapng"
     
-    cmd = [
-        "tshark",
-        "-r", pcap_path,
-        "-Y", "usbhid.data",  # Filter
-        "-T", "fields",
-        "-e", "usbhid.data"
-    ]
-    
-    print(f"Running tshark on {pcap_path}...")
-    try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Error running tshark: {e}")
-        # Try usb.capdata if usbhid.data fails to produce output?
-        cmd[2] = "usb.capdata"
-        cmd[4] = "usb.capdata"
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-
-    lines = result.stdout.splitlines()
+    print(f"Reading {pcap_path}...")
+    lines = [bytes(report.data).hex()
+             for report in pcap_reader.read_reports(pcap_path, ("areson",))
+             if report.direction == "H2M"]
     print(f"Extracted {len(lines)} packets.")
     
     # DEBUG: Print first 20 lines
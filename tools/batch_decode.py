@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""Decode the whole USB capture corpus into JSON Lines, in parallel.
+
+Every capture under ``usbcap/`` and ``new-usbcap/`` (or those given) is
+decoded by ``pcap_reader`` in a process pool.  Each Areson or Holtek report
+becomes one JSON object::
+
+    {"capture": "usbcap/rebind 1 from 1 to a.pcapng", "frame": 763,
+     "time": 20.625904, "direction": "H2M", "protocol": "areson",
+     "report_id": 8, "command": 7, "address": 96, "length": 4,
+     "region": "button action 0", "data": "080700006004..."}
+
+``address`` and ``region`` are null where the report carries no address.
+Results are cached per capture under ``artifacts/decoded/`` by the SHA-256
+of the file, so only new or changed captures are decoded again; an index of
+size and mtime avoids even re-hashing unchanged files.  The reports are also
+loaded into the ``packet_index`` database ``artifacts/decoded/packets.sqlite``
+that the analysis tools query.
+
+Usage:
+    python3 tools/batch_decode.py                       # -> artifacts/decoded/reports.jsonl
+    python3 tools/batch_decode.py --jobs 4 captures/*.pcapng --output run.jsonl
+    python3 tools/batch_decode.py --log artifacts/txt/host_mouse_communication.txt
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent import futures
+from pathlib import Path
+
+for _parent in Path(__file__).resolve().parents:
+    if (_parent / "venus_protocol.py").exists():
+        sys.path.insert(0, str(_parent))
+        REPO_ROOT = _parent
+        break
+
+import packet_index
+import pcap_reader
+from analyze_captures_to_log import format_packet, write_log
+from decode_areson_pcap import region
+
+CAPTURE_DIRS = ("usbcap", "new-usbcap")
+DEFAULT_CACHE = REPO_ROOT / "artifacts" / "decoded"
+DEFAULT_INDEX = DEFAULT_CACHE / "packets.sqlite"
+# Bump when the record format changes so stale cache entries are not reused.
+CACHE_VERSION = 1
+
+
+def capture_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def report_record(capture: str, report: pcap_reader.Report) -> dict:
+    data = report.data
+    protocol = report.protocol
+    address, length, _button_type = packet_index.report_fields(data)
+    return {
+        "capture": capture,
+        "frame": report.frame,
+        "time": round(report.elapsed, 6),
+        "direction": report.direction,
+        "protocol": protocol,
+        "report_id": data[0],
+        "command": data[1],
+        "address": address,
+        "length": length,
+        "region": region(address) if protocol == "areson" and address is not None else None,
+        "data": data.hex(),
+    }
+
+
+def decode_capture(path: str, capture: str, destination: str) -> int:
+    """Decode one capture into ``destination``; return the report count.
+
+    Runs in a worker process.  The file is written under a temporary name
+    and renamed, so an interrupted run never leaves a partial cache entry.
+    """
+    temporary = destination + f".{os.getpid()}.tmp"
+    count = 0
+    with open(temporary, "w", encoding="utf-8") as out:
+        for report in pcap_reader.read_reports(path):
+            out.write(json.dumps(report_record(capture, report)) + "\n")
+            count += 1
+    os.replace(temporary, destination)
+    return count
+
+
+class DecodeCache:
+    """One JSON Lines file per decoded capture plus an index of file hashes."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index_path = directory / "index.json"
+        try:
+            self._index = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._index = {}
+        if self._index.get("version") != CACHE_VERSION:
+            self._index = {"version": CACHE_VERSION, "files": {}}
+
+    def digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = str(path.resolve())
+        entry = self._index["files"].get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry["sha256"]
+        digest = capture_hash(path)
+        self._index["files"][key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                     "sha256": digest}
+        return digest
+
+    def entry(self, digest: str, capture: str) -> Path:
+        # The capture name is part of every record, so it is part of the key.
+        name = hashlib.sha256(capture.encode()).hexdigest()[:8]
+        return self.directory / f"{digest}-{name}-v{CACHE_VERSION}.jsonl"
+
+    def save(self) -> None:
+        self._index_path.write_text(json.dumps(self._index, indent=1), encoding="utf-8")
+
+
+def capture_name(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        return path.name
+
+
+def default_captures() -> list[Path]:
+    return sorted(path for directory in CAPTURE_DIRS
+                  for path in (REPO_ROOT / directory).glob("*.pcapng"))
+
+
+def decode_all(paths: list[Path], cache: DecodeCache, jobs: int | None = None,
+               log=print) -> list[tuple[str, Path]]:
+    """Decode ``paths`` through the cache; return ``(capture, entry)`` in order."""
+    entries = []
+    pending = {}
+    for path in paths:
+        capture = capture_name(path)
+        entry = cache.entry(cache.digest(path), capture)
+        entries.append((capture, entry))
+        if not entry.exists():
+            pending[entry] = (str(path), capture)
+    cache.save()
+
+    if pending:
+        with futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            work = {pool.submit(decode_capture, path, capture, str(entry)): capture
+                    for entry, (path, capture) in pending.items()}
+            for done in futures.as_completed(work):
+                log(f"decoded {work[done]}: {done.result()} reports")
+    return entries
+
+
+def update_index(index: packet_index.PacketIndex, entries: list[tuple[str, Path]]) -> int:
+    """Load cached captures the index does not have yet; return how many."""
+    updated = 0
+    for capture, entry in entries:
+        digest = entry.name.split("-", 1)[0]
+        if index.is_current(capture, digest):
+            continue
+        with open(entry, encoding="utf-8") as cached:
+            records = (json.loads(line) for line in cached)
+            index.add_capture(capture, ((r["frame"], r["time"], r["direction"],
+                                         bytes.fromhex(r["data"])) for r in records), digest)
+        updated += 1
+    return updated
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("captures", nargs="*", type=Path,
+                        help="captures to decode (default: usbcap/ and new-usbcap/)")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--cache", type=Path, default=DEFAULT_CACHE)
+    parser.add_argument("--output", "-o", type=Path,
+                        help="combined JSON Lines file (default: <cache>/reports.jsonl)")
+    parser.add_argument("--index", type=Path, default=DEFAULT_INDEX,
+                        help="packet database the analysis tools query "
+                             "(default: artifacts/decoded/packets.sqlite)")
+    parser.add_argument("--log", type=Path,
+                        help="also write the host/mouse text log in the "
+                             "analyze_captures_to_log.py format")
+    args = parser.parse_args()
+
+    paths = args.captures or default_captures()
+    missing = [str(path) for path in paths if not path.is_file()]
+    if missing:
+        parser.error(f"capture does not exist: {missing[0]}")
+
+    started = time.monotonic()
+    cache = DecodeCache(args.cache)
+    try:
+        entries = decode_all(paths, cache, args.jobs)
+    except (OSError, pcap_reader.CaptureFormatError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    output = args.output or args.cache / "reports.jsonl"
+    reports = 0
+    with open(output, "w", encoding="utf-8") as out:
+        for _capture, entry in entries:
+            with open(entry, encoding="utf-8") as cached:
+                for line in cached:
+                    out.write(line)
+                    reports += 1
+
+    with packet_index.PacketIndex(args.index) as index:
+        indexed = update_index(index, entries)
+
+    if args.log:
+        with open(args.log, "w") as out:
+            write_log(out, ((Path(capture).name, list(_log_lines(entry)))
+                            for capture, entry in entries))
+
+    print(f"{len(entries)} captures, {reports} reports -> {output} "
+          f"({indexed} captures indexed) in {time.monotonic() - started:.2f}s")
+    return 0
+
+
+def _log_lines(entry: Path):
+    with open(entry, encoding="utf-8") as cached:
+        for line in cached:
+            record = json.loads(line)
+            if record["protocol"] == "areson":
+                yield format_packet(bytes.fromhex(record["data"]))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,20 @@
 #!/usr/bin/env python3
-"""Decode Areson Venus feature requests and interrupt responses from USBPcap."""
+"""Decode Areson Venus feature requests and interrupt responses from USBPcap
+or usbmon captures."""
 
 from __future__ import annotations
 
 import argparse
-import shutil
-import subprocess
 import sys
 from pathlib import Path
 
+for _parent in Path(__file__).resolve().parents:
+    if (_parent / "venus_protocol.py").exists():
+        sys.path.insert(0, str(_parent))
+        break
+
+import pcap_reader
+
 
 COMMANDS = {
     0x01: "challenge",
@@ -65,29 +71,10 @@ def describe(packet: bytes) -> str:
 
 
 def extract(path: Path):
-    if shutil.which("tshark") is None:
-        raise RuntimeError("tshark is required (install Wireshark CLI tools)")
-    command = [
-        "tshark", "-r", str(path),
-        "-Y", "usb.data_fragment || usbhid.data",
-        "-T", "fields", "-E", "separator=|", "-E", "occurrence=f",
-        "-e", "frame.number", "-e", "frame.time_relative",
-        "-e", "usb.endpoint_address", "-e", "usb.data_fragment",
-        "-e", "usbhid.data",
-    ]
-    result = subprocess.run(command, check=True, text=True, capture_output=True)
-    for line in result.stdout.splitlines():
-        columns = line.split("|")
-        if len(columns) != 5:
-            continue
-        frame, timestamp, endpoint, control_data, interrupt_data = columns
-        value = control_data or interrupt_data
-        try:
-            packet = bytes.fromhex(value.replace(":", ""))
-        except ValueError:
-            continue
-        if len(packet) == 17 and packet[0] in (0x08, 0x09):
-            yield frame, timestamp, endpoint, packet
+    """Yield ``(frame, seconds, endpoint, report)`` for every Areson report."""
+    for report in pcap_reader.read_reports(path, ("areson",)):
+        endpoint = f"0x{report.endpoint:02x}" if report.endpoint else ""
+        yield report.frame, report.elapsed, endpoint, bytes(report.data)
 
 
 def main() -> int:
@@ -103,7 +90,7 @@ def main() -> int:
             raw = f" raw={packet.hex()}" if args.hex else ""
             print(f"{int(frame):6d} {float(timestamp):10.6f} ep={endpoint or 'ctrl':>4} "
                   f"{describe(packet)}{raw}")
-    except (RuntimeError, subprocess.CalledProcessError) as exc:
+    except (OSError, pcap_reader.CaptureFormatError) as exc:
         print(f"error: {exc}", file=sys.stderr)
         return 2
     return 0
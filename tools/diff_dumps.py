@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Diff many EEPROM dumps at once and report changes by firmware region.
+
+Every dump is loaded into one row of an ``N x 65536`` NumPy array together
+with a presence mask (directory dumps often hold only a few pages).  A single
+vectorized pass finds the addresses whose value differs between any two
+dumps, their per-byte variance and how often they changed between
+consecutive dumps.  Changed addresses are grouped into contiguous runs within the named
+regions of ``decode_areson_pcap.region()``.
+
+Usage:
+    python3 tools/diff_dumps.py                      # every dump in dumps/
+    python3 tools/diff_dumps.py a.bin dump_123/ b.vpp --output report.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+for _parent in Path(__file__).resolve().parents:
+    if (_parent / "venus_protocol.py").exists():
+        sys.path.insert(0, str(_parent))
+        break
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional tool dependency
+    np = None
+
+from decode_areson_pcap import region
+from dump_store import DUMP_SIZE, DumpStore
+
+
+def load_matrix(store: DumpStore, paths: list[Path]):
+    """Return ``(values, present)`` arrays of shape ``(len(paths), 65536)``."""
+    values = np.zeros((len(paths), DUMP_SIZE), dtype=np.uint8)
+    present = np.zeros((len(paths), DUMP_SIZE), dtype=bool)
+    for row, path in enumerate(paths):
+        for start, view in store.open(path).pieces():
+            values[row, start:start + len(view)] = np.frombuffer(view, dtype=np.uint8)
+            present[row, start:start + len(view)] = True
+    return values, present
+
+
+def region_group(address: int) -> str:
+    # Macro regions carry a per-byte offset suffix; group by slot instead.
+    return region(address).split(" +", 1)[0]
+
+
+def diff(values, present) -> dict:
+    """Compute per-byte change statistics over every dump row."""
+    counts = present.sum(axis=0)
+    compared = counts >= 2
+    high = np.where(present, values, 0).max(axis=0)
+    low = np.where(present, values, 0xFF).min(axis=0)
+    changed = compared & (high != low)
+
+    # Unchanged columns have zero variance, so only changed ones are widened
+    # to float; a full N x 65536 float64 pass costs 262 MB at 500 dumps.
+    columns = np.flatnonzero(changed)
+    variance = np.zeros(values.shape[1])
+    if columns.size:
+        column_values = values[:, columns].astype(np.float64)
+        column_present = present[:, columns]
+        total = counts[columns]
+        mean = np.where(column_present, column_values, 0.0).sum(axis=0) / total
+        column_values -= mean
+        column_values **= 2
+        variance[columns] = np.where(
+            column_present, column_values, 0.0).sum(axis=0) / total
+
+    both = present[1:] & present[:-1]
+    transitions = ((values[1:] != values[:-1]) & both).sum(axis=0)
+    return {
+        "compared": compared,
+        "changed": changed,
+        "variance": variance,
+        "transitions": transitions,
+    }
+
+
+def group_runs(changed) -> list[tuple[int, int, str]]:
+    """Split changed addresses into contiguous runs inside one region."""
+    addresses = np.flatnonzero(changed)
+    runs: list[tuple[int, int, str]] = []
+    for address in addresses.tolist():
+        name = region_group(address)
+        if runs and runs[-1][1] == address and runs[-1][2] == name:
+            runs[-1] = (runs[-1][0], address + 1, name)
+        else:
+            runs.append((address, address + 1, name))
+    return runs
+
+
+def build_report(names: list[str], values, present, stats: dict) -> dict:
+    runs = []
+    for start, end, name in group_runs(stats["changed"]):
+        runs.append({
+            "region": name,
+            "start": f"0x{start:04x}",
+            "length": end - start,
+            "max_variance": round(float(stats["variance"][start:end].max()), 3),
+            "transitions": int(stats["transitions"][start:end].sum()),
+            "values": [
+                values[row, start:end].tobytes().hex()
+                if present[row, start:end].all() else None
+                for row in range(len(names))
+            ],
+        })
+    by_region: dict[str, int] = {}
+    for run in runs:
+        by_region[run["region"]] = by_region.get(run["region"], 0) + run["length"]
+    return {
+        "dumps": names,
+        "compared_bytes": int(stats["compared"].sum()),
+        "changed_bytes": int(stats["changed"].sum()),
+        "regions": by_region,
+        "runs": runs,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dumps", nargs="*", type=Path,
+                        help="dump files or page directories (default: all of --root)")
+    parser.add_argument("--root", type=Path, default=Path("dumps"))
+    parser.add_argument("--output", type=Path,
+                        help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    if np is None:
+        print("diff_dumps.py requires NumPy (pip install numpy)", file=sys.stderr)
+        return 2
+
+    store = DumpStore(args.root)
+    paths = args.dumps or store.paths()
+    if len(paths) < 2:
+        print("Need at least two dumps to diff", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    values, present = load_matrix(store, paths)
+    stats = diff(values, present)
+    report = build_report([str(path) for path in paths], values, present, stats)
+    report["seconds"] = round(time.perf_counter() - started, 4)
+    store.close()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -63,14 +63,8 @@ def main():
         print(f"[{i+1}/{len(pages_to_dump)}] Reading Page 0x{page:02X}...", end="", flush=True)
         page_data = bytearray()
         
-        # Each page is typically 256 bytes?
-        # Let's try to read 0x00 to 0xFF in 8-byte chunks
         try:
-            for offset in range(0, 256, 8):
-                chunk = device.read_flash(page, offset, 8)
-                page_data.extend(chunk)
-                if offset % 64 == 0:
-                    print(".", end="", flush=True)
+            page_data.extend(device.read_range(page << 8, 256))
             
             # Save to file
             with open(f"{out_dir}/page_{page:02X}.bin", "wb") as f:
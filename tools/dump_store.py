@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Shared, memory-mapped access to the EEPROM dumps under ``dumps/``.
+
+Three layouts exist in the corpus:
+
+* flat 64 KiB images (``profile.bin``, ``Good_Config_Windows.bin``),
+* ``dump_<time>/`` directories of 256-byte ``page_XX.bin`` files written by
+  ``tools/dump_memory.py``,
+* ``.vpp`` profile containers written by the GUI.
+
+:class:`DumpStore` maps each file once and hands out ``memoryview`` slices
+by logical region, so comparing many dumps never copies them.  A slice is
+zero-copy unless it spans two page files of a directory dump.  Parsed region
+objects are cached per file and dropped when the file's mtime changes.
+"""
+from __future__ import annotations
+
+import mmap
+import sys
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+for _parent in Path(__file__).resolve().parents:
+    if (_parent / "venus_protocol.py").exists():
+        sys.path.insert(0, str(_parent))
+        break
+
+import profile_container as pc
+
+T = TypeVar("T")
+
+PAGE_SIZE = 0x100
+DUMP_SIZE = 0x10000
+
+# Logical regions, matching region() in tools/decode_areson_pcap.py.
+REGIONS: dict[str, tuple[int, int]] = {
+    "config": (0x0000, 0x0100),
+    "dpi": (0x000C, 0x0020),
+    "lighting": (0x002C, 0x0034),
+    "buttons": (0x0060, 0x0040),
+    "events": (0x0100, 0x0200),
+    "macros": (0x0300, 0x1800),
+}
+DPI_SLOT_SIZE = 4
+BUTTON_ACTION_SIZE = 4
+EVENT_DEFINITION_SIZE = 0x20
+MACRO_SLOT_BASE = 0x0300
+MACRO_SLOT_SIZE = 0x180
+MACRO_SLOTS = 16
+
+
+def _map_file(path: Path) -> mmap.mmap | None:
+    with open(path, "rb") as handle:
+        try:
+            return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+
+
+class Dump:
+    """One EEPROM image, addressed by absolute EEPROM address."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.mtime_ns = self.path.stat().st_mtime_ns
+        # Address of each mapped piece -> its view.
+        self._pieces: dict[int, memoryview] = {}
+        self._maps: list[mmap.mmap] = []
+        self._container: pc.ProfileContainer | None = None
+        if self.path.is_dir():
+            self.kind = "pages"
+        elif pc.is_profile_container(self.path):
+            self.kind = "profile"
+            self._container = pc.ProfileContainer.open(self.path)
+            for entry in self._container.entries:
+                self._pieces[entry.start] = self._container.region(entry.start)
+        else:
+            self.kind = "flat"
+            mapped = _map_file(self.path)
+            if mapped is None or len(mapped) != DUMP_SIZE:
+                size = 0 if mapped is None else len(mapped)
+                if mapped is not None:
+                    mapped.close()
+                raise ValueError(f"{self.path} is not a 64 KiB dump ({size} bytes)")
+            self._maps.append(mapped)
+            self._pieces[0] = memoryview(mapped)
+
+    def _page_piece(self, page: int) -> memoryview | None:
+        start = page * PAGE_SIZE
+        if start in self._pieces:
+            return self._pieces[start]
+        page_path = self.path / f"page_{page:02X}.bin"
+        if not page_path.exists():
+            return None
+        mapped = _map_file(page_path)
+        if mapped is None:
+            return None
+        self._maps.append(mapped)
+        self._pieces[start] = memoryview(mapped)
+        return self._pieces[start]
+
+    def _piece_at(self, address: int) -> tuple[int, memoryview] | None:
+        if self.kind == "pages":
+            page = address // PAGE_SIZE
+            piece = self._page_piece(page)
+            # A truncated page file leaves the rest of its page absent.
+            if piece is None or address >= page * PAGE_SIZE + len(piece):
+                return None
+            return page * PAGE_SIZE, piece
+        for start, piece in self._pieces.items():
+            if start <= address < start + len(piece):
+                return start, piece
+        return None
+
+    def has(self, start: int, length: int = 1) -> bool:
+        try:
+            self.view(start, length)
+        except KeyError:
+            return False
+        return True
+
+    def view(self, start: int, length: int) -> memoryview:
+        """Return ``length`` bytes from ``start``; raises KeyError if absent."""
+        parts = []
+        address, end = start, start + length
+        while address < end:
+            found = self._piece_at(address)
+            if found is None:
+                raise KeyError(f"0x{address:04x} is not present in {self.path}")
+            base, piece = found
+            stop = min(end, base + len(piece))
+            parts.append(piece[address - base:stop - base])
+            address = stop
+        if len(parts) == 1:
+            return parts[0]
+        return memoryview(b"".join(parts))
+
+    def page(self, page: int) -> memoryview:
+        return self.view(page * PAGE_SIZE, PAGE_SIZE)
+
+    def pages(self) -> list[int]:
+        """Page numbers with data present."""
+        if self.kind == "pages":
+            return sorted(int(item.stem[5:], 16) for item in self.path.glob("page_??.bin"))
+        return sorted({address // PAGE_SIZE
+                       for start, piece in self._pieces.items()
+                       for address in range(start, start + len(piece), PAGE_SIZE)})
+
+    def pieces(self) -> list[tuple[int, memoryview]]:
+        """Every mapped ``(start address, view)`` in the dump."""
+        if self.kind == "pages":
+            for page in self.pages():
+                self._page_piece(page)
+        return sorted(self._pieces.items())
+
+    def region(self, name: str) -> memoryview:
+        return self.view(*REGIONS[name])
+
+    def dpi_slot(self, index: int) -> memoryview:
+        return self.view(REGIONS["dpi"][0] + index * DPI_SLOT_SIZE, DPI_SLOT_SIZE)
+
+    def button_action(self, index: int) -> memoryview:
+        return self.view(REGIONS["buttons"][0] + index * BUTTON_ACTION_SIZE,
+                         BUTTON_ACTION_SIZE)
+
+    def event_definition(self, index: int) -> memoryview:
+        return self.view(REGIONS["events"][0] + index * EVENT_DEFINITION_SIZE,
+                         EVENT_DEFINITION_SIZE)
+
+    def macro_slot(self, index: int) -> memoryview:
+        if not 0 <= index < MACRO_SLOTS:
+            raise IndexError(f"macro slot must be 0..{MACRO_SLOTS - 1}")
+        return self.view(MACRO_SLOT_BASE + index * MACRO_SLOT_SIZE, MACRO_SLOT_SIZE)
+
+    def close(self) -> None:
+        for piece in self._pieces.values():
+            piece.release()
+        self._pieces.clear()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps.clear()
+        if self._container is not None:
+            self._container.close()
+            self._container = None
+
+
+class DumpStore:
+    """Open dumps once per process and cache parsed regions by mtime."""
+
+    def __init__(self, root: str | Path = "dumps"):
+        self.root = Path(root)
+        self._dumps: dict[Path, Dump] = {}
+        self._parsed: dict[tuple[Path, int, str], object] = {}
+
+    def paths(self) -> list[Path]:
+        """Every dump under :attr:`root`, in name order."""
+        found = []
+        for item in sorted(self.root.iterdir()):
+            if item.is_dir() and any(item.glob("page_??.bin")):
+                found.append(item)
+            elif item.suffix == pc.SUFFIX or (
+                    item.suffix == ".bin" and item.stat().st_size == DUMP_SIZE):
+                found.append(item)
+        return found
+
+    def open(self, path: str | Path) -> Dump:
+        key = Path(path).resolve()
+        dump = self._dumps.get(key)
+        if dump is not None and dump.mtime_ns != key.stat().st_mtime_ns:
+            dump.close()
+            self._parsed = {k: v for k, v in self._parsed.items() if k[0] != key}
+            dump = None
+        if dump is None:
+            dump = Dump(key)
+            self._dumps[key] = dump
+        return dump
+
+    def __iter__(self) -> Iterator[Dump]:
+        return (self.open(path) for path in self.paths())
+
+    def parsed(self, path: str | Path, name: str,
+               parser: Callable[[Dump], T]) -> T:
+        """Return ``parser(dump)``, computed once per file version."""
+        dump = self.open(path)
+        key = (dump.path, dump.mtime_ns, name)
+        if key not in self._parsed:
+            self._parsed[key] = parser(dump)
+        return self._parsed[key]  # type: ignore[return-value]
+
+    def close(self) -> None:
+        for dump in self._dumps.values():
+            dump.close()
+        self._dumps.clear()
+        self._parsed.clear()
@@ -7,76 +7,56 @@ for _parent in Path(__file__).resolve().parents:
         break
 
 
-import re
-import sys
+import packet_index
+import venus_protocol as vp
+from batch_decode import DEFAULT_INDEX
 
 # Protocol Knowledge Base
 # We define "Expectations" for each packet type.
 # If a byte matches the expectation (Value or Wildcard), it's "Understood".
 # If not, it's a "Mystery".
 
-# Packet Format:
-# [CMD] [PAGE] [OFFSET] [LEN] [TYPE] [D1] [D2] [D3] [ZERO...]
+# Packet Format (17-byte report):
+# [08] [07] [00] [PAGE] [OFFSET] [LEN] [TYPE] [D1] [D2] [D3] [ZERO...] [CHK]
 
 def audit_captures():
-    try:
-        with open("artifacts/txt/host_mouse_communication.txt", 'r') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        print("Error: artifacts/txt/host_mouse_communication.txt not found. Please run analyze_captures_to_log.py first.")
+    if not DEFAULT_INDEX.exists():
+        print(f"Error: {DEFAULT_INDEX} not found. Please run tools/batch_decode.py first.")
         return
 
     unknowns = {} # Key: PacketType, Value: List of (PacketHex, Explanation)
 
-    for line in lines:
-        if "--> H2M | WRITE" not in line:
-            continue
-            
-        # Extract Hex
-        parts = line.split('|')[2].strip().split()
-        pkt = [int(b, 16) for b in parts]
-        
-        if len(pkt) < 8: continue # Too short to judge (e.g. 0x04 cmd)
-        
-        cmd = pkt[0]
-        
-        # We focus on CMD 0x07 (Write Data) or 0x08 (Wrapper depending on view)
-        # But in the log it looks like "08 07 00 60 04 05 00 00 4B ..."
-        
-        # 0: Report ID (08)
-        # 1: Command (07 = Write, 03 = Handshake)
-        
-        if pkt[1] == 0x03:
-            # Handshake. Should be 08 03 ... 
+    with packet_index.PacketIndex(DEFAULT_INDEX) as index:
+        writes = index.query(command=(vp.CMD_READY, vp.CMD_WRITE), direction="H2M",
+                             protocol="areson")
+
+    for packet in writes:
+        pkt = list(packet.data)
+
+        if packet.command == vp.CMD_READY:
+            # Handshake. Should be 08 03 00 ... 00, then the checksum.
             # Check padding.
-            if any(b != 0 for b in pkt[2:]):
+            if any(b != 0 for b in pkt[2:16]):
                 log_unknown(unknowns, "HANDSHAKE", pkt, "Non-zero padding in Handshake")
             continue
-            
-        if pkt[1] == 0x09:
-             # Reset?
-             continue
-             
-        if pkt[1] != 0x07:
-            continue
-            
+
         # WRITE PACKET PARSING
-        page = pkt[2]
-        offset = pkt[3]
-        length = pkt[4] # Valid Data Length
+        page = packet.address >> 8
+        offset = packet.address & 0xFF
+        length = packet.length # Valid Data Length
         
-        # The payload starts at pkt[5]
-        # BUT, if Length is 04 (Standard Binding), the structure is:
-        # [05: Type] [06: D1] [07: D2] [08: D3]
+        # The payload starts at pkt[6]
+        # If Length is 04 (Standard Binding), the structure is:
+        # [06: Type] [07: D1] [08: D2] [09: D3]
         
-        payload = pkt[5:]
+        payload = pkt[6:16]
         
-        # Check Padding (Data after length)
-        # Actual Data ends at 5 + length
+        # Check Padding (Data after length, before the checksum)
+        # Actual Data ends at 6 + length
         # Remaining bytes should be 00?
-        padding_start = 5 + length
-        if padding_start < len(pkt):
-            padding = pkt[padding_start:]
+        padding_start = 6 + length
+        if padding_start < 16:
+            padding = pkt[padding_start:16]
             if any(b != 0 for b in padding):
                  log_unknown(unknowns, "PADDING", pkt, f"Non-zero data after len {length}")
                  
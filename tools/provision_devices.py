@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Write one exported profile to every attached mouse at once.
+
+Usage:
+    python3 tools/provision_devices.py export golden.vpp [--device /dev/hidrawN]
+    python3 tools/provision_devices.py apply golden.vpp [holtek.vpp ...]
+
+``export`` saves the first accessible mouse (or ``--device``) as a profile
+container.  ``apply`` writes each attached mouse with the container exported
+from the same model, all devices in parallel, and prints a summary.  Pass one
+container per model to provision a mixed rack.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from pathlib import Path
+
+for _parent in Path(__file__).resolve().parents:
+    if (_parent / "venus_protocol.py").exists():
+        sys.path.insert(0, str(_parent))
+        break
+
+import device_driver as dd
+import profile_container as pc
+import venus_protocol as vp
+
+
+def export(target: Path, device_path: str | None) -> int:
+    devices = [info for info in vp.list_devices() if not info.access_error]
+    if device_path:
+        devices = [info for info in devices if info.display_path == device_path]
+    if not devices:
+        print("No accessible mouse found.")
+        return 1
+    info = devices[0]
+    device_type = dd.detect_device_type(info)
+    with dd.open_device(device_type, info.path,
+                        authenticate=device_type != 'holtek') as device:
+        regions = dd.read_profile_regions(device_type, device)
+    target.write_bytes(pc.encode_profile(info.vendor_id, info.product_id, regions))
+    print(f"Exported {info.product} ({info.display_path}) to {target}")
+    return 0
+
+
+def apply(sources: list[Path]) -> int:
+    profiles = {}
+    for source in sources:
+        with pc.ProfileContainer.open(source) as profile:
+            profiles[dd.device_type_for_ids(profile.vendor_id, profile.product_id)] = [
+                (start, bytes(data)) for start, data in profile.regions()]
+
+    devices = vp.list_devices()
+    if not devices:
+        print("No supported mouse found.")
+        return 1
+
+    printed: dict[bytes | str, int] = {}
+    output = threading.Lock()
+
+    def progress(info: vp.DeviceInfo, done: int, total: int) -> None:
+        # One line per device per 10% keeps a rack of mice readable.
+        step = done * 10 // total
+        with output:
+            if printed.get(info.path) == step:
+                return
+            printed[info.path] = step
+            print(f"  {info.display_path}: {done}/{total} reports", flush=True)
+
+    print(f"Provisioning {len(devices)} device(s)...")
+    results = dd.provision(profiles, devices, progress)
+
+    print()
+    print(f"{'device':<20} {'model':<24} {'result':<8} {'reports':>7} {'seconds':>8}")
+    for result in results:
+        name = vp.DEVICE_NAMES.get(
+            (result.info.vendor_id, result.info.product_id), result.info.product)
+        status = "ok" if result.ok else "FAILED"
+        print(f"{result.info.display_path:<20} {name[:24]:<24} {status:<8} "
+              f"{result.reports:>7} {result.seconds:>8.1f}")
+        if result.error:
+            print(f"{'':<20} {result.error}")
+    failed = sum(not result.ok for result in results)
+    print(f"\n{len(results) - failed} provisioned, {failed} failed")
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="save a mouse as a profile")
+    export_parser.add_argument("profile", type=Path)
+    export_parser.add_argument("--device", help="hidraw path to read from")
+    apply_parser = commands.add_parser("apply", help="write every attached mouse")
+    apply_parser.add_argument("profiles", type=Path, nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        return export(args.profile, args.device)
+    return apply(args.profiles)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,54 +7,47 @@ for _parent in Path(__file__).resolve().parents:
         break
 
 
+import argparse
+
+import capture_replay
+import packet_index
 import venus_protocol as vp
-import time
+from batch_decode import DEFAULT_INDEX
 
 def replay_capture():
-    target_cap = "bind macros 123"
-    log_file = "artifacts/txt/host_mouse_communication.txt"
-    
-    print(f"Searching for capture '{target_cap}' in {log_file}...")
+    parser = argparse.ArgumentParser(
+        description="Replay an indexed capture on the mouse and verify its answers.")
+    parser.add_argument("capture", nargs="?", default="bind macros 123",
+                        help="part of the capture label (default: %(default)s)")
+    parser.add_argument("--timing", choices=capture_replay.TIMINGS, default="ack",
+                        help="captured inter-packet timing, or as fast as the mouse ACKs")
+    parser.add_argument("--window", type=int, default=1,
+                        help="outstanding requests with --timing ack (default: 1)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="speed-up factor for --timing original")
+    parser.add_argument("--skip-reset", action="store_true",
+                        help="leave out factory reset commands")
+    args = parser.parse_args()
+    target_cap = args.capture
     
-    with open(log_file, 'r') as f:
-        lines = f.readlines()
-        
-    packet_sequence = []
-    in_target = False
+    print(f"Searching for capture '{target_cap}' in {DEFAULT_INDEX}...")
+    if not DEFAULT_INDEX.exists():
+        print("Packet index not found. Please run tools/batch_decode.py first.")
+        return
     
-    for line in lines:
-        if line.startswith("["):
-            # specific strict check
-            if target_cap in line:
-                in_target = True
-                print("Found target capture start.")
-            else:
-                if in_target:
-                    print("End of target capture block.")
-                in_target = False
-            continue
-            
-        if not in_target: continue
-        
-        # We only want Host To Mouse packets
-        if "--> H2M" not in line: continue
+    with packet_index.PacketIndex(DEFAULT_INDEX) as index:
+        packets = index.query(capture=f"*{target_cap}*", protocol="areson")
         
-        # Extract hex
-        # Line format: "   --> H2M | COMMAND  | 08 07 ... | ..."
-        parts = line.split('|')
-        if len(parts) < 3: continue
-        
-        hex_str = parts[2].strip()
-        # "08 07 00 ..."
-        hex_bytes = [int(b, 16) for b in hex_str.split()]
-        
-        packet_sequence.append(bytes(hex_bytes))
-        
-    print(f"Extracted {len(packet_sequence)} packets to replay.")
-    
-    if not packet_sequence:
-        print("No packets found!")
+    labels = sorted({packet.capture for packet in packets})
+    if len(labels) != 1:
+        print(f"Expected one matching capture, found {len(labels)}:")
+        for label in labels:
+            print(f"  {label}")
         return
+        
+    exchanges = capture_replay.pair_exchanges(
+        (packet.frame, packet.time, packet.direction, packet.data) for packet in packets)
+    print(f"Extracted {len(exchanges)} packets to replay from '{labels[0]}'.")
 
     # Connect
     devs = vp.list_devices()
@@ -63,43 +56,14 @@ def replay_capture():
         return
         
     mouse = vp.VenusDevice(devs[0].path)
-    # Using raw hid handle to bypass any logic if needed, 
-    # but VenusDevice.send() is just dev.send_feature_report.
-    # We'll use mouse.open() then mouse.send().
     mouse.open()
     
     try:
         print("Starting Replay...")
-        for i, pkt in enumerate(packet_sequence):
-            # Hex dump for user visibility
-            hex_fmt = " ".join([f"{b:02X}" for b in pkt])
-            print(f"[{i+1}/{len(packet_sequence)}] Sending: {hex_fmt}")
-            
-            try:
-                # Venus Device expects 17 bytes usually?
-                # The log packets are usually 17 bytes (last byte is checksum/magic?)
-                # Let's just send what we got.
-                if len(pkt) == 17:
-                    mouse.send(pkt) 
-                else:
-                    # If it's not 17, maybe pad it? Or try raw send?
-                    # Logs seem to always be 17 for Venus.
-                    # Let's pad if short, truncate if long?
-                    # Actually valid Venus packets strictly 17?
-                    if len(pkt) < 17:
-                        print(f"Warning: Packet length {len(pkt)} < 17. Padding.")
-                        pkt = pkt + bytes([0]* (17-len(pkt)))
-                        mouse.send(pkt)
-                    elif len(pkt) > 17:
-                         print(f"Warning: Packet length {len(pkt)} > 17. Truncating.")
-                         mouse.send(pkt[:17])
-            except Exception as e:
-                print(f"Error sending packet {i}: {e}")
-                
-            # Timing from log? Log doesn't have timestamps easily parsed here.
-            # Use small delay.
-            time.sleep(0.02)
-            
+        summary = capture_replay.replay(
+            mouse, exchanges, timing=args.timing, window=args.window, speed=args.speed,
+            exclude=(vp.CMD_FACTORY_RESET,) if args.skip_reset else ())
+        print(summary.format())
         print("Replay Complete.")
         
     finally:
@@ -12,9 +12,10 @@ for _parent in Path(__file__).resolve().parents:
         break
 
 
-import sys
 import os
 
+from dump_store import DumpStore
+
 # ANSI Color codes
 class C:
     RESET = "\033[0m"
@@ -396,20 +397,35 @@ def print_legend():
     print(f"  {C.MODIFIER}██{C.RESET} Modifier  {C.KEY}██{C.RESET} Key  {C.EVENT_DN}██{C.RESET} EvtDn  {C.EVENT_UP}██{C.RESET} EvtUp  {C.GUARD}██{C.RESET} Guard/Chk  {C.DELAY}██{C.RESET} Delay")
     print(f"  {C.MACRO_HDR}██{C.RESET} MacroHdr  {C.MACRO_NAME}██{C.RESET} MacroName  {C.MACRO_LEN}██{C.RESET} EvtCount  {C.UNKNOWN}██{C.RESET} Unknown  {C.UNUSED}██{C.RESET} 0xFF  {C.ZERO}██{C.RESET} 0x00")
 
+def parse_pages(args: list[str]) -> list[int] | None:
+    if not args:
+        return [0x00, 0x01, 0x02, 0x03]  # Default pages
+    if args[0].lower() == "all":
+        return list(range(256))
+    pages = []
+    for p in args:
+        try:
+            pages.append(int(p, 16) if any(c in p.lower() for c in "abcdef") else int(p))
+        except ValueError:
+            print(f"Invalid page: {p}")
+            return None
+    return pages
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python3 tools/view_dump.py <dump_dir> [pages...]")
-        print("       python3 tools/view_dump.py <dump_dir> all         # View all 256 pages")
-        print("       python3 tools/view_dump.py <page.bin>")
+        print("Usage: python3 tools/view_dump.py <dump_dir|dump.bin|profile.vpp> [pages...]")
+        print("       python3 tools/view_dump.py <dump> all         # View all 256 pages")
+        print("       python3 tools/view_dump.py <page_XX.bin>")
         print("\nExamples:")
         print("  python3 tools/view_dump.py 'dumps/Good Config From Windows' 00 01 02 03 80")
-        print("  python3 tools/view_dump.py dumps/dump_12345 all")
+        print("  python3 tools/view_dump.py dumps/Good_Config_Windows.bin all")
         sys.exit(1)
     
     path = sys.argv[1]
     
-    # Single file mode
-    if path.endswith(".bin"):
+    # Single page file mode
+    if path.endswith(".bin") and os.path.basename(path).startswith("page_"):
         with open(path, "rb") as f:
             data = bytearray(f.read())
         page_num = int(os.path.basename(path).split("_")[1].split(".")[0], 16)
@@ -418,33 +434,28 @@ def main():
         print_legend()
         return
     
-    # Directory mode
-    if len(sys.argv) > 2:
-        if sys.argv[2].lower() == "all":
-            pages = list(range(256))
-        else:
-            pages = []
-            for p in sys.argv[2:]:
-                try:
-                    pages.append(int(p, 16) if any(c in p.lower() for c in "abcdef") else int(p))
-                except ValueError:
-                    print(f"Invalid page: {p}")
-                    sys.exit(1)
-    else:
-        pages = [0x00, 0x01, 0x02, 0x03]  # Default pages
-    
+    pages = parse_pages(sys.argv[2:])
+    if pages is None:
+        sys.exit(1)
+    show_all = len(sys.argv) > 2 and sys.argv[2].lower() == "all"
+
+    # Directory dumps, flat 64 KiB images and .vpp profiles are all mapped,
+    # not read: pages are zero-copy views into the file.
+    store = DumpStore()
+    try:
+        dump = store.open(path)
+    except (OSError, ValueError) as exc:
+        print(f"Cannot open dump: {exc}")
+        sys.exit(1)
+
     for page_num in pages:
-        bin_path = os.path.join(path, f"page_{page_num:02X}.bin")
-        if not os.path.exists(bin_path):
+        if not dump.has(page_num * 0x100, 0x100):
             continue
-        
-        with open(bin_path, "rb") as f:
-            data = bytearray(f.read())
+        data = dump.page(page_num)
         
         # Skip completely empty pages in "all" mode
-        if len(sys.argv) > 2 and sys.argv[2].lower() == "all":
-            if all(b == 0xFF for b in data):
-                continue
+        if show_all and all(b == 0xFF for b in data):
+            continue
         
         viewer = DumpViewer(data, page_num)
         viewer.display()
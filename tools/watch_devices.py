@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Print hidraw hotplug events and pushed battery reports as they happen.
+
+Usage:
+    python3 tools/watch_devices.py               # hotplug events only
+    python3 tools/watch_devices.py --battery     # also hold the mouse open
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import threading
+from pathlib import Path
+
+for _parent in Path(__file__).resolve().parents:
+    if (_parent / "venus_protocol.py").exists():
+        sys.path.insert(0, str(_parent))
+        break
+
+import device_monitor as dm
+import venus_protocol as vp
+
+
+def describe(event: dm.DeviceEvent) -> str:
+    if event.kind == "battery":
+        status = event.status
+        connection = "cable" if status.cable_connected else "wireless"
+        return f"battery  {event.node}: {status.percent}% ({connection})"
+    ids = ""
+    if event.vendor_id is not None:
+        ids = f" {event.vendor_id:04x}:{event.product_id:04x}"
+        name = vp.DEVICE_NAMES.get((event.vendor_id, event.product_id))
+        if name:
+            ids += f" {name}"
+    return f"{event.kind:<8} {event.node}{ids}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--battery", action="store_true",
+                        help="open the first Areson device and print its pushed status")
+    args = parser.parse_args()
+
+    monitor = dm.DeviceMonitor()
+    monitor.subscribe(lambda event: print(describe(event), flush=True))
+    monitor.start()
+    print(f"Watching hidraw via {monitor.source}; Ctrl+C to stop.")
+
+    pool = vp.DeviceSessionPool(report_listener=monitor.report_listener)
+    if args.battery:
+        devices = [info for info in vp.list_devices()
+                   if info.vendor_id == 0x25A7 and not info.access_error]
+        if not devices:
+            print("No accessible Areson device; battery reports unavailable.")
+        else:
+            # The session enables notifications; keeping it open keeps the
+            # reader thread listening.
+            with pool.lease(devices[0].path) as device:
+                print(describe(dm.DeviceEvent(
+                    "battery", devices[0].display_path,
+                    status=device.query_status())))
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close_all()
+        monitor.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
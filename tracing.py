@@ -0,0 +1,171 @@
+"""Timing spans for device exchanges, transactions and GUI handlers.
+
+Instrumented code wraps work in :meth:`Tracer.span`; each finished span
+(name, category, start, duration, thread and a few arguments such as the
+command byte, address, byte count or retries) goes into a bounded ring
+buffer, so tracing can stay on permanently at a cost of a few microseconds
+per span.  :meth:`Tracer.chrome_trace` turns the buffer into Chrome trace
+JSON for ``chrome://tracing`` or https://ui.perfetto.dev, where nested spans
+show how much of a slow apply was firmware pacing (``settle_ms`` and
+exchange latency) and how much was our own overhead.
+
+The process-wide :data:`TRACER` is what the protocol modules record into::
+
+    with tracing.span("read_range", "areson", address="0x0100") as args:
+        ...
+        args["retries"] = 1
+
+A whole function is traced with the :func:`traced` decorator instead, and
+adds arguments to its span with :func:`annotate`::
+
+    @tracing.traced("execute_transaction", "transaction")
+    def execute_transaction(self, staging_manager):
+        tracing.annotate(changes=len(staging_manager.get_staged_changes()))
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+DEFAULT_CAPACITY = 8192
+
+
+@dataclass(frozen=True)
+class Span:
+    name: str
+    category: str
+    start_ns: int
+    duration_ns: int
+    thread: int
+    args: dict = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+
+class Tracer:
+    """Collect spans into a ring buffer holding the newest ``capacity``."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.enabled = True
+        self._spans: deque[Span] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        # Per thread, the args of the spans still open, innermost last.
+        self._open = threading.local()
+
+    @contextmanager
+    def span(self, name: str, category: str = "", **args) -> Iterator[dict]:
+        """Time the ``with`` block; the yielded dict becomes the span's args.
+
+        An exception leaving the block is recorded as ``args["error"]`` and
+        re-raised.
+        """
+        if not self.enabled:
+            yield args
+            return
+        stack = self._open.__dict__.setdefault("stack", [])
+        stack.append(args)
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        except BaseException as exc:
+            args["error"] = str(exc) or type(exc).__name__
+            raise
+        finally:
+            stack.pop()
+            self.add(Span(name, category, start, time.perf_counter_ns() - start,
+                          threading.get_ident(), args))
+
+    def annotate(self, **args) -> None:
+        """Add ``args`` to the innermost span open on this thread, if any."""
+        stack = getattr(self._open, "stack", None)
+        if stack:
+            stack[-1].update(args)
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Return count, total and maximum milliseconds per span name."""
+        totals: dict[str, dict[str, float]] = {}
+        for span in self.spans():
+            entry = totals.setdefault(
+                span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms
+            entry["max_ms"] = max(entry["max_ms"], span.duration_ms)
+        return totals
+
+    def chrome_trace(self) -> dict:
+        """Return the buffer as a Chrome trace-event document."""
+        pid = os.getpid()
+        events = [{
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (span.start_ns - self._origin_ns) / 1000,
+            "dur": span.duration_ns / 1000,
+            "pid": pid,
+            "tid": span.thread,
+            "args": {key: _json_value(value) for key, value in span.args.items()},
+        } for span in self.spans()]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str | Path) -> int:
+        """Write :meth:`chrome_trace` to ``path``; return the span count."""
+        document = self.chrome_trace()
+        Path(path).write_text(json.dumps(document), encoding="utf-8")
+        return len(document["traceEvents"])
+
+
+def _json_value(value):
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+TRACER = Tracer()
+
+
+def span(name: str, category: str = "", **args):
+    """Record a span on the process-wide :data:`TRACER`."""
+    return TRACER.span(name, category, **args)
+
+
+def annotate(**args) -> None:
+    """Add ``args`` to the innermost open span on the process-wide tracer."""
+    TRACER.annotate(**args)
+
+
+def traced(name: str, category: str = "") -> Callable[[F], F]:
+    """Decorator recording each call of the function as a span."""
+    def decorate(function: F) -> F:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name, category):
+                return function(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
@@ -1,3 +1,6 @@
+import tracing
+
+
 class TransactionController:
     """Send staged changes sequentially and update local state on success.
 
@@ -5,20 +8,24 @@ class TransactionController:
     this is deliberately not described as an atomic transaction: a failure can
     leave the successfully written prefix on the device.
     """
-    def __init__(self, device, packet_builder, logger=None):
+    def __init__(self, device, packet_builder, logger=None, coalesce=None):
         """
         device: VenusDevice instance (must support send_reliable)
         packet_builder: Object with build_packets(key, action, params) method
         logger: Optional callable that accepts a string message
+        coalesce: Optional callable merging the built packets before sending,
+            for devices whose writes only take effect at a later commit
         """
         self.device = device
         self.builder = packet_builder
         self.logger = logger
+        self.coalesce = coalesce
 
     def _log(self, msg: str):
         if self.logger:
             self.logger(msg)
 
+    @tracing.traced("execute_transaction", "transaction")
     def execute_transaction(self, staging_manager) -> bool:
         """
         Apply all staged changes to the device.
@@ -31,6 +38,7 @@ class TransactionController:
 
         changes = staging_manager.get_staged_changes()
         all_packets = []
+        tracing.annotate(changes=len(changes))
         
         self._log(f"TransactionController: Preparing to apply {len(changes)} changes...")
 
@@ -45,11 +53,20 @@ class TransactionController:
             self._log(f"TransactionController: Build error: {e}")
             return False
 
+        if self.coalesce is not None:
+            built = len(all_packets)
+            all_packets = self.coalesce(all_packets)
+            self._log(f"TransactionController: Coalesced {built} packets into {len(all_packets)}.")
+
         self._log(f"TransactionController: Built {len(all_packets)} packets. Sending...")
+        tracing.annotate(packets=len(all_packets))
 
         # 2. Send packets. Each successful ACK may already represent a
-        # persistent EEPROM change.
+        # persistent EEPROM change.  Devices with an EEPROM shadow skip
+        # writes that would not change anything.
+        skipped_before = getattr(self.device, "skipped_writes", 0)
         for i, pkt in enumerate(all_packets):
+            tracing.annotate(sent=i)
             if not self.device.send_reliable(pkt):
                 self._log(f"TransactionController: Send failed at packet {i}/{len(all_packets)} ({pkt.hex()})")
                 return False
@@ -58,6 +75,11 @@ class TransactionController:
             if i % 5 == 0:
                 self._log(f"TransactionController: Sent packet {i+1}/{len(all_packets)}")
 
+        tracing.annotate(sent=len(all_packets))
+        skipped = getattr(self.device, "skipped_writes", 0) - skipped_before
+        if skipped:
+            self._log(f"TransactionController: Skipped {skipped} unchanged writes.")
+
         # 3. Update the application's base state only after all ACKs.
         self._log("TransactionController: All packets acknowledged; updating local state.")
         staging_manager.commit()
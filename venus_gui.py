@@ -3,18 +3,41 @@ from __future__ import annotations
 import sys
 import json
 import time
+import importlib.util
 from pathlib import Path
 from copy import deepcopy
 
 from PyQt6 import QtCore, QtGui, QtWidgets
 
 import venus_protocol as vp
-import holtek_protocol as hp
-import device_driver as dd
+import device_monitor as dm
+import tracing
 from staging_manager import StagingManager
 from transaction_controller import TransactionController
 
 
+def _lazy_import(name: str):
+    """Return a module that is only executed on first attribute access.
+
+    None of these are needed to draw the window; deferring them keeps them
+    off the tray launch path.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+hp = _lazy_import("holtek_protocol")
+dd = _lazy_import("device_driver")
+pc = _lazy_import("profile_container")
+
+
 class KeyCaptureEdit(QtWidgets.QLineEdit):
     """Key capture widget that distinguishes numpad keys from regular keys.
 
@@ -182,30 +205,61 @@ class BatteryQueryThread(QtCore.QThread):
 
     completed = QtCore.pyqtSignal(object, str)
 
-    def __init__(self, path: bytes | str, parent=None):
+    def __init__(self, path: bytes | str,
+                 pool: vp.DeviceSessionPool | None = None, parent=None):
         super().__init__(parent)
         self.path = path
+        self.pool = pool
 
     def run(self) -> None:
-        device = vp.VenusDevice(self.path)
         status = None
         error = ""
         try:
-            device.open()
-            status = device.query_status()
+            if self.pool is not None:
+                # The status command needs no handshake, so never pay for one.
+                with self.pool.lease(self.path, authenticate=False) as device:
+                    status = device.query_status()
+            else:
+                device = vp.VenusDevice(self.path)
+                device.open()
+                try:
+                    status = device.query_status()
+                finally:
+                    device.close()
         except Exception as exc:
             error = str(exc)
-        finally:
-            try:
-                device.close()
-            except Exception:
-                pass
         self.completed.emit(status, error)
 
 
+class HoltekReconnectThread(QtCore.QThread):
+    """Wait for the Holtek mouse to re-enumerate after a reset."""
+
+    def __init__(self, monitor: dm.DeviceMonitor, timeout: float = 10.0,
+                 settle: float = 2.0, parent=None):
+        super().__init__(parent)
+        self.monitor = monitor
+        self.timeout = timeout
+        self.settle = settle
+        self.path: str | None = None
+
+    def run(self) -> None:
+        if self.monitor.source is not None:
+            # Probed as soon as the kernel announces a new node.
+            self.path = self.monitor.wait_for(hp.find_device_path, self.timeout)
+            return
+        # The device needs time to disconnect before it re-enumerates.
+        time.sleep(self.settle)
+        self.path = hp.wait_for_device(self.timeout - self.settle)
+
+
 class MainWindow(QtWidgets.QMainWindow):
+    # Hotplug and battery events arrive on monitor threads; this signal
+    # carries them to the GUI thread.
+    device_event = QtCore.pyqtSignal(object)
+
     def __init__(self) -> None:
         super().__init__()
+        self._startup_started = time.perf_counter()
         self.setWindowTitle("Venus Pro Config")
         self.resize(1400, 850)
         
@@ -219,11 +273,23 @@ class MainWindow(QtWidgets.QMainWindow):
         if app:
             app.setDesktopFileName("com.github.es00bac.venusprolinux")
 
-        # Store device path instead of keeping device open (prevents blocking mouse input)
+        # Store the device path; Areson handles live in the session pool so
+        # consecutive operations reuse one open, authenticated handle.
         self.device_path: bytes | str | None = None
+        # Report pacing is learned per device serial and persisted, so long
+        # uploads start at the gap the last session settled on.
+        self._pacers: dict[str, vp.ReportPacer] = {}
+        self.device_monitor = dm.DeviceMonitor()
+        self.session_pool = vp.DeviceSessionPool(
+            pacer_factory=self._pacer_for_path, shadow_factory=self._shadow_for_path,
+            report_listener=self.device_monitor.report_listener)
+        self._hotplug_refresh_pending = False
+        self._holtek_reconnecting = False
         self.device_infos: list[vp.DeviceInfo] = []
         self.device_type: str = 'venus_pro'  # 'venus_pro' or 'holtek'
         self.holtek_profile: int = 0  # 0-4, selected hardware profile for Holtek device
+        # (path, image) of the last full Holtek read; serves profile switches.
+        self.holtek_image: tuple[bytes | str, hp.HoltekImage] | None = None
         self.holtek_dpi_colors: list[int] = []
         self.active_button_profiles: dict = vp.BUTTON_PROFILES
         self.custom_profiles: dict[str, tuple[int, int, int]] = {}
@@ -243,6 +309,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.macro_config_file = self.config_dir / "macros.json"
         self.settings_file = self.config_dir / "settings.json"
+        self.pacing_file = self.config_dir / "pacing.json"
         self.macro_names: dict[int, str] = {}
         self._load_macro_names()
         self._load_app_settings()
@@ -279,17 +346,17 @@ class MainWindow(QtWidgets.QMainWindow):
         
         self._initialize_default_assignments()
         self._setup_tray()
+        self.device_event.connect(self._on_device_event)
+        self.device_monitor.subscribe(self.device_event.emit)
 
         for message in self._config_errors:
             self._log(message)
         self._config_errors.clear()
 
-        self._log("Init: Refreshing and connecting...")
-        
-        # The initial read runs before main() shows this window.  It must not
-        # create a modal message box, otherwise opening the parent from the
-        # tray exposes a completely disabled-looking interface.
-        self._refresh_and_connect(silent=True)
+        # Enumeration and the initial read take from tens of milliseconds to
+        # seconds; run them once the event loop has drawn the window.
+        self._initial_connect_pending = True
+        QtCore.QTimer.singleShot(0, self._finish_startup)
         
         # Keyboard shortcuts for Undo/Redo
         undo_shortcut = QtGui.QShortcut(QtGui.QKeySequence.StandardKey.Undo, self)
@@ -298,7 +365,23 @@ class MainWindow(QtWidgets.QMainWindow):
         redo_shortcut.activated.connect(self._on_redo)
         if app:
             app.aboutToQuit.connect(self._on_app_quit)
+        self._log(f"Startup: window built in {self._startup_ms():.0f} ms")
 
+    def _startup_ms(self) -> float:
+        return (time.perf_counter() - self._startup_started) * 1000
+
+    def _finish_startup(self) -> None:
+        """Start hotplug monitoring and connect after the first frame."""
+        self._log(f"Startup: first frame after {self._startup_ms():.0f} ms")
+        self.device_monitor.start()
+        if not self._initial_connect_pending:
+            return  # A refresh already ran.
+        self._log("Init: Refreshing and connecting...")
+        # The initial read must not create a modal message box, otherwise
+        # opening the parent from the tray exposes a completely
+        # disabled-looking interface.
+        self._refresh_and_connect(silent=True)
+        self._log(f"Startup: connected after {self._startup_ms():.0f} ms")
 
     def _build_connection_group(self) -> QtWidgets.QGroupBox:
         group = QtWidgets.QGroupBox("Device Status")
@@ -311,6 +394,9 @@ class MainWindow(QtWidgets.QMainWindow):
         layout.addWidget(self.refresh_button)
         
         self.read_button = QtWidgets.QPushButton("📥 Read Settings")
+        self.read_button.setToolTip(
+            "Refreshes only settings changed since the last read.\n"
+            "Shift+click re-reads everything from the mouse.")
         layout.addWidget(self.read_button)
         
         self.export_button = QtWidgets.QPushButton("💾 Export Profile")
@@ -344,7 +430,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.refresh_button.clicked.connect(
             lambda _checked=False: self._refresh_and_connect(silent=False))
         self.read_button.clicked.connect(
-            lambda _checked=False: self._read_settings(silent=False))
+            lambda _checked=False: self._read_settings(
+                silent=False,
+                verify=bool(QtWidgets.QApplication.keyboardModifiers() &
+                            QtCore.Qt.KeyboardModifier.ShiftModifier)))
         self.export_button.clicked.connect(self._export_profile)
         self.import_button.clicked.connect(self._import_profile)
         
@@ -366,14 +455,56 @@ class MainWindow(QtWidgets.QMainWindow):
     def _build_tabs(self) -> QtWidgets.QTabWidget:
         tabs = QtWidgets.QTabWidget()
         tabs.addTab(self._build_buttons_tab(), "Buttons")
-        tabs.addTab(self._build_macros_tab(), "Macros")
-        tabs.addTab(self._build_rgb_tab(), "RGB")
-        tabs.addTab(self._build_polling_tab(), "Polling")
-        tabs.addTab(self._build_dpi_tab(), "DPI")
-        tabs.addTab(self._build_advanced_tab(), "Advanced")
+        # The other tabs start as empty placeholders and are built when first
+        # shown, or when a device read needs their widgets.
+        self._tab_builders = {
+            "Macros": self._build_macros_tab,
+            "RGB": self._build_rgb_tab,
+            "Polling": self._build_polling_tab,
+            "DPI": self._build_dpi_tab,
+            "Advanced": self._build_advanced_tab,
+        }
+        for title in self._tab_builders:
+            tabs.addTab(QtWidgets.QWidget(), title)
+        tabs.currentChanged.connect(
+            lambda index: self._ensure_tab(self.tabs.tabText(index)))
         self.tabs = tabs
         return tabs
 
+    def _ensure_settings_tabs(self) -> None:
+        """Build the tabs a device read writes its values into."""
+        for title in ("RGB", "Polling", "DPI"):
+            self._ensure_tab(title)
+
+    def _ensure_tab(self, title: str) -> None:
+        """Build a deferred tab in place of its placeholder."""
+        builder = self._tab_builders.pop(title, None)
+        if builder is None:
+            return
+        started = time.perf_counter()
+        widget = builder()
+        index = next(i for i in range(self.tabs.count())
+                     if self.tabs.tabText(i) == title)
+        enabled = self.tabs.isTabEnabled(index)
+        tooltip = self.tabs.tabToolTip(index)
+        current = self.tabs.currentIndex()
+        self.tabs.blockSignals(True)
+        placeholder = self.tabs.widget(index)
+        self.tabs.removeTab(index)
+        placeholder.deleteLater()
+        self.tabs.insertTab(index, widget, title)
+        self.tabs.setTabEnabled(index, enabled)
+        self.tabs.setTabToolTip(index, tooltip)
+        self.tabs.setCurrentIndex(current)
+        self.tabs.blockSignals(False)
+        if title == "RGB":
+            self._sync_rgb_controls()
+            self._sync_battery_led_controls()
+        elif title == "DPI":
+            self._sync_dpi_controls()
+        self._log(f"Startup: built {title} tab in "
+                  f"{(time.perf_counter() - started) * 1000:.0f} ms")
+
     def _build_buttons_tab(self) -> QtWidgets.QWidget:
         splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Horizontal)
         
@@ -893,6 +1024,44 @@ class MainWindow(QtWidgets.QMainWindow):
         except OSError as exc:
             self._log(f"Config: Failed to save settings: {exc}")
 
+    def _device_info_for(self, path: bytes | str | None) -> vp.DeviceInfo | None:
+        return next((item for item in self.device_infos if item.path == path), None)
+
+    def _device_key(self, path: bytes | str) -> str | None:
+        info = self._device_info_for(path)
+        if info is None:
+            return None
+        return info.serial or f"{info.vendor_id:04x}:{info.product_id:04x}"
+
+    def _shadow_for_path(self, path: bytes | str) -> vp.EepromShadow:
+        """Return a new EEPROM image cache for the pooled session on ``path``.
+
+        The shadow lives exactly as long as the session: a disconnect,
+        hotplug removal or re-enumeration closes the session and drops it,
+        so writes are never skipped against another mouse's image.
+        """
+        return vp.EepromShadow()
+
+    def _pacer_for_path(self, path: bytes | str) -> vp.ReportPacer:
+        """Return the shared pacer for the device at ``path``, loading it once."""
+        key = self._device_key(path)
+        if key is None:
+            return vp.ReportPacer()
+        pacer = self._pacers.get(key)
+        if pacer is None:
+            pacer = vp.load_pacer(self.pacing_file, key)
+            self._pacers[key] = pacer
+        return pacer
+
+    def _save_pacing(self) -> None:
+        """Persist learned report pacing for every device used this session."""
+        for key, pacer in self._pacers.items():
+            try:
+                vp.save_pacer(self.pacing_file, key, pacer)
+            except OSError as exc:
+                self._log(f"Config: Failed to save report pacing: {exc}")
+                return
+
     def _build_macros_tab(self) -> QtWidgets.QWidget:
         """Build the slot-oriented macro editor and text/timing tools."""
         splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Horizontal)
@@ -1928,6 +2097,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # self._apply_rgb_custom()
 
     def _capture_rgb_restore(self) -> dict[str, int]:
+        self._ensure_tab("RGB")
         return {
             "r": self.rgb_current_color.red(),
             "g": self.rgb_current_color.green(),
@@ -2117,8 +2287,26 @@ class MainWindow(QtWidgets.QMainWindow):
         self.log_area.setReadOnly(True)
         self.log_area.setMaximumBlockCount(2000)
         layout.addWidget(self.log_area)
+        trace_button = QtWidgets.QPushButton("Save Timing Trace...")
+        trace_button.setToolTip(
+            "Save recent USB exchanges and apply/read timings as Chrome trace "
+            "JSON (open in chrome://tracing or ui.perfetto.dev).")
+        trace_button.clicked.connect(self._save_trace)
+        layout.addWidget(trace_button)
         return group
 
+    def _save_trace(self) -> None:
+        fname, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Timing Trace", "venus-trace.json", "Chrome Trace (*.json)")
+        if not fname:
+            return
+        try:
+            count = tracing.TRACER.export_chrome_trace(fname)
+        except OSError as exc:
+            QtWidgets.QMessageBox.critical(self, "Save failed", str(exc))
+            return
+        self._log(f"Trace: saved {count} spans to {fname}")
+
     def _build_mouse_image(self) -> QtWidgets.QGroupBox:
         group = QtWidgets.QGroupBox("Mouse")
         layout = QtWidgets.QVBoxLayout(group)
@@ -2326,6 +2514,9 @@ class MainWindow(QtWidgets.QMainWindow):
             self._battery_thread.wait(2000)
         if self.battery_led_enabled:
             self._restore_battery_led(quiet=True)
+        self.device_monitor.stop()
+        self.session_pool.close_all()
+        self._save_pacing()
         if self.tray_icon:
             self.tray_icon.hide()
 
@@ -2389,7 +2580,12 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         if self._battery_thread and self._battery_thread.isRunning():
             return
-        self._battery_thread = BatteryQueryThread(self.device_path, self)
+        age = self.device_monitor.battery_age(self.device_path)
+        if age is not None and age < self.battery_timer.interval() / 1000:
+            # The mouse reported its status on its own since the last tick.
+            return
+        self._battery_thread = BatteryQueryThread(
+            self.device_path, self.session_pool, self)
         self._battery_thread.completed.connect(self._battery_query_finished)
         thread = self._battery_thread
         thread.finished.connect(
@@ -2419,6 +2615,44 @@ class MainWindow(QtWidgets.QMainWindow):
             if error:
                 self._log(f"Battery refresh: {error}")
 
+    def _on_device_event(self, event: dm.DeviceEvent) -> None:
+        if event.kind == "battery":
+            if event.path == self.device_path:
+                self._battery_query_finished(event.status, "")
+            return
+        supported = (event.vendor_id, event.product_id) in vp.SUPPORTED_DEVICE_IDS
+        current = self.device_path
+        current_node = current.decode(errors="replace") if isinstance(current, bytes) else current
+        if event.kind == "removed":
+            # Close every session on the node, not only the current one, so
+            # its EEPROM shadow cannot outlive the device.
+            for path in self.session_pool.paths():
+                node = path.decode(errors="replace") if isinstance(path, bytes) else path
+                if node == event.node:
+                    try:
+                        self.session_pool.close(path)
+                    except vp.DeviceAccessError:
+                        pass
+            if current_node == event.node:
+                self._log(f"Hotplug: {event.node} removed")
+                if self.device_type == "venus_pro":
+                    self._battery_query_finished(None, "")
+        elif event.kind == "added" and supported and not self._holtek_reconnecting:
+            # Paths of hidapi's libusb backend are not nodes; only a missing
+            # device or a vanished node warrants reconnecting.
+            if current is not None and (not current_node.startswith("/dev/hidraw") or
+                                        current_node in self.device_monitor.snapshot()):
+                return
+            self._log(f"Hotplug: {event.node} added")
+            # One device adds several hidraw nodes; connect once they settle.
+            if not self._hotplug_refresh_pending:
+                self._hotplug_refresh_pending = True
+                QtCore.QTimer.singleShot(500, self._hotplug_refresh)
+
+    def _hotplug_refresh(self) -> None:
+        self._hotplug_refresh_pending = False
+        self._refresh_and_connect(silent=True)
+
     def _battery_thread_finished(self, thread: BatteryQueryThread) -> None:
         """Release a worker only after QThread confirms run() has returned."""
         if self._battery_thread is thread:
@@ -2428,6 +2662,11 @@ class MainWindow(QtWidgets.QMainWindow):
     def _refresh_devices(self) -> None:
         self.device_infos = vp.list_devices()
         self.device_combo.clear()
+        # A re-enumerated receiver may reuse neither its node nor its session.
+        present = {info.path for info in self.device_infos}
+        for path in list(self.session_pool.paths()):
+            if path not in present:
+                self.session_pool.close(path)
 
         if not vp.HIDAPI_AVAILABLE:
             self.status_label.setText("Status: python-hidapi is not installed")
@@ -2474,13 +2713,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self._log(f"Device selected: {info.product} ({info.display_path})")
 
     def _disconnect_device(self) -> None:
-        """Legacy function - just clears device path."""
+        """Legacy function - clears the device path and its pooled handle."""
+        if self.device_path is not None:
+            self.session_pool.close(self.device_path)
         self.device_path = None
         self.status_label.setText("Disconnected")
         self._log("Device cleared")
 
     def _refresh_and_connect(self, silent: bool = False) -> None:
         """Refresh devices and store path for transient connections."""
+        self._initial_connect_pending = False
         self._log("Connect: Refreshing device list...")
         self._refresh_devices()
         if self.device_infos:
@@ -2646,6 +2888,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.reset_button.setToolTip(
             "The Holtek factory-reset sequence is not confirmed." if is_holtek else "")
 
+        self._sync_rgb_controls()
+        self._sync_dpi_controls()
+
+    def _sync_rgb_controls(self) -> None:
+        """Match the RGB tab's ranges to the connected controller."""
+        if not hasattr(self, "rgb_speed"):
+            return
+        is_holtek = self.device_type == "holtek"
         self.rgb_speed.setRange(
             0 if is_holtek else vp.RGB_EFFECT_SPEED_MIN,
             0xFF if is_holtek else vp.RGB_EFFECT_SPEED_MAX)
@@ -2655,6 +2905,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self._update_rgb_brightness_label(self.rgb_brightness.value())
         self._update_rgb_effect_controls()
 
+    def _sync_dpi_controls(self) -> None:
+        """Match the DPI tab's presets and ranges to the connected controller."""
+        if not hasattr(self, "dpi_rows"):
+            return
+        is_holtek = self.device_type == "holtek"
         self.dpi_profile_controls.setVisible(True)
         self.dpi_stage_count_spin.setMaximum(10 if is_holtek else 5)
         self.dpi_active_stage_label.setVisible(is_holtek)
@@ -2698,38 +2953,39 @@ class MainWindow(QtWidgets.QMainWindow):
         return True
 
 
+    @tracing.traced("send_reports", "gui")
     def _send_reports(self, reports: list[bytes], label: str,
                       quiet: bool = False) -> bool:
-        """Send reports using a transient device connection."""
+        """Send reports over the pooled (Areson) or transient (Holtek) handle."""
         if quiet and self.device_path is None:
             return False
         if not quiet and not self._require_device():
             return False
 
-        device = None
         try:
-            # Open device transiently using factory
-            device = dd.create_device(self.device_type, self.device_path)
-            device.open()
-            
-            for report in reports:
-                if device.send_reliable(report):
-                    self._log(f"{label}: {report.hex()}")
-                else:
-                    self._log(f"TIMEOUT: {report.hex()}")
-                    raise RuntimeError(
-                        getattr(device, "last_error", "") or
-                        f"Device timed out on command {report[1]:02X}")
+            tracing.annotate(label=label, reports=len(reports))
+            with dd.open_device(self.device_type, self.device_path,
+                                self.session_pool) as device:
+                for report in reports:
+                    skipped = getattr(device, "skipped_writes", 0)
+                    if device.send_reliable(report):
+                        # The EEPROM shadow drops writes the device already holds.
+                        if getattr(device, "skipped_writes", 0) > skipped:
+                            self._log(f"{label}: skipped, unchanged: {report.hex()}")
+                        else:
+                            self._log(f"{label}: {report.hex()}")
+                    else:
+                        self._log(f"TIMEOUT: {report.hex()}")
+                        raise RuntimeError(
+                            getattr(device, "last_error", "") or
+                            f"Device timed out on command {report[1]:02X}")
             return True
         except Exception as exc:
+            tracing.annotate(error=str(exc))
             self._log(f"{label}: {exc}")
             if not quiet:
                 QtWidgets.QMessageBox.critical(self, "Send failed", str(exc))
             return False
-        finally:
-            # Always close the device
-            if device:
-                device.close()
 
 
     def _sync_all_buttons(self) -> None:
@@ -2952,6 +3208,7 @@ class MainWindow(QtWidgets.QMainWindow):
                  item_assign.setText("Unknown")
                  item_assign.setForeground(QtGui.QBrush(QtGui.QColor("gray")))
 
+    @tracing.traced("commit_staged_changes", "gui")
     def _commit_staged_changes(self) -> None:
         """Commit all staged changes to the device using TransactionController."""
         if not self._require_device():
@@ -2967,55 +3224,55 @@ class MainWindow(QtWidgets.QMainWindow):
             def build_packets(self, key, action, params):
                 return self.parent._build_packets_for_key(key, action, params)
 
-        device = None
         progress = None
         success = False
+        reconnect = False
         failure: Exception | None = None
         try:
-            device = dd.create_device(self.device_type, self.device_path)
-            device.open()
-
-            # Holtek: enter write mode before sending packets
-            if self.device_type == 'holtek':
-                device.enter_write_mode()
-            elif not device.begin_write():
-                raise RuntimeError(device.last_error or "Mouse did not enter ready state")
-
-            builder = PacketBuilder(self)
-            controller = TransactionController(device, builder, logger=self._log)
-
-            # Progress dialog
-            progress = QtWidgets.QProgressDialog(
-                "Applying changes...", None, 0, 0, self)
-            progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
-            progress.show()
-
-            success = controller.execute_transaction(self.staging_manager)
-
-            # Holtek: commit button writes and reset device to reload
-            if self.device_type == 'holtek' and success:
-                progress.setLabelText("Restarting device, please wait...")
-                progress.setCancelButton(None)
-                QtWidgets.QApplication.processEvents()
-                device.commit_writes(categories=0x02)  # Button category + reset
-                # Device handle is dead after reset — close may fail, that's OK
-                try:
-                    device.close()
-                except Exception:
-                    pass
-                device = None
+            with dd.open_device(self.device_type, self.device_path,
+                                self.session_pool) as device:
+                # Holtek: enter write mode before sending packets
+                if self.device_type == 'holtek':
+                    self.holtek_image = None
+                    device.enter_write_mode()
+                elif not device.begin_write():
+                    raise RuntimeError(device.last_error or "Mouse did not enter ready state")
+
+                builder = PacketBuilder(self)
+                # Holtek writes only take effect at the commit below, so
+                # they can be merged into long reports first.
+                controller = TransactionController(
+                    device, builder, logger=self._log,
+                    coalesce=device.coalesce_writes if self.device_type == 'holtek' else None)
+
+                # Progress dialog
+                progress = QtWidgets.QProgressDialog(
+                    "Applying changes...", None, 0, 0, self)
+                progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+                progress.show()
+
+                success = controller.execute_transaction(self.staging_manager)
+
+                # Holtek: commit button writes and reset device to reload
+                if self.device_type == 'holtek' and success:
+                    progress.setLabelText("Restarting device, please wait...")
+                    progress.setCancelButton(None)
+                    QtWidgets.QApplication.processEvents()
+                    device.commit_writes(categories=hp.CATEGORY_BUTTONS)  # + reset
+                    reconnect = True
+            # The Holtek handle is dead after reset; closing it above may
+            # fail silently, and only then is the new node worth looking for.
+            if reconnect:
                 self._holtek_reconnect()
         except Exception as exc:
+            tracing.annotate(error=str(exc))
             failure = exc
         finally:
-            if device:
-                try:
-                    device.close()
-                except Exception:
-                    pass
             if progress:
                 progress.close()
 
+        if self.device_type != 'holtek':
+            self._save_pacing()
         if failure is not None:
             QtWidgets.QMessageBox.critical(self, "Error", str(failure))
         elif success:
@@ -3046,40 +3303,8 @@ class MainWindow(QtWidgets.QMainWindow):
             return hp.build_write_packets(btn_profile.index, action, params,
                                           profile=self.holtek_profile)
 
-        reports = []
         code_hi, code_lo, apply_offset = self._resolve_profile(key, use_fallback=True)
-
-        if action == "Keyboard Key":
-            reports.extend(vp.build_key_binding(
-                code_hi, code_lo, params.get("key", 0), params.get("mod", 0)))
-            reports.append(vp.build_keyboard_bind(apply_offset))
-        elif action == "Media Key":
-            reports.extend(vp.build_consumer_binding(
-                code_hi, code_lo, params.get("code", 0)))
-            reports.append(vp.build_keyboard_bind(apply_offset))
-        elif action == "Disabled":
-            reports.append(vp.build_disabled(apply_offset))
-        elif action in ["Left Click", "Right Click", "Middle Click", "Forward", "Back"]:
-            val_map = {"Left Click": 0x01, "Right Click": 0x02,
-                       "Middle Click": 0x04, "Back": 0x08, "Forward": 0x10}
-            reports.append(vp.build_mouse_param(apply_offset, val_map[action]))
-        elif action == "DPI Control":
-            reports.append(vp.build_dpi_control(apply_offset, params.get("func", 1)))
-        elif action in ["Fire Key", "Triple Click"]:
-            reports.append(vp.build_special_binding(
-                apply_offset, params.get("delay", 40), params.get("repeat", 3)))
-        elif action == "Polling Rate Toggle":
-            reports.append(vp.build_poll_rate_toggle(apply_offset))
-        elif action == "RGB Toggle":
-            reports.append(vp.build_rgb_toggle(apply_offset))
-        elif action == "Macro":
-            reports.append(vp.build_macro_bind(
-                apply_offset, params.get("index", 1) - 1,
-                params.get("mode", vp.MACRO_REPEAT_ONCE)))
-        else:
-            raise ValueError(f"Unsupported button action: {action}")
-                 
-        return reports
+        return vp.build_binding_packets(action, params, code_hi, code_lo, apply_offset)
 
 
     def _upload_macro(self) -> bool:
@@ -3133,17 +3358,9 @@ class MainWindow(QtWidgets.QMainWindow):
             
             self._log(f"Uploading Macro {macro_index+1} ({macro_name}) to Page 0x{page:02X} Offset 0x{offset:02X}...")
             
-            # Build reports
-            reports = [vp.build_simple(vp.CMD_READY)]
-            
-            # Split into 10-byte chunks
-            addr = (page << 8) | offset
-            for i in range(0, len(full_macro), 10):
-                chunk = full_macro[i:i+10]
-                chunk_addr = addr + i
-                chunk_page = (chunk_addr >> 8) & 0xFF
-                chunk_off = chunk_addr & 0xFF
-                reports.append(vp.build_macro_chunk(chunk_off, chunk, chunk_page))
+            # Build reports: 10-byte chunks after a ready handshake
+            reports = [vp.build_simple(vp.CMD_READY),
+                       *vp.build_macro_upload(macro_index, macro_name, events)]
             
             success = self._send_reports(
                     reports,
@@ -3308,36 +3525,41 @@ class MainWindow(QtWidgets.QMainWindow):
             self.staging_manager.clear_stage()
             self._update_staged_visuals()
 
-        # Re-read settings from device for the newly selected profile
+        # All five profiles were read together; show the new one from cache
         if self.device_path and self.device_type == 'holtek':
-            self._read_settings_holtek(silent=True)
+            self._read_settings_holtek(silent=True, cached=True)
 
     def _holtek_reconnect(self) -> None:
         """Wait for Holtek device to reconnect after reset and update path.
 
-        Uses processEvents during the wait so the GUI stays responsive and
+        The wait runs on a worker thread and ends when the device monitor
+        sees the node return; the GUI keeps processing events meanwhile and
         does not interfere with USB re-enumeration.
         """
         self._log("  Waiting for device to reconnect...")
-        # Initial wait — device needs time to fully disconnect before re-enumerating
-        deadline = time.time() + 2.0
-        while time.time() < deadline:
-            QtWidgets.QApplication.processEvents()
-            time.sleep(0.1)
-
-        # Poll for reconnection
-        deadline = time.time() + 8.0
-        while time.time() < deadline:
-            new_path = hp.find_device_path()
-            if new_path:
-                self.device_path = new_path
-                self._log(f"  Device reconnected: {new_path}")
-                return
-            QtWidgets.QApplication.processEvents()
-            time.sleep(0.3)
+        thread = HoltekReconnectThread(self.device_monitor, parent=self)
+        self._holtek_reconnecting = True
+        try:
+            # A nested event loop keeps the GUI live until the worker's
+            # finished signal, queued to this thread, quits it.
+            waiting = QtCore.QEventLoop(self)
+            thread.finished.connect(waiting.quit)
+            thread.start()
+            waiting.exec()
+        finally:
+            self._holtek_reconnecting = False
+        thread.wait()
+        thread.deleteLater()
+
+        new_path = thread.path
+        if new_path:
+            self.device_path = new_path
+            self._log(f"  Device reconnected: {new_path}")
+            return
 
         self._log("  Warning: device did not reconnect within timeout")
 
+    @tracing.traced("apply_rgb_holtek", "gui")
     def _apply_rgb_holtek(self, r: int, g: int, b: int, mode: int,
                           brightness: int, speed: int) -> None:
         """Apply RGB settings on Holtek device."""
@@ -3351,17 +3573,14 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             device = hp.HoltekDevice(self.device_path)
             device.open()
-            device.enter_write_mode()
             profile = self.holtek_profile
-            packets = hp.build_led_packets(
-                r, g, b, mode, brightness, speed, profile=profile)
-            for pkt in packets:
-                device.send_feature(pkt)
-                time.sleep(0.008)
-            # Commit LED and reset device to reload settings from flash
+            self.holtek_image = None
+            plan = hp.WritePlan.from_packets(hp.build_led_packets(
+                r, g, b, mode, brightness, speed, profile=profile))
+            # Write, commit LED and reset device to reload settings from flash
             progress.setLabelText("Restarting device, please wait...")
             QtWidgets.QApplication.processEvents()
-            device.commit_writes(categories=0x08)
+            device.apply_plan(plan)
             # Device handle is dead after reset — close may fail
             try:
                 device.close()
@@ -3376,12 +3595,14 @@ class MainWindow(QtWidgets.QMainWindow):
             # Wait for device to reconnect after reset
             self._holtek_reconnect()
         except Exception as exc:
+            tracing.annotate(error=str(exc))
             QtWidgets.QMessageBox.critical(self, "RGB failed", str(exc))
         finally:
             progress.close()
             if device:
                 device.close()
 
+    @tracing.traced("apply_polling_holtek", "gui")
     def _apply_polling_holtek(self, rate: int) -> None:
         """Apply polling rate on Holtek device using F5 command."""
         if not self._require_device():
@@ -3393,11 +3614,13 @@ class MainWindow(QtWidgets.QMainWindow):
             device.set_polling_rate(rate)
             self._log(f"Holtek Polling: {rate} Hz")
         except Exception as exc:
+            tracing.annotate(error=str(exc))
             QtWidgets.QMessageBox.critical(self, "Polling rate failed", str(exc))
         finally:
             if device:
                 device.close()
 
+    @tracing.traced("apply_dpi_holtek", "gui")
     def _apply_dpi_holtek(self) -> None:
         """Apply DPI settings on Holtek device."""
         if not self._require_device():
@@ -3410,26 +3633,23 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             device = hp.HoltekDevice(self.device_path)
             device.open()
-            device.enter_write_mode()
             # Collect DPI values from the UI (dpi_spin = actual DPI in CPI)
             dpi_values = []
             for _, dpi_spin, _, _ in self.dpi_rows[:self._dpi_stage_count()]:
                 dpi_values.append(dpi_spin.value())
             # Write DPI to the selected profile only
             profile = self.holtek_profile
-            packets = hp.build_dpi_packets(
+            self.holtek_image = None
+            plan = hp.WritePlan.from_packets(hp.build_dpi_packets(
                 dpi_values,
                 profile=profile,
                 current_stage=self.dpi_active_stage_spin.value() - 1,
                 color_indices=self.holtek_dpi_colors,
-            )
-            for pkt in packets:
-                device.send_feature(pkt)
-                time.sleep(0.008)
-            # Commit DPI and reset device to reload settings from flash
+            ))
+            # Write, commit DPI and reset device to reload settings from flash
             progress.setLabelText("Restarting device, please wait...")
             QtWidgets.QApplication.processEvents()
-            device.commit_writes(categories=0x04)
+            device.apply_plan(plan)
             # Device handle is dead after reset — close may fail
             try:
                 device.close()
@@ -3440,6 +3660,7 @@ class MainWindow(QtWidgets.QMainWindow):
             # Wait for device to reconnect after reset
             self._holtek_reconnect()
         except Exception as exc:
+            tracing.annotate(error=str(exc))
             QtWidgets.QMessageBox.critical(self, "DPI failed", str(exc))
         finally:
             progress.close()
@@ -3520,66 +3741,40 @@ class MainWindow(QtWidgets.QMainWindow):
         
         if found:
             self._log("USB: Reclaim sequence complete. Refreshing...")
-            time.sleep(1.0)
-            self._refresh_and_connect()
+            # Give the host drivers a second to re-attach without freezing
+            # the window.
+            QtCore.QTimer.singleShot(1000, self._refresh_and_connect)
         else:
             self._log("USB: No devices found to reclaim.")
             QtWidgets.QMessageBox.information(self, "Device Reclaim", "No Venus Pro devices found on the USB bus.")
 
-    def _read_settings(self, silent: bool = False) -> None:
+    @tracing.traced("read_settings", "gui")
+    def _read_settings(self, silent: bool = False, verify: bool = False) -> None:
         if not self._require_device(auto_mode=silent):
             return
 
         if self.device_type == 'holtek':
             return self._read_settings_holtek(silent=silent)
 
+        self._ensure_settings_tabs()
         self._log("--- Reading from Device ---")
-        device = None
         try:
-            # Open device transiently for reading
-            device = vp.VenusDevice(self.device_path)
-            device.open()
-            
-            # Retry loop for initial handshake
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    if not device.start_session():
-                        raise vp.ProtocolError("startup challenge was rejected")
-                    break # Success
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        self._log(f"Read handshake failed (Attempt {attempt+1}): {e}. Retrying...")
-                        time.sleep(0.5)
-                        # Re-open might be needed?
-                        device.close()
-                        time.sleep(0.1)
-                        device.open()
-                    else:
-                        raise e
-            
-            # The vendor utility reads the 0x0000..0x009f configuration block.
-            page0 = bytearray()
-            for offset in range(0, 0xA0, 10):
-                chunk = device.read_flash(0, offset, 10)
-                page0.extend(chunk)
-            
-            # Page 1 contains keyboard mappings (Part 1)
-            page1 = bytearray()
-            for offset in range(0, 256, 10):
-                length = min(10, 256 - offset)
-                chunk = device.read_flash(1, offset, length)
-                page1.extend(chunk)
-
-            # Page 2 contains keyboard mappings (Part 2)
-            page2 = bytearray()
-            for offset in range(0, 256, 10):
-                length = min(10, 256 - offset)
-                chunk = device.read_flash(2, offset, length)
-                page2.extend(chunk)
-
-
-            self._log("Flash pages 0 and 1 read complete.")
+            tracing.annotate(verify=verify)
+            # The pooled session skips the handshake when this handle already
+            # completed one; a stale or rejected session is retried afresh.
+            with self.session_pool.lease(
+                    self.device_path, authenticate=True, attempts=3) as device:
+                # The cached image per serial means a routine refresh only
+                # fetches bytes we wrote since the last read.
+                version = device.shadow.version if device.shadow else 0
+                # The vendor utility reads the 0x0000..0x009f configuration block.
+                page0 = device.read_cached(0x0000, 0xA0, verify=verify)
+                # Pages 1 and 2 contain keyboard mappings
+                page1 = device.read_cached(0x0100, 0x100, verify=verify)
+                page2 = device.read_cached(0x0200, 0x100, verify=verify)
+
+            mode = "full" if verify else f"cache v{version}"
+            self._log(f"Flash pages 0-2 read complete ({mode}).")
 
             # 1. DPI Levels
             stage_count = page0[0x02]
@@ -3665,76 +3860,15 @@ class MainWindow(QtWidgets.QMainWindow):
             self._log("  Parsing Button bindings...")
             for button_key, profile in vp.BUTTON_PROFILES.items():
                 offset = profile.apply_offset
-                btype = page0[offset]
-                d1 = page0[offset + 1]
-                d2 = page0[offset + 2]
-                
-                action = "Disabled"
-                params = {}
-                
-                self._log(f"DEBUG: Parsing {button_key} (Offset 0x{offset:02X}) -> Type 0x{btype:02X}, D1 0x{d1:02X}, D2 0x{d2:02X}")
-
-                if btype == vp.BUTTON_TYPE_MOUSE:
-                    action = {
-                        0x01: "Left Click", 0x02: "Right Click",
-                        0x04: "Middle Click", 0x08: "Back", 0x10: "Forward",
-                    }.get(d1, f"Mouse Button (0x{d1:02X})")
-                elif btype == vp.BUTTON_TYPE_KEYBOARD:
-                    definition_page = page1 if profile.code_hi == 0x01 else page2
-                    block = bytes(definition_page[profile.code_lo:profile.code_lo + 0x20])
-                    count = block[0] if block else 0
-                    needed = 1 + count * 3 + 1
-                    if count == 0 or needed > len(block):
-                        action = "Invalid Key Definition"
-                    else:
-                        if sum(block[:needed]) & 0xFF != 0x55:
-                            self._log(f"  Warning: {button_key} key definition checksum is invalid")
-                        modifiers = 0
-                        keycode = None
-                        consumer_usage = None
-                        for event_index in range(count):
-                            start = 1 + event_index * 3
-                            status, code_lo, code_hi = block[start:start + 3]
-                            if status == 0x80:
-                                modifiers |= code_lo
-                            elif status == 0x81 and keycode is None:
-                                keycode = code_lo
-                            elif status == 0x82 and consumer_usage is None:
-                                consumer_usage = code_lo | (code_hi << 8)
-                        if consumer_usage is not None:
-                            action = "Media Key"
-                            params = {"code": consumer_usage}
-                        elif keycode is not None:
-                            action = "Keyboard Key"
-                            params = {"key": keycode, "mod": modifiers}
-                        else:
-                            action = "Unknown Key Definition"
-                elif btype == vp.BUTTON_TYPE_DPI_LEGACY:
-                    action = "DPI Control"
-                    params = {"func": d1}
-                elif btype == vp.BUTTON_TYPE_MACRO:
-                    action = "Macro"
-                    macro_index = d1
-                    params["index"] = macro_index + 1
-                    self._log(f"  DEBUG: Macro Index {macro_index+1}")
-                    
-                    # D2 is repeat mode/count
-                    params["mode"] = d2
-                    if d2 >= 0x01 and d2 <= 0xFD: # Repeat Count
-                        params["count"] = d2
-                    else:
-                        params["count"] = 1 # Default for other modes
-                    
+                self._log(f"DEBUG: Parsing {button_key} (Offset 0x{offset:02X}) -> "
+                          f"Type 0x{page0[offset]:02X}, D1 0x{page0[offset + 1]:02X}, "
+                          f"D2 0x{page0[offset + 2]:02X}")
+                action, params = vp.parse_button_binding(page0, page1, page2, profile)
+                if params.pop("checksum_valid", True) is False:
+                    self._log(f"  Warning: {button_key} key definition checksum is invalid")
+                if action == "Macro":
                     params["name"] = self.macro_names.get(
-                        macro_index + 1, f"Macro {macro_index + 1}")
-                elif btype == vp.BUTTON_TYPE_SPECIAL:
-                    action = "Triple Click" if d1 == 50 else "Fire Key"
-                    params["delay"] = d1
-                    params["repeat"] = d2
-                elif btype == vp.BUTTON_TYPE_POLL_RATE:
-                    action = "Polling Rate Toggle"
-                elif btype == vp.BUTTON_TYPE_RGB_TOGGLE:
-                    action = "RGB Toggle"
+                        params["index"], f"Macro {params['index']}")
 
                 self.button_assignments[button_key] = {"action": action, "params": params}
                 self._log(f"  DEBUG: Resolved Action: {action} {params}")
@@ -3758,35 +3892,45 @@ class MainWindow(QtWidgets.QMainWindow):
                     "Configuration successfully read from device.")
 
         except Exception as e:
+            tracing.annotate(error=str(e))
             self._log(f"Error reading configuration: {e}")
             self.status_label.setText("Status: Read failed — see log")
             self.status_label.setStyleSheet("color: orange; font-weight: bold;")
             if not silent:
                 QtWidgets.QMessageBox.critical(self, "Read Error", str(e))
-        finally:
-            # Always close the device
-            if device:
-                device.close()
 
+    @tracing.traced("read_settings_holtek", "gui")
     def _read_settings_holtek(self, silent: bool = False,
-                              use_active_profile: bool = False) -> None:
+                              use_active_profile: bool = False,
+                              cached: bool = False) -> None:
         """Read settings from Holtek Venus MMO device.
 
         Args:
             silent: If True, suppress the success message box (used during profile switch).
             use_active_profile: Select and read the profile currently active on
                 the mouse. Used once during device connection.
+            cached: Decode the profile from the last full read of this device
+                when there is one, instead of reading USB again.
         """
+        self._ensure_settings_tabs()
         profile = self.holtek_profile
         profile_description = "active profile" if use_active_profile else f"Profile {profile + 1}"
         self._log(f"--- Reading from Holtek Device ({profile_description}) ---")
         device = None
         try:
-            device = hp.HoltekDevice(self.device_path)
-            device.open()
-
-            config = hp.read_all_config(
-                device, profile=None if use_active_profile else profile)
+            tracing.annotate(cached=cached)
+            image = None
+            if cached and self.holtek_image and self.holtek_image[0] == self.device_path:
+                image = self.holtek_image[1]
+                self._log("  Using cached read of all profiles")
+            if image is None:
+                self.holtek_image = None
+                device = hp.HoltekDevice(self.device_path)
+                device.open()
+                image = hp.HoltekImage.read(device)
+                self.holtek_image = (self.device_path, image)
+
+            config = image.config(None if use_active_profile else profile)
             if use_active_profile:
                 profile = max(0, min(4, int(config.get("active_profile", 0))))
                 self.holtek_profile = profile
@@ -3876,6 +4020,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.information(self, "Read Success", "Holtek configuration successfully read from device.")
 
         except Exception as e:
+            tracing.annotate(error=str(e))
             self._log(f"Error reading Holtek configuration: {e}")
             self.status_label.setText("Status: Read failed — see log")
             self.status_label.setStyleSheet("color: orange; font-weight: bold;")
@@ -3886,7 +4031,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 device.close()
 
     def _export_profile(self) -> None:
-        """Dump device memory to a file."""
+        """Save the mapped EEPROM regions (or a raw 64 KiB dump) to a file."""
         if not self._require_device():
             return
         if self.device_type == 'holtek':
@@ -3894,56 +4039,71 @@ class MainWindow(QtWidgets.QMainWindow):
                 "Profile export is not yet supported for the Holtek Venus MMO.")
             return
             
-        fname, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Profile", "profile.bin", "Binary Files (*.bin)")
+        fname, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Profile", "profile" + pc.SUFFIX,
+            f"Venus Profile (*{pc.SUFFIX});;Raw Dump (*.bin)")
         if not fname:
             return
-            
-        progress = QtWidgets.QProgressDialog("Exporting profile...", "Cancel", 0, 256, self)
+        # Raw dumps remain available for reverse engineering; profiles only
+        # carry the regions the firmware actually uses.
+        raw = fname.lower().endswith(".bin")
+        spans = ([(page << 8, 0x100) for page in range(256)] if raw else
+                 [(region.start, region.length) for region in pc.PROFILE_REGIONS])
+
+        progress = QtWidgets.QProgressDialog(
+            "Exporting profile...", "Cancel", 0, len(spans), self)
         progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
         progress.show()
         
-        device = None
         cancelled = False
+        regions: list[tuple[int, bytes]] = []
         try:
-            # Open device transiently
-            device = vp.VenusDevice(self.device_path)
-            device.open()
-            if not device.start_session():
-                raise vp.ProtocolError("startup challenge was rejected")
-            
-            with open(fname, "wb") as f:
-                for page in range(256):
+            with self.session_pool.lease(self.device_path) as device:
+                for index, (start, length) in enumerate(spans):
                     if progress.wasCanceled():
                         cancelled = True
                         break
-                    progress.setValue(page)
-                    
-                    # Read page (256 bytes)
-                    page_data = bytearray()
-                    for offset in range(0, 256, 10):
-                        length = min(10, 256 - offset)
-                        chunk = device.read_flash(page, offset, length)
-                        page_data.extend(chunk)
-                    f.write(page_data)
+                    progress.setValue(index)
+                    regions.append((start, device.read_range(start, length)))
             if cancelled:
-                self._log(f"Profile export canceled; partial dump remains at {fname}")
+                self._log("Profile export canceled; nothing was written")
                 QtWidgets.QMessageBox.information(
-                    self, "Export Canceled", f"A partial dump remains at {fname}")
+                    self, "Export Canceled", "No profile file was written.")
+                return
+            if raw:
+                payload = b"".join(data for _, data in regions)
             else:
-                progress.setValue(256)
-                self._log(f"Profile exported to {fname}")
-                QtWidgets.QMessageBox.information(
-                    self, "Export Successful", f"Profile saved to {fname}")
+                info = self._device_info_for(self.device_path)
+                payload = pc.encode_profile(
+                    info.vendor_id if info else 0, info.product_id if info else 0,
+                    regions)
+            Path(fname).write_bytes(payload)
+            progress.setValue(len(spans))
+            self._log(f"Profile exported to {fname} ({len(payload)} bytes)")
+            QtWidgets.QMessageBox.information(
+                self, "Export Successful", f"Profile saved to {fname}")
         except Exception as e:
             self._log(f"Export failed: {e}")
             QtWidgets.QMessageBox.critical(self, "Export Failed", str(e))
         finally:
-            if device:
-                device.close()
             progress.close()
 
+    def _read_profile_file(self, fname: str) -> list[tuple[int, bytes]]:
+        """Return the regions to write from a profile container or raw dump."""
+        if not pc.is_profile_container(fname):
+            return pc.legacy_regions(Path(fname).read_bytes())
+        with pc.ProfileContainer.open(fname) as profile:
+            info = self._device_info_for(self.device_path)
+            if info and (dd.device_type_for_ids(profile.vendor_id, profile.product_id)
+                         != dd.detect_device_type(info)):
+                raise pc.ProfileFormatError(
+                    f"profile was exported from "
+                    f"{profile.vendor_id:04x}:{profile.product_id:04x}, "
+                    f"not this {info.vendor_id:04x}:{info.product_id:04x} mouse")
+            return [(start, bytes(data)) for start, data in profile.regions()]
+
     def _import_profile(self) -> None:
-        """Load profile from file and write to device."""
+        """Load a profile file and write its mapped regions to the device."""
         if not self._require_device():
             return
         if self.device_type == 'holtek':
@@ -3951,15 +4111,16 @@ class MainWindow(QtWidgets.QMainWindow):
                 "Profile import is not yet supported for the Holtek Venus MMO.")
             return
             
-        fname, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Open Profile", "", "Binary Files (*.bin)")
+        fname, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Open Profile", "", f"Profiles (*{pc.SUFFIX} *.bin)")
         if not fname:
             return
             
         try:
-            data = Path(fname).read_bytes()
-            if len(data) != 65536: # 256 * 256
-                QtWidgets.QMessageBox.warning(self, "Invalid File", f"File size must be exactly 64KB (got {len(data)} bytes).")
-                return
+            regions = self._read_profile_file(fname)
+        except pc.ProfileFormatError as e:
+            QtWidgets.QMessageBox.warning(self, "Invalid File", str(e))
+            return
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, "Read Failed", str(e))
             return
@@ -3973,45 +4134,34 @@ class MainWindow(QtWidgets.QMainWindow):
         if reply != QtWidgets.QMessageBox.StandardButton.Yes:
             return
             
-        progress = QtWidgets.QProgressDialog("Importing profile (Writing Flash)...", "Cancel", 0, 256, self)
+        progress = QtWidgets.QProgressDialog(
+            "Importing profile (Writing Flash)...", "Cancel", 0, len(regions), self)
         progress.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
         progress.show()
         
-        device = None
         imported = False
         cancelled = False
         try:
-            # Open device transiently
-            device = vp.VenusDevice(self.device_path)
-            device.open()
-            if not device.start_session():
-                raise vp.ProtocolError("startup challenge was rejected")
-            if not device.begin_write():
-                raise RuntimeError(device.last_error or "Mouse did not enter ready state")
-            
-            for page in range(256):
-                if progress.wasCanceled():
-                    cancelled = True
-                    break
-                progress.setValue(page)
-                
-                # Extract page data
-                page_start = page * 256
-                page_data = data[page_start : page_start + 256]
-                
-                # Write in 10-byte chunks (protocol limit)
-                for offset in range(0, 256, 10):
-                    if progress.wasCanceled():
-                        cancelled = True
+            with self.session_pool.lease(self.device_path) as device:
+                if not device.begin_write():
+                    raise RuntimeError(device.last_error or "Mouse did not enter ready state")
+
+                for index, (start, data) in enumerate(regions):
+                    progress.setValue(index)
+                    # Write in 10-byte chunks (protocol limit)
+                    for offset in range(0, len(data), vp.MAX_DATA_LEN):
+                        if progress.wasCanceled():
+                            cancelled = True
+                            break
+                        address = start + offset
+                        packet = vp.build_memory_write(
+                            address, data[offset:offset + vp.MAX_DATA_LEN])
+                        if not device.send_reliable(packet):
+                            raise RuntimeError(
+                                device.last_error or
+                                f"Write failed at 0x{address:04x}")
+                    if cancelled:
                         break
-                    chunk = page_data[offset : offset + 10]
-                    packet = vp.build_flash_write(page, offset, chunk)
-                    if not device.send_reliable(packet):
-                        raise RuntimeError(
-                            device.last_error or
-                            f"Write failed at 0x{page:02x}{offset:02x}")
-                if cancelled:
-                    break
 
             if cancelled:
                 self._log("Profile import canceled; the device contains a partial write")
@@ -4020,7 +4170,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     "Import stopped after a partial write. Re-import a complete profile before relying on the device configuration.")
             else:
                 imported = True
-                progress.setValue(256)
+                progress.setValue(len(regions))
                 self._log(f"Profile imported from {fname}")
                 QtWidgets.QMessageBox.information(
                     self, "Import Successful", "Profile successfully written to device.")
@@ -4029,8 +4179,6 @@ class MainWindow(QtWidgets.QMainWindow):
             self._log(f"Import failed: {e}")
             QtWidgets.QMessageBox.critical(self, "Import Failed", str(e))
         finally:
-            if device:
-                device.close()
             progress.close()
         
         # Reload settings only after a complete import (and after closing HID).
@@ -4072,6 +4220,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if slot_index is None:
             slot_index = self.macro_index_spin.value()
 
+        self._ensure_tab("Macros")
         self.macro_bind_index_spin.blockSignals(True)
         self.macro_bind_index_spin.setValue(slot_index)
         self.macro_bind_index_spin.blockSignals(False)
@@ -4084,22 +4233,16 @@ class MainWindow(QtWidgets.QMainWindow):
         self._log(f"Reading macro slot {slot_index} (Page 0x{start_page:02X}, Offset 0x{start_offset:02X})")
         
         data = bytearray()
-        device = None
         try:
-            # Open device transiently
-            device = vp.VenusDevice(self.device_path)
-            device.open()
-            if not device.start_session():
-                raise vp.ProtocolError("startup challenge was rejected")
-
             # Read exactly one 0x180-byte slot from its absolute address.
             slot_address = (start_page << 8) | start_offset
-            for relative in range(0, vp.MACRO_SLOT_SIZE, vp.MAX_DATA_LEN):
-                address = slot_address + relative
-                length = min(vp.MAX_DATA_LEN,
-                             vp.MACRO_SLOT_SIZE - relative)
-                data.extend(device.read_flash(
-                    (address >> 8) & 0xFF, address & 0xFF, length))
+            with self.session_pool.lease(self.device_path) as device:
+                for relative in range(0, vp.MACRO_SLOT_SIZE, vp.MAX_DATA_LEN):
+                    address = slot_address + relative
+                    length = min(vp.MAX_DATA_LEN,
+                                 vp.MACRO_SLOT_SIZE - relative)
+                    data.extend(device.read_flash(
+                        (address >> 8) & 0xFF, address & 0xFF, length))
             raw_macro = bytes(data)
                 
             # Parse Name
@@ -4182,9 +4325,6 @@ class MainWindow(QtWidgets.QMainWindow):
         except Exception as e:
             self._log(f"Failed to load macro: {e}")
             QtWidgets.QMessageBox.critical(self, "Load Error", str(e))
-        finally:
-            if device:
-                device.close()
 
 
     def _generate_text_macro(self) -> None:
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import importlib.util
+import json
+import os
 import random
 import secrets
 import sys
 import threading
 import time
-from dataclasses import dataclass
-from typing import Iterable
+from collections import deque
+from concurrent import futures
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Sequence
+
+import tracing
 
 try:
     import hid
@@ -15,18 +24,16 @@ except ImportError:
     hid = None
     HIDAPI_AVAILABLE = False
 
-try:
-    import usb.core
-    import usb.util
-    PYUSB_AVAILABLE = True
-except ImportError:
-    PYUSB_AVAILABLE = False
+# PyUSB is only needed to reclaim or reset a captured device.  Importing it
+# loads libusb backends, so the module is imported by the functions below.
+PYUSB_AVAILABLE = importlib.util.find_spec("usb") is not None
 
 
 def reclaim_device(vendor_id: int, product_id: int) -> bool:
     """Attempts to force re-attach the kernel driver to a device."""
     if not PYUSB_AVAILABLE:
         return False
+    import usb.core
     dev = usb.core.find(idVendor=vendor_id, idProduct=product_id)
     if dev is None:
         return False
@@ -54,6 +61,7 @@ def reset_usb_device(vendor_id: int, product_id: int) -> bool:
     """Performs a low-level USB bus reset."""
     if not PYUSB_AVAILABLE:
         return False
+    import usb.core
     dev = usb.core.find(idVendor=vendor_id, idProduct=product_id)
     if dev:
         try:
@@ -69,6 +77,7 @@ def is_device_busy(vendor_id: int, product_id: int) -> bool:
     if not PYUSB_AVAILABLE:
         return False
     
+    import usb.core
     dev = usb.core.find(idVendor=vendor_id, idProduct=product_id)
     if dev is None:
         return False
@@ -132,6 +141,21 @@ CMD_FACTORY_RESET = 0x09
 # conservative interval for reliable command sequences.
 REPORT_SETTLE_SECONDS = 0.05
 
+# Bounds for adaptive pacing (see ReportPacer).  The floor is the shortest
+# post-ACK gap observed from the Windows driver; backoff may exceed the fixed
+# interval when the firmware starts timing out or corrupting responses.
+PACING_MIN_SECONDS = 0.025
+PACING_MAX_SECONDS = 0.2
+
+# CMD_READ requests kept in flight by VenusDevice.read_range.  Reads do not
+# touch the EEPROM, and any request the firmware drops is simply re-sent.
+READ_WINDOW = 4
+
+# An authenticated session survives between reports, but a receiver that
+# sleeps or re-pairs silently forgets it.  Pooled sessions repeat the startup
+# handshake after this much inactivity rather than trusting a stale session.
+SESSION_IDLE_SECONDS = 30.0
+
 
 @dataclass(frozen=True)
 class ButtonProfile:
@@ -553,6 +577,17 @@ def build_flash_read(page: int, offset: int, length: int) -> bytes:
     return build_report(CMD_READ, payload)
 
 
+def response_key(report: bytes) -> tuple[int, bytes | None]:
+    """Pair a request with its 0x09 response.
+
+    Responses echo the command byte; EEPROM reads and writes also echo the
+    big-endian address, which distinguishes concurrent requests.
+    """
+    command = report[1]
+    address = bytes(report[3:5]) if command in (CMD_WRITE, CMD_READ) else None
+    return command, address
+
+
 def build_challenge(challenge: bytes) -> bytes:
     if len(challenge) != 4:
         raise ValueError("challenge must be exactly four bytes")
@@ -1122,6 +1157,151 @@ def get_macro_slot_info(macro_index: int) -> tuple[int, int]:
     return page, offset
 
 
+MOUSE_ACTION_MASKS = {"Left Click": 0x01, "Right Click": 0x02,
+                      "Middle Click": 0x04, "Back": 0x08, "Forward": 0x10}
+
+
+def build_binding_packets(action: str, params: dict, code_hi: int, code_lo: int,
+                          apply_offset: int) -> list[bytes]:
+    """Build the reports that bind one button to an action."""
+    reports = []
+    if action == "Keyboard Key":
+        reports.extend(build_key_binding(
+            code_hi, code_lo, params.get("key", 0), params.get("mod", 0)))
+        reports.append(build_keyboard_bind(apply_offset))
+    elif action == "Media Key":
+        reports.extend(build_consumer_binding(
+            code_hi, code_lo, params.get("code", 0)))
+        reports.append(build_keyboard_bind(apply_offset))
+    elif action == "Disabled":
+        reports.append(build_disabled(apply_offset))
+    elif action in MOUSE_ACTION_MASKS:
+        reports.append(build_mouse_param(apply_offset, MOUSE_ACTION_MASKS[action]))
+    elif action == "DPI Control":
+        reports.append(build_dpi_control(apply_offset, params.get("func", 1)))
+    elif action in ["Fire Key", "Triple Click"]:
+        reports.append(build_special_binding(
+            apply_offset, params.get("delay", 40), params.get("repeat", 3)))
+    elif action == "Polling Rate Toggle":
+        reports.append(build_poll_rate_toggle(apply_offset))
+    elif action == "RGB Toggle":
+        reports.append(build_rgb_toggle(apply_offset))
+    elif action == "Macro":
+        reports.append(build_macro_bind(
+            apply_offset, params.get("index", 1) - 1,
+            params.get("mode", MACRO_REPEAT_ONCE)))
+    else:
+        raise ValueError(f"Unsupported button action: {action}")
+    return reports
+
+
+def parse_button_binding(page0: bytes, page1: bytes, page2: bytes,
+                         profile: ButtonProfile) -> tuple[str, dict]:
+    """Decode one button's ``(action, params)`` from configuration pages 0-2.
+
+    Keyboard actions are looked up in the key-definition block on page 1 or 2.
+    A definition whose checksum is wrong is still decoded and flagged with
+    ``params["checksum_valid"] = False``.
+    """
+    offset = profile.apply_offset
+    btype = page0[offset]
+    d1 = page0[offset + 1]
+    d2 = page0[offset + 2]
+    action = "Disabled"
+    params: dict = {}
+
+    if btype == BUTTON_TYPE_MOUSE:
+        action = {mask: name for name, mask in MOUSE_ACTION_MASKS.items()}.get(
+            d1, f"Mouse Button (0x{d1:02X})")
+    elif btype == BUTTON_TYPE_KEYBOARD:
+        definition_page = page1 if profile.code_hi == 0x01 else page2
+        block = bytes(definition_page[profile.code_lo:profile.code_lo + 0x20])
+        count = block[0] if block else 0
+        needed = 1 + count * 3 + 1
+        if count == 0 or needed > len(block):
+            return "Invalid Key Definition", params
+        modifiers = 0
+        keycode = None
+        consumer_usage = None
+        for event_index in range(count):
+            start = 1 + event_index * 3
+            status, code_lo, code_hi = block[start:start + 3]
+            if status == 0x80:
+                modifiers |= code_lo
+            elif status == 0x81 and keycode is None:
+                keycode = code_lo
+            elif status == 0x82 and consumer_usage is None:
+                consumer_usage = code_lo | (code_hi << 8)
+        if consumer_usage is not None:
+            action = "Media Key"
+            params = {"code": consumer_usage}
+        elif keycode is not None:
+            action = "Keyboard Key"
+            params = {"key": keycode, "mod": modifiers}
+        else:
+            action = "Unknown Key Definition"
+        if sum(block[:needed]) & 0xFF != 0x55:
+            params["checksum_valid"] = False
+    elif btype == BUTTON_TYPE_DPI_LEGACY:
+        action = "DPI Control"
+        params = {"func": d1}
+    elif btype == BUTTON_TYPE_MACRO:
+        action = "Macro"
+        params["index"] = d1 + 1
+        # D2 is repeat mode/count
+        params["mode"] = d2
+        params["count"] = d2 if 0x01 <= d2 <= 0xFD else 1
+    elif btype == BUTTON_TYPE_SPECIAL:
+        action = "Triple Click" if d1 == 50 else "Fire Key"
+        params["delay"] = d1
+        params["repeat"] = d2
+    elif btype == BUTTON_TYPE_POLL_RATE:
+        action = "Polling Rate Toggle"
+    elif btype == BUTTON_TYPE_RGB_TOGGLE:
+        action = "RGB Toggle"
+    return action, params
+
+
+def build_macro_upload(macro_index: int, name: str,
+                       events: Iterable[MacroEvent]) -> list[bytes]:
+    """Build the chunk writes that store a macro in slot ``macro_index``."""
+    image = build_macro_image(name, events)
+    page, offset = get_macro_slot_info(macro_index)
+    addr = (page << 8) | offset
+    reports = []
+    for i in range(0, len(image), MAX_DATA_LEN):
+        chunk_addr = addr + i
+        reports.append(build_macro_chunk(
+            chunk_addr & 0xFF, image[i:i + MAX_DATA_LEN], (chunk_addr >> 8) & 0xFF))
+    return reports
+
+
+def parse_settings(page0: bytes) -> dict:
+    """Decode polling rate, DPI stages and lighting from configuration page 0."""
+    stage_count = page0[0x02]
+    values = [page0[offset] for offset in (0x0C, 0x10, 0x14, 0x18, 0x1C)]
+    brightness_b1 = page0[0x5A]
+    return {
+        "polling_rate": POLLING_CODE_TO_RATE.get(page0[0x00]),
+        "dpi": {
+            "stage_count": stage_count,
+            "stages": [value_to_dpi(value) for value in values],
+            "values": values,
+        },
+        "rgb": {
+            "r": page0[0x54],
+            "g": page0[0x55],
+            "b": page0[0x56],
+            "mode": rgb_mode_from_hardware(page0[0x58]),
+            "brightness": (100 if brightness_b1 == 0xFF else
+                           0 if brightness_b1 <= 1 else
+                           min(100, round(brightness_b1 / 3))),
+            "speed": max(RGB_EFFECT_SPEED_MIN,
+                         min(RGB_EFFECT_SPEED_MAX, page0[0x5C])),
+        },
+    }
+
+
 def build_dpi(slot_index: int, value: int, tweak: int) -> bytes:
     if not 0 <= slot_index <= 7:
         raise ValueError("slot_index must be 0..7")
@@ -1178,6 +1358,219 @@ class ProtocolTimeout(ProtocolError):
     pass
 
 
+def parse_status(response: bytes) -> BatteryStatus:
+    """Decode the battery step and cable flag of a command 0x04 response."""
+    if response[5] < 2:
+        raise ProtocolError("status response is shorter than two bytes")
+    level = response[6]
+    if level > 10:
+        raise ProtocolError(f"invalid battery step {level}; expected 0..10")
+    return BatteryStatus(level, level * 10, bool(response[7]), bytes(response[6:8]))
+
+
+@dataclass
+class CommandPacing:
+    """Observed ACK behaviour and the current settle gap for one command."""
+    gap: float = REPORT_SETTLE_SECONDS
+    latency: float = 0.0
+    acks: int = 0
+    failures: int = 0
+    clean_streak: int = 0
+
+
+class ReportPacer:
+    """Adapt the gap left after each acknowledged report, per command byte.
+
+    The fixed :data:`REPORT_SETTLE_SECONDS` is safe but slow for long macro
+    uploads.  A run of clean ACKs shrinks the gap towards
+    :data:`PACING_MIN_SECONDS`; a timeout, bad checksum, or an ACK much slower
+    than usual resets the run, and failures double the gap up to
+    :data:`PACING_MAX_SECONDS`.  Statistics serialize with :meth:`to_dict`
+    so a device does not have to re-learn them on every start.
+    """
+
+    SHRINK_AFTER = 8
+    SHRINK_FACTOR = 0.85
+    BACKOFF_FACTOR = 2.0
+    LATENCY_WEIGHT = 0.2
+    SLOW_ACK_FACTOR = 3.0
+
+    def __init__(self, minimum: float = PACING_MIN_SECONDS,
+                 maximum: float = PACING_MAX_SECONDS):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.stats: dict[int, CommandPacing] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, command: int) -> CommandPacing:
+        stats = self.stats.get(command)
+        if stats is None:
+            stats = CommandPacing()
+            self.stats[command] = stats
+        return stats
+
+    def settle_seconds(self, command: int) -> float:
+        with self._lock:
+            stats = self.stats.get(command)
+            gap = stats.gap if stats is not None else REPORT_SETTLE_SECONDS
+        return max(self.minimum, min(self.maximum, gap))
+
+    def record_ack(self, command: int, latency: float) -> None:
+        with self._lock:
+            stats = self._stats(command)
+            slow = (stats.acks > 0 and
+                    latency > stats.latency * self.SLOW_ACK_FACTOR)
+            if stats.acks == 0:
+                stats.latency = latency
+            else:
+                stats.latency += (latency - stats.latency) * self.LATENCY_WEIGHT
+            stats.acks += 1
+            if slow:
+                stats.clean_streak = 0
+                return
+            stats.clean_streak += 1
+            if stats.clean_streak >= self.SHRINK_AFTER:
+                stats.clean_streak = 0
+                stats.gap = max(self.minimum, stats.gap * self.SHRINK_FACTOR)
+
+    def record_failure(self, command: int) -> None:
+        with self._lock:
+            stats = self._stats(command)
+            stats.failures += 1
+            stats.clean_streak = 0
+            stats.gap = min(self.maximum, stats.gap * self.BACKOFF_FACTOR)
+
+    def to_dict(self) -> dict[str, dict]:
+        with self._lock:
+            return {f"{command:02x}": asdict(stats)
+                    for command, stats in sorted(self.stats.items())}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReportPacer":
+        pacer = cls()
+        for key, values in data.items():
+            try:
+                command = int(key, 16)
+                stats = CommandPacing(**values)
+            except (TypeError, ValueError):
+                continue
+            stats.gap = max(pacer.minimum, min(pacer.maximum, float(stats.gap)))
+            pacer.stats[command] = stats
+        return pacer
+
+
+def load_pacer(path: str | Path, key: str) -> ReportPacer:
+    """Load the tuned pacing for one device ``key`` (normally its serial)."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return ReportPacer()
+    entry = data.get(key) if isinstance(data, dict) else None
+    return ReportPacer.from_dict(entry) if isinstance(entry, dict) else ReportPacer()
+
+
+def save_pacer(path: str | Path, key: str, pacer: ReportPacer) -> None:
+    """Store one device's pacing without discarding other devices' entries."""
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(data, dict):
+            data = {}
+    except (OSError, ValueError):
+        data = {}
+    data[key] = pacer.to_dict()
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    temporary.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n",
+                         encoding="utf-8")
+    temporary.replace(path)
+
+
+# End of the address space the GUI reads and writes: page 0x1A holds the tail
+# of the sixteenth macro slot.
+EEPROM_SIZE = 0x1B00
+
+
+class EepromShadow:
+    """Last known contents of the Areson EEPROM.
+
+    Bytes become known when a read returns them or a write is acknowledged.
+    A write that fails forgets its range, since it may or may not have
+    reached the EEPROM before the timeout.  Acknowledged writes also mark
+    their bytes dirty so the next cached read fetches exactly those back;
+    :attr:`version` counts the writes recorded so far.
+
+    The shadow serves both as a read cache and as the filter that skips
+    writes of bytes already stored.
+    """
+
+    def __init__(self, size: int = EEPROM_SIZE):
+        self.data = bytearray(size)
+        self.known = bytearray(size)
+        self.dirty = bytearray(size)
+        self.version = 0
+
+    def covers(self, address: int, length: int) -> bool:
+        """True when ``length`` bytes at ``address`` fit inside the shadow."""
+        return 0 <= address and address + length <= len(self.data)
+
+    def update(self, address: int, data: bytes) -> None:
+        """Record bytes read back from the device."""
+        if not self.covers(address, len(data)):
+            return
+        self.data[address:address + len(data)] = data
+        self.known[address:address + len(data)] = b"\x01" * len(data)
+        self.dirty[address:address + len(data)] = bytes(len(data))
+
+    def record_write(self, address: int, data: bytes) -> None:
+        """Record an acknowledged write of ``data`` at ``address``."""
+        if not self.covers(address, len(data)):
+            return
+        self.update(address, data)
+        self.dirty[address:address + len(data)] = b"\x01" * len(data)
+        self.version += 1
+
+    def forget(self, address: int, length: int) -> None:
+        if self.covers(address, length):
+            self.known[address:address + length] = bytes(length)
+
+    def clear(self) -> None:
+        self.known[:] = bytes(len(self.known))
+        self.version += 1
+
+    def stale_runs(self, start: int, length: int) -> list[tuple[int, int]]:
+        """Return ``(address, length)`` runs that are unknown or dirty."""
+        runs: list[tuple[int, int]] = []
+        address, end = start, start + length
+        while address < end:
+            if self.known[address] and not self.dirty[address]:
+                address += 1
+                continue
+            run_start = address
+            while address < end and (not self.known[address] or self.dirty[address]):
+                address += 1
+            runs.append((run_start, address - run_start))
+        return runs
+
+    def matches(self, address: int, data: bytes) -> bool:
+        """True when every byte of ``data`` is known to be stored already."""
+        end = address + len(data)
+        return (self.covers(address, len(data)) and
+                0 not in self.known[address:end] and
+                self.data[address:end] == data)
+
+    @staticmethod
+    def write_span(report: bytes) -> tuple[int, bytes] | None:
+        """Return ``(address, data)`` for a memory write report, else None."""
+        if len(report) < REPORT_LEN or report[1] != CMD_WRITE:
+            return None
+        length = min(report[5], MAX_DATA_LEN)
+        return (report[3] << 8) | report[4], bytes(report[6:6 + length])
+
+    def is_redundant(self, report: bytes) -> bool:
+        span = self.write_span(report)
+        return span is not None and bool(span[1]) and self.matches(*span)
+
+
 def expected_interface(vendor_id: int, product_id: int) -> int:
     return 2 if (vendor_id, product_id) == (0x04D9, 0xFC55) else 1
 
@@ -1216,6 +1609,49 @@ def _probe_open(path: bytes | str) -> str:
                 pass
 
 
+# hidraw path -> node signature at its last successful probe.
+_probe_cache: dict[bytes | str, tuple] = {}
+_probe_cache_lock = threading.Lock()
+
+
+def _node_signature(path: bytes | str) -> tuple | None:
+    """Identify one incarnation of a hidraw node, or None if it is not one.
+
+    The device link names the USB port and HID instance, which change on
+    every re-plug; the node's ctime changes whenever udev adjusts its mode,
+    owner or ACL.
+    """
+    node = path.decode(errors="replace") if isinstance(path, bytes) else path
+    if not node.startswith("/dev/hidraw"):
+        return None
+    try:
+        stat = os.stat(node)
+        device = str(Path("/sys/class/hidraw", Path(node).name, "device").resolve(strict=True))
+    except OSError:
+        return None
+    return (stat.st_rdev, stat.st_ino, stat.st_mode, stat.st_uid, stat.st_gid,
+            stat.st_ctime_ns, device)
+
+
+def _cached_probe(path: bytes | str) -> str:
+    """Probe ``path`` unless it opened before and its node is unchanged.
+
+    Failures are never cached: a busy or denied node is probed again on the
+    next scan.
+    """
+    signature = _node_signature(path)
+    with _probe_cache_lock:
+        if signature is not None and _probe_cache.get(path) == signature:
+            return ""
+    error = _probe_open(path)
+    with _probe_cache_lock:
+        if signature is not None and not error:
+            _probe_cache[path] = signature
+        else:
+            _probe_cache.pop(path, None)
+    return error
+
+
 def _device_sort_key(info: DeviceInfo) -> tuple[int, int, int, str]:
     product_lower = info.product.lower()
     # Check string OR explicit PID for receiver
@@ -1234,16 +1670,31 @@ def list_devices(exclude_receivers: bool = False) -> list[DeviceInfo]:
     old fallback opened by VID/PID and then fabricated an unusable path, which
     is the direct cause of many ``open failed`` reports.  Linux hidapi always
     supplies a real hidraw path, so entries without one are never returned.
+
+    hidapi walks every HID device on each call, so the bus is enumerated once
+    and filtered here.  Nodes that opened before and are unchanged since are
+    not opened again (see :func:`_cached_probe`).
     """
     if not HIDAPI_AVAILABLE:
         return []
 
+    try:
+        all_entries = list(hid.enumerate(0, 0))
+    except Exception:
+        return []
+    by_id: dict[tuple[int, int], list[dict]] = {}
+    for entry in all_entries:
+        key = (entry.get("vendor_id"), entry.get("product_id"))
+        if key in SUPPORTED_DEVICE_IDS:
+            by_id.setdefault(key, []).append(entry)
+    with _probe_cache_lock:
+        present = {entry.get("path") for entries in by_id.values() for entry in entries}
+        for path in [path for path in _probe_cache if path not in present]:
+            del _probe_cache[path]
+
     devices: list[DeviceInfo] = []
     for vid, pid in sorted(SUPPORTED_DEVICE_IDS):
-        try:
-            entries = list(hid.enumerate(vid, pid))
-        except Exception:
-            continue
+        entries = by_id.get((vid, pid))
         if not entries:
             continue
 
@@ -1293,7 +1744,7 @@ def list_devices(exclude_receivers: bool = False) -> list[DeviceInfo]:
                 interface_number=item.get("interface_number", -1),
                 usage_page=item.get("usage_page", 0),
                 usage=item.get("usage", 0),
-                access_error=_probe_open(path),
+                access_error=_cached_probe(path),
                 selection_note=note,
             ))
 
@@ -1301,28 +1752,91 @@ def list_devices(exclude_receivers: bool = False) -> list[DeviceInfo]:
     return devices
 
 
-class VenusDevice:
-    # Interrupt responses are consumed from one hidraw queue. Serializing
-    # handles prevents the tray poller from stealing a configuration ACK.
-    _io_lock = threading.Lock()
+_io_locks: dict[bytes, threading.Lock] = {}
+_io_locks_guard = threading.Lock()
+
+
+def io_lock(path: bytes | str) -> threading.Lock:
+    """Return the lock shared by every handle on the hidraw node ``path``.
+
+    Interrupt responses are consumed from one queue per node, so handles on
+    the same node are serialized to keep the tray poller from stealing a
+    configuration ACK.  Different mice have separate queues and do not wait
+    for each other.
+    """
+    key = path.encode() if isinstance(path, str) else bytes(path)
+    with _io_locks_guard:
+        lock = _io_locks.get(key)
+        if lock is None:
+            lock = _io_locks[key] = threading.Lock()
+        return lock
+
 
-    def __init__(self, path: bytes | str):
+class VenusDevice:
+    def __init__(self, path: bytes | str, pacer: ReportPacer | None = None,
+                 shadow: EepromShadow | None = None,
+                 handle_factory: Callable[[], object] | None = None):
         self._path = path
+        # Builds the hid.device-like handle; a simulator can stand in for
+        # hidapi here.
+        self._handle_factory = handle_factory
+        self._io_lock = io_lock(path)
         self._dev = None
         self._lock_held = False
         self.last_error = ""
+        # Without a pacer every acknowledged report keeps the fixed,
+        # capture-backed gap.
+        self.pacer = pacer
+        # With a shadow, writes of bytes the EEPROM already holds are
+        # acknowledged locally instead of being sent.
+        self.shadow = shadow
+        self.skipped_writes = 0
+        # Outstanding requests by response_key(), oldest first.  Responses
+        # are matched here by the reader thread, or by the waiting caller
+        # itself when the handle was attached without open().
+        self._waiters: dict[tuple[int, bytes | None], list[futures.Future]] = {}
+        self._waiters_lock = threading.Lock()
+        self._bad_checksums: set[tuple[int, bytes | None]] = set()
+        self._listeners: list[Callable[[bytes], None]] = []
+        self._reader: threading.Thread | None = None
+        self._reader_stop = threading.Event()
+        self._reader_error: Exception | None = None
 
     def open(self) -> None:
         if self._dev is not None:
             return
-        if not HIDAPI_AVAILABLE:
+        if self._handle_factory is None and not HIDAPI_AVAILABLE:
             raise DeviceAccessError("python-hidapi is not installed")
+        self._acquire_io_lock()
+        self._lock_held = True
+        try:
+            self._open_handle()
+        except Exception:
+            self._io_lock.release()
+            self._lock_held = False
+            raise
+
+    def close(self) -> None:
+        if self._dev is None:
+            return
+        try:
+            self._close_handle()
+        finally:
+            if self._lock_held:
+                self._io_lock.release()
+                self._lock_held = False
+
+    def _acquire_io_lock(self) -> None:
         if not self._io_lock.acquire(timeout=1.0):
             raise DeviceAccessError("mouse configuration interface is busy")
-        self._lock_held = True
+
+    def _open_handle(self) -> None:
+        """Open hidraw without touching the I/O lock; the caller must hold it."""
+        if self._handle_factory is None and not HIDAPI_AVAILABLE:
+            raise DeviceAccessError("python-hidapi is not installed")
         dev = None
         try:
-            dev = hid.device()
+            dev = self._handle_factory() if self._handle_factory else hid.device()
             dev.open_path(self._path.encode() if isinstance(self._path, str) else self._path)
             dev.set_nonblocking(True)
             self._dev = dev
@@ -1332,20 +1846,130 @@ class VenusDevice:
                     dev.close()
             except Exception:
                 pass
-            self._io_lock.release()
-            self._lock_held = False
             raise DeviceAccessError(_format_open_error(self._path, exc)) from exc
+        self._start_reader()
 
-    def close(self) -> None:
+    def _close_handle(self) -> None:
         if self._dev is None:
             return
+        self._stop_reader()
         try:
             self._dev.close()
         finally:
             self._dev = None
-            if self._lock_held:
-                self._io_lock.release()
-                self._lock_held = False
+
+    def _start_reader(self) -> None:
+        self._reader_stop.clear()
+        self._reader_error = None
+        self._reader = threading.Thread(
+            target=self._reader_loop, name="venus-reader", daemon=True)
+        self._reader.start()
+
+    def _stop_reader(self) -> None:
+        reader, self._reader = self._reader, None
+        if reader is None:
+            return
+        self._reader_stop.set()
+        reader.join()
+        self._fail_waiters(ProtocolError("device closed"))
+
+    def _reader_loop(self) -> None:
+        """Block in hidapi's read and hand every report to :meth:`_dispatch`.
+
+        This thread is the only reader of the handle while it runs, so a
+        sender never drains the queue and never polls for its response.
+        """
+        while not self._reader_stop.is_set():
+            try:
+                response = self._read(64, 50)
+            except Exception as exc:
+                self._reader_error = exc
+                self._fail_waiters(ProtocolError(f"interrupt read failed: {exc}"))
+                return
+            if response:
+                self._dispatch(response)
+            else:
+                # hidapi already blocked for the timeout; this only keeps a
+                # non-blocking handle from spinning.
+                self._reader_stop.wait(0.001)
+
+    def subscribe(self, listener: Callable[[bytes], None]) -> None:
+        """Call ``listener`` with every interrupt report no request waits for.
+
+        These are reports the device sends on its own once notifications are
+        enabled, plus late answers to requests that already timed out.
+        """
+        self._listeners.append(listener)
+
+    def _dispatch(self, report: bytes) -> None:
+        response = report[:REPORT_LEN]
+        if len(response) == REPORT_LEN and response[0] == RESPONSE_REPORT_ID:
+            key = response_key(response)
+            with self._waiters_lock:
+                waiters = self._waiters.get(key)
+                if waiters and not report_checksum_valid(response):
+                    self._bad_checksums.add(key)
+                    return
+                future = waiters.pop(0) if waiters else None
+                if future is not None and not waiters:
+                    del self._waiters[key]
+            if future is not None:
+                future.set_result(response)
+                return
+        for listener in self._listeners:
+            listener(report)
+
+    def _fail_waiters(self, exc: Exception) -> None:
+        with self._waiters_lock:
+            pending = [future for waiters in self._waiters.values() for future in waiters]
+            self._waiters.clear()
+        for future in pending:
+            future.set_exception(exc)
+
+    def _submit(self, report: bytes) -> futures.Future:
+        """Register a waiter for ``report``'s response, then send it."""
+        if self._reader_error is not None:
+            raise ProtocolError(f"interrupt read failed: {self._reader_error}")
+        key = response_key(report)
+        future: futures.Future = futures.Future()
+        with self._waiters_lock:
+            self._waiters.setdefault(key, []).append(future)
+            self._bad_checksums.discard(key)
+        try:
+            self.send(report)
+        except Exception:
+            self._withdraw(key, future)
+            raise
+        return future
+
+    def _withdraw(self, key: tuple[int, bytes | None], future: futures.Future) -> bool:
+        """Forget an unanswered request; returns whether a bad checksum was seen."""
+        with self._waiters_lock:
+            waiters = self._waiters.get(key, [])
+            if future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[key]
+            return key in self._bad_checksums
+
+    def _wait(self, pending: Iterable[futures.Future], timeout: float) -> set[futures.Future]:
+        """Return the completed futures of ``pending``, waiting up to ``timeout``."""
+        pending = list(pending)
+        if self._reader is not None:
+            return futures.wait(pending, timeout, futures.FIRST_COMPLETED).done
+        # Without a reader thread the caller reads on its own behalf.
+        deadline = time.monotonic() + timeout
+        while True:
+            done = {future for future in pending if future.done()}
+            if done:
+                return done
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            response = self._read(64, max(1, min(50, int(remaining * 1000))))
+            while response:
+                self._dispatch(response)
+                response = self._read(64, 0)
 
     def send(self, report: bytes) -> None:
         if self._dev is None:
@@ -1368,48 +1992,126 @@ class VenusDevice:
         return bytes(value or ())
 
     def flush_input(self) -> None:
-        if self._dev is None:
+        """Discard queued input; a no-op while the reader thread owns it."""
+        if self._dev is None or self._reader is not None:
             return
         while self._read(64, 1):
             pass
 
     def exchange(self, report: bytes, timeout_ms: int = 500) -> bytes:
         """Send report 0x08 and return its matching interrupt response 0x09."""
-        self.flush_input()
-        self.send(report)
         command = report[1]
-        address = report[3:5]
-        deadline = time.monotonic() + timeout_ms / 1000.0
-        invalid_checksum_seen = False
-        while time.monotonic() < deadline:
-            remaining = max(1, int((deadline - time.monotonic()) * 1000))
-            response = self._read(64, min(50, remaining))
-            if not response:
-                continue
-            if len(response) < REPORT_LEN:
-                continue
-            response = response[:REPORT_LEN]
-            if response[0] != RESPONSE_REPORT_ID or response[1] != command:
-                continue
-            if command in (CMD_WRITE, CMD_READ) and response[3:5] != address:
-                continue
-            if not report_checksum_valid(response):
-                invalid_checksum_seen = True
-                continue
-            return response
-        suffix = " (a response had a bad checksum)" if invalid_checksum_seen else ""
-        raise ProtocolTimeout(f"command 0x{command:02x} timed out{suffix}")
+        with tracing.span("exchange", "areson", command=f"0x{command:02x}",
+                          address=f"0x{report[3]:02x}{report[4]:02x}",
+                          bytes=report[5]):
+            sent_at = time.monotonic()
+            future = self._submit(report)
+            if self._wait([future], timeout_ms / 1000.0):
+                response = future.result()
+                if self.pacer is not None:
+                    self.pacer.record_ack(command, time.monotonic() - sent_at)
+                return response
+            invalid_checksum_seen = self._withdraw(response_key(report), future)
+            if self.pacer is not None:
+                self.pacer.record_failure(command)
+            suffix = " (a response had a bad checksum)" if invalid_checksum_seen else ""
+            raise ProtocolTimeout(f"command 0x{command:02x} timed out{suffix}")
+
+    def exchange_pipelined(self, reports: Sequence[bytes], window: int = READ_WINDOW,
+                           timeout_ms: int = 500, send_at: Sequence[float] | None = None,
+                           ) -> list[tuple[bytes | None, float | None]]:
+        """Exchange ``reports`` in order with up to ``window`` awaiting answers.
+
+        ``send_at`` optionally gives, per report, the earliest time to send
+        it in seconds from the call.  Returns ``(response, latency)`` for
+        each report; a report not answered within ``timeout_ms`` gets
+        ``(None, None)`` and is not retried, and no settle gap is left.
+        """
+        if self._dev is None:
+            raise RuntimeError("device not open")
+        if send_at is not None and len(send_at) != len(reports):
+            raise ValueError("send_at needs one time per report")
+        timeout = timeout_ms / 1000.0
+        results: list[tuple[bytes | None, float | None]] = [(None, None)] * len(reports)
+        in_flight: dict[futures.Future, tuple[int, float]] = {}
+        answered_at: dict[futures.Future, float] = {}
+        start = time.monotonic()
+        following = 0
+
+        def stamp(future: futures.Future) -> None:
+            answered_at[future] = time.monotonic()
+
+        with tracing.span("exchange_pipelined", "areson", reports=len(reports)) as trace:
+            try:
+                while following < len(reports) or in_flight:
+                    while (following < len(reports) and len(in_flight) < max(1, window)
+                           and (send_at is None
+                                or start + send_at[following] <= time.monotonic())):
+                        sent_at = time.monotonic()
+                        future = self._submit(reports[following])
+                        future.add_done_callback(stamp)
+                        in_flight[future] = (following, sent_at)
+                        following += 1
+                    wake = [sent_at + timeout for _, sent_at in in_flight.values()]
+                    if following < len(reports) and len(in_flight) < max(1, window):
+                        wake.append(start + send_at[following])
+                    remaining = max(0.001, min(wake) - time.monotonic())
+                    if in_flight:
+                        done = self._wait(in_flight, remaining)
+                    else:
+                        time.sleep(remaining)
+                        done = set()
+                    for future in done:
+                        index, sent_at = in_flight.pop(future)
+                        latency = answered_at.get(future, time.monotonic()) - sent_at
+                        results[index] = (future.result(), latency)
+                    now = time.monotonic()
+                    for future, (index, sent_at) in list(in_flight.items()):
+                        if now >= sent_at + timeout:
+                            del in_flight[future]
+                            self._withdraw(response_key(reports[index]), future)
+            finally:
+                for future, (index, _) in in_flight.items():
+                    self._withdraw(response_key(reports[index]), future)
+                trace["timeouts"] = sum(response is None for response, _ in results)
+            return results
+
+    def settle_seconds(self, command: int) -> float:
+        if self.pacer is None:
+            return REPORT_SETTLE_SECONDS
+        return self.pacer.settle_seconds(command)
 
     def send_reliable(self, report: bytes, timeout_ms: int = 500) -> bool:
-        """Exchange one report and leave the capture-backed firmware gap."""
-        try:
-            self.exchange(report, timeout_ms)
-            time.sleep(REPORT_SETTLE_SECONDS)
+        """Exchange one report and leave the (possibly adaptive) firmware gap.
+
+        With a :attr:`shadow`, a write whose bytes are already stored is
+        skipped and counted in :attr:`skipped_writes`.
+        """
+        with tracing.span("send_reliable", "areson",
+                          command=f"0x{report[1]:02x}") as trace:
+            shadow = self.shadow
+            span = shadow.write_span(report) if shadow is not None else None
+            if shadow is not None and report[1] == CMD_FACTORY_RESET:
+                shadow.clear()
+            if span is not None and span[1] and shadow.matches(*span):
+                self.skipped_writes += 1
+                self.last_error = ""
+                trace["skipped"] = True
+                return True
+            try:
+                self.exchange(report, timeout_ms)
+            except Exception as exc:
+                if span is not None:
+                    shadow.forget(span[0], len(span[1]))
+                self.last_error = trace["error"] = str(exc)
+                return False
+            if span is not None:
+                shadow.record_write(*span)
+            settle = self.settle_seconds(report[1])
+            trace["settle_ms"] = round(settle * 1000, 3)
+            time.sleep(settle)
             self.last_error = ""
             return True
-        except Exception as exc:
-            self.last_error = str(exc)
-            return False
 
     def ready(self) -> bool:
         response = self.exchange(build_simple(CMD_READY))
@@ -1436,7 +2138,7 @@ class VenusDevice:
         """Request ready state before one or more immediately-persistent writes."""
         accepted = self.ready()
         if accepted:
-            time.sleep(REPORT_SETTLE_SECONDS)
+            time.sleep(self.settle_seconds(CMD_READY))
         return accepted
 
     def unlock(self) -> bool:
@@ -1449,17 +2151,12 @@ class VenusDevice:
 
     def query_status(self) -> BatteryStatus:
         """Read battery level (0..10) and cable/power-source flag."""
-        response = self.exchange(build_simple(CMD_STATUS))
-        if response[5] < 2:
-            raise ProtocolError("status response is shorter than two bytes")
-        level = response[6]
-        if level > 10:
-            raise ProtocolError(f"invalid battery step {level}; expected 0..10")
-        percent = level * 10
-        return BatteryStatus(level, percent, bool(response[7]), response[6:8])
+        return parse_status(self.exchange(build_simple(CMD_STATUS)))
 
     def factory_reset(self) -> None:
         """Erase settings and macros.  Call only after explicit confirmation."""
+        if self.shadow is not None:
+            self.shadow.clear()
         self.exchange(build_simple(CMD_FACTORY_RESET), timeout_ms=1000)
 
     def read_flash(self, page: int, offset: int, length: int) -> bytes:
@@ -1472,7 +2169,221 @@ class VenusDevice:
         if data_len != length or data_len > MAX_DATA_LEN:
             raise ProtocolError(
                 f"read at 0x{page:02x}{offset:02x} returned invalid length {data_len}")
-        return response[6:6 + data_len]
+        data = response[6:6 + data_len]
+        if self.shadow is not None:
+            self.shadow.update(((page & 0xFF) << 8) | (offset & 0xFF), data)
+        return data
+
+    def read_range(self, start: int, length: int, window: int = READ_WINDOW,
+                   timeout_ms: int = 500, attempts: int = 3) -> bytes:
+        """Read ``length`` bytes from ``start`` with pipelined CMD_READ requests.
+
+        Up to ``window`` ten-byte reads are outstanding at once.  Responses
+        are matched by their echoed address, so ordering does not matter, and
+        only chunks whose response never arrives are requested again.
+        """
+        if self._dev is None:
+            raise RuntimeError("device not open")
+        if length < 0 or not 0 <= start <= start + length <= 0x10000:
+            raise ValueError("range must lie within 0x0000..0xffff")
+        end = start + length
+        sizes = {address: min(MAX_DATA_LEN, end - address)
+                 for address in range(start, end, MAX_DATA_LEN)}
+        queue = deque(sizes)
+        tries = dict.fromkeys(sizes, 0)
+        in_flight: dict[futures.Future, tuple[int, float]] = {}
+        result = bytearray(length)
+
+        def requeue(address: int) -> None:
+            if tries[address] >= attempts:
+                raise ProtocolTimeout(
+                    f"read at 0x{address:04x} timed out after {attempts} attempts")
+            queue.append(address)
+
+        with tracing.span("read_range", "areson", address=f"0x{start:04x}",
+                          bytes=length) as trace:
+            try:
+                while queue or in_flight:
+                    while queue and len(in_flight) < max(1, window):
+                        address = queue.popleft()
+                        tries[address] += 1
+                        future = self._submit(
+                            build_flash_read(address >> 8, address & 0xFF, sizes[address]))
+                        in_flight[future] = (address, time.monotonic() + timeout_ms / 1000.0)
+                    first_deadline = min(deadline for _, deadline in in_flight.values())
+                    for future in self._wait(in_flight, first_deadline - time.monotonic()):
+                        address, _ = in_flight.pop(future)
+                        response = future.result()
+                        if response[5] != sizes[address]:
+                            requeue(address)
+                            continue
+                        data = response[6:6 + sizes[address]]
+                        result[address - start:address - start + len(data)] = data
+                        if self.shadow is not None:
+                            self.shadow.update(address, data)
+                    now = time.monotonic()
+                    for future, (address, deadline) in list(in_flight.items()):
+                        if now < deadline:
+                            continue
+                        del in_flight[future]
+                        self._withdraw((CMD_READ, address.to_bytes(2, "big")), future)
+                        requeue(address)
+            finally:
+                for future, (address, _) in in_flight.items():
+                    self._withdraw((CMD_READ, address.to_bytes(2, "big")), future)
+                trace["requests"] = sum(tries.values())
+                trace["retries"] = sum(tries.values()) - len(sizes)
+            return bytes(result)
+
+    def read_cached(self, start: int, length: int, verify: bool = False) -> bytes:
+        """Read a range, fetching only bytes the :attr:`shadow` cannot vouch for.
+
+        Unknown bytes and bytes this application wrote since the last read
+        are fetched; everything else comes from the shadow.  ``verify``
+        re-reads the whole range regardless.
+        """
+        shadow = self.shadow
+        if shadow is None or verify or not shadow.covers(start, length):
+            return self.read_range(start, length)
+        for address, size in shadow.stale_runs(start, length):
+            self.read_range(address, size)
+        return bytes(shadow.data[start:start + length])
+
+
+@dataclass
+class _PooledSession:
+    device: VenusDevice
+    authenticated: bool = False
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class DeviceSessionPool:
+    """Keep one open, authenticated :class:`VenusDevice` per hidraw path.
+
+    Opening hidraw and repeating :meth:`VenusDevice.start_session` used to
+    dominate small edits such as a single rebind.  A lease holds the device
+    I/O lock for its whole duration, exactly like a transient open/close
+    pair, so the tray poller still cannot steal a configuration ACK.  The
+    handle is dropped after a timeout or I/O error and the handshake is
+    repeated on the next lease, or after :data:`SESSION_IDLE_SECONDS`.
+    """
+
+    # Failures that mean the handle or firmware session is no longer
+    # trustworthy.  Anything else raised inside a lease is the caller's own
+    # error and leaves the session intact.
+    _SESSION_ERRORS = (ProtocolError, DeviceAccessError, OSError)
+
+    def __init__(self, idle_seconds: float = SESSION_IDLE_SECONDS,
+                 pacer_factory: Callable[[bytes | str], ReportPacer | None] | None = None,
+                 shadow_factory: Callable[[bytes | str], EepromShadow | None] | None = None,
+                 report_listener: Callable[[bytes | str, bytes], None] | None = None):
+        self.idle_seconds = idle_seconds
+        self.pacer_factory = pacer_factory
+        # Called once per pooled session, so a shadow is dropped with the
+        # session when close() forgets the path.
+        self.shadow_factory = shadow_factory
+        # Sees the unsolicited interrupt reports of every pooled handle, such
+        # as those the device sends once notifications are enabled.
+        self.report_listener = report_listener
+        self._sessions: dict[bytes | str, _PooledSession] = {}
+        self._guard = threading.Lock()
+
+    def _session(self, path: bytes | str) -> _PooledSession:
+        with self._guard:
+            session = self._sessions.get(path)
+            if session is None:
+                pacer = self.pacer_factory(path) if self.pacer_factory else None
+                shadow = self.shadow_factory(path) if self.shadow_factory else None
+                session = _PooledSession(
+                    VenusDevice(path, pacer=pacer, shadow=shadow))
+                if self.report_listener is not None:
+                    listener = self.report_listener
+                    session.device.subscribe(lambda report: listener(path, report))
+                self._sessions[path] = session
+            return session
+
+    @contextmanager
+    def lease(self, path: bytes | str, authenticate: bool = True,
+              attempts: int = 1) -> Iterator[VenusDevice]:
+        """Yield the open device for ``path`` while holding its I/O lock.
+
+        ``authenticate`` runs the startup handshake unless this handle already
+        completed one recently.  ``attempts`` bounds handshake retries; each
+        retry reopens hidraw, as the GUI's original read loop did.
+        """
+        session = self._session(path)
+        device = session.device
+        device._acquire_io_lock()
+        try:
+            if device._dev is None:
+                device._open_handle()
+                session.authenticated = False
+                # The node may now belong to another mouse, or this one may
+                # have been configured elsewhere; start from an empty image.
+                if device.shadow is not None:
+                    device.shadow.clear()
+            if time.monotonic() - session.last_used > self.idle_seconds:
+                session.authenticated = False
+            if authenticate and not session.authenticated:
+                self._handshake(session, attempts)
+            yield device
+            session.last_used = time.monotonic()
+        except self._SESSION_ERRORS:
+            session.authenticated = False
+            device._close_handle()
+            raise
+        finally:
+            device._io_lock.release()
+
+    def _handshake(self, session: _PooledSession, attempts: int) -> None:
+        device = session.device
+        for attempt in range(max(1, attempts)):
+            if attempt:
+                time.sleep(0.5)
+                device._close_handle()
+                device._open_handle()
+            try:
+                if device.start_session():
+                    session.authenticated = True
+                    session.last_used = time.monotonic()
+                    return
+                error: Exception = ProtocolError("startup challenge was rejected")
+            except ProtocolError as exc:
+                error = exc
+        raise error
+
+    def paths(self) -> list[bytes | str]:
+        with self._guard:
+            return list(self._sessions)
+
+    def invalidate(self, path: bytes | str) -> None:
+        """Forget the handshake for ``path`` so the next lease repeats it."""
+        with self._guard:
+            session = self._sessions.get(path)
+        if session is not None:
+            session.authenticated = False
+
+    def close(self, path: bytes | str) -> None:
+        """Close and forget the pooled handle for ``path``."""
+        with self._guard:
+            session = self._sessions.pop(path, None)
+        if session is None:
+            return
+        device = session.device
+        device._acquire_io_lock()
+        try:
+            device._close_handle()
+        finally:
+            device._io_lock.release()
+
+    def close_all(self) -> None:
+        with self._guard:
+            paths = list(self._sessions)
+        for path in paths:
+            try:
+                self.close(path)
+            except DeviceAccessError:
+                pass
 
 
 def calculate_terminator_checksum(
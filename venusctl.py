@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""Headless command-line front end for Venus Pro and Holtek mice.
+
+Every command prints JSON on stdout.  Only hidapi and the protocol modules are
+imported, never PyQt, so the tool starts quickly enough for login hooks and
+udev ``RUN`` scripts.
+
+Usage:
+    venusctl list
+    venusctl read [--profile N]
+    venusctl apply settings.json          # or "-" for stdin
+    venusctl export backup.vpp
+    venusctl import backup.vpp
+    venusctl macro 3 --text "gg" [--bind "Button 5"]
+    venusctl battery
+
+``--device /dev/hidrawN`` selects a mouse; the first accessible one is used
+otherwise.  ``--trace out.json`` saves the command's USB timings as Chrome
+trace JSON.  ``apply`` takes the object ``read`` prints, any subset of::
+
+    {"buttons": {"Button 1": {"action": "Keyboard Key",
+                              "params": {"key": 4, "mod": 0}}},
+     "dpi": [800, 1600, 3200], "dpi_stage": 1,
+     "rgb": {"r": 255, "g": 0, "b": 0, "mode": 1, "brightness": 100,
+             "speed": 3},
+     "polling_rate": 1000}
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import device_driver as dd
+import holtek_protocol as hp
+import profile_container as pc
+import tracing
+import venus_protocol as vp
+from staging_manager import StagingManager
+from transaction_controller import TransactionController
+
+
+class CommandError(RuntimeError):
+    """A failure reported as ``{"error": ...}`` with exit status 1."""
+
+
+RGB_FIELDS = ('r', 'g', 'b', 'mode', 'brightness', 'speed')
+# Used for fields an "rgb" object leaves out when the mouse's own lighting
+# record could not be read.
+HOLTEK_LED_DEFAULTS = {'r': 255, 'g': 255, 'b': 255, 'mode': 3,
+                       'brightness': 5, 'speed': 1}
+ARESON_RGB_DEFAULTS = {'r': 255, 'g': 255, 'b': 255, 'mode': vp.RGB_MODE_STEADY,
+                       'brightness': 100, 'speed': vp.RGB_EFFECT_SPEED_DEFAULT}
+
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def device_json(info: vp.DeviceInfo) -> dict:
+    return {
+        "path": info.display_path,
+        "name": vp.DEVICE_NAMES.get((info.vendor_id, info.product_id), info.product),
+        "type": dd.detect_device_type(info),
+        "vendor_id": f"{info.vendor_id:04x}",
+        "product_id": f"{info.product_id:04x}",
+        "interface": info.interface_number,
+        "access_error": info.access_error or None,
+    }
+
+
+def select_device(path: str | None) -> vp.DeviceInfo:
+    devices = vp.list_devices()
+    if path:
+        devices = [info for info in devices if info.display_path == path]
+        if not devices:
+            raise CommandError(f"no supported mouse at {path}")
+    usable = [info for info in devices if not info.access_error]
+    if not usable:
+        raise CommandError(devices[0].access_error if devices else
+                           "no supported mouse found")
+    return usable[0]
+
+
+def _holtek_profile(profile: int | None, image: hp.HoltekImage) -> int:
+    if profile is None:
+        return image.active_profile
+    if not 1 <= profile <= 5:
+        raise CommandError("--profile must be 1..5")
+    return profile - 1
+
+
+def read_config(device_type: str, device, profile: int | None = None) -> dict:
+    """The configuration ``apply`` accepts, decoded from an open device."""
+    if device_type == 'holtek':
+        image = hp.HoltekImage.read(device)
+        index = _holtek_profile(profile, image)
+        config = image.config(index)
+        buttons = {}
+        for entry in config['buttons']:
+            key = f"Button {entry['index'] + 1}"
+            if key in hp.BUTTON_PROFILES:
+                action, params = hp.button_action_to_gui(
+                    entry['type'], entry['code'], type_hi=entry['type_hi'])
+                buttons[key] = {"action": action, "params": params}
+        return {
+            "profile": index + 1,
+            "active_profile": config['active_profile'] + 1,
+            "dpi": config['dpi_stages'],
+            "dpi_stage": config['dpi_stage_current'] + 1,
+            "dpi_colors": config['dpi_colors'],
+            # None where the LED record could not be read.
+            "rgb": {key: config['led'].get(key) for key in RGB_FIELDS},
+            "buttons": buttons,
+        }
+
+    page0 = device.read_range(0x0000, 0xA0)
+    page1 = device.read_range(0x0100, 0x100)
+    page2 = device.read_range(0x0200, 0x100)
+    settings = vp.parse_settings(page0)
+    buttons = {}
+    for key, button in vp.BUTTON_PROFILES.items():
+        action, params = vp.parse_button_binding(page0, page1, page2, button)
+        buttons[key] = {"action": action, "params": params}
+    dpi = settings["dpi"]
+    return {
+        "polling_rate": settings["polling_rate"],
+        "dpi": dpi["stages"][:dpi["stage_count"]] if 1 <= dpi["stage_count"] <= 5
+        else dpi["stages"],
+        "rgb": settings["rgb"],
+        "buttons": buttons,
+    }
+
+
+class PacketBuilder:
+    """Packets for staged changes, as the GUI's builder produces them.
+
+    Besides button keys, ``"DPI"``, ``"RGB"`` and (Areson only)
+    ``"Polling"`` are staged as entries of their own so that one
+    :class:`TransactionController` run sends everything; for Holtek mice that
+    means a single coalesced commit.
+    """
+
+    def __init__(self, device_type: str, profile: int = 0,
+                 holtek_config: dict | None = None):
+        self.device_type = device_type
+        self.profile = profile
+        self.holtek_config = holtek_config or {}
+
+    def build_packets(self, key: str, action: str, params: dict) -> list[bytes]:
+        holtek = self.device_type == 'holtek'
+        if key == "DPI":
+            stages = params["stages"]
+            current = params.get("current", 1) - 1
+            if holtek:
+                return hp.build_dpi_packets(
+                    stages, profile=self.profile, current_stage=current,
+                    color_indices=self.holtek_config.get('dpi_colors'))
+            reports = [vp.build_dpi_stage_count(len(stages))]
+            for slot, dpi in enumerate(stages):
+                value = vp.dpi_to_value(dpi)
+                reports.append(vp.build_dpi(slot, value, vp.dpi_value_to_tweak(value)))
+            return reports
+        if key == "RGB":
+            # Records are rewritten whole; keep what was not given.
+            if holtek:
+                led = dict(HOLTEK_LED_DEFAULTS)
+                led.update({key: value for key, value in
+                            (self.holtek_config.get('led') or {}).items()
+                            if key in RGB_FIELDS})
+            else:
+                led = dict(ARESON_RGB_DEFAULTS)
+            led.update(params)
+            if holtek:
+                return hp.build_led_packets(
+                    led['r'], led['g'], led['b'], led['mode'], led['brightness'],
+                    led['speed'], profile=self.profile)
+            return vp.build_rgb_packets(
+                led['r'], led['g'], led['b'], led['mode'], led['brightness'],
+                led['speed'])
+        if key == "Polling":
+            return [vp.build_report(vp.CMD_WRITE, vp.POLLING_RATE_PAYLOADS[params["rate"]])]
+        if holtek:
+            button = hp.BUTTON_PROFILES.get(key)
+            if button is None:
+                raise ValueError(f"Unknown button: {key}")
+            return hp.build_write_packets(button.index, action, params,
+                                          profile=self.profile)
+        button = vp.BUTTON_PROFILES.get(key)
+        if button is None or button.apply_offset is None:
+            raise ValueError(f"Unknown button: {key}")
+        return vp.build_binding_packets(
+            action, params, button.code_hi, button.code_lo, button.apply_offset)
+
+
+def check_changes(changes) -> None:
+    """Reject an ``apply`` document whose shape :func:`apply_config` cannot use."""
+    if not isinstance(changes, dict):
+        raise CommandError("settings must be a JSON object")
+    buttons = changes.get("buttons") or {}
+    if not isinstance(buttons, dict):
+        raise CommandError('"buttons" must map button names to bindings')
+    for key, binding in buttons.items():
+        if not isinstance(binding, dict) or "action" not in binding:
+            raise CommandError(f'binding for {key} needs an "action"')
+        if not isinstance(binding.get("params", {}), dict):
+            raise CommandError(f'"params" of {key} must be an object')
+    dpi = changes.get("dpi")
+    if dpi is not None and not (
+            isinstance(dpi, list) and all(isinstance(value, int) for value in dpi)):
+        raise CommandError('"dpi" must be a list of DPI values')
+    rgb = changes.get("rgb")
+    if rgb is not None and not isinstance(rgb, dict):
+        raise CommandError('"rgb" must be an object')
+    unknown = sorted(set(rgb or {}) - set(RGB_FIELDS))
+    if unknown:
+        raise CommandError(f'unknown "rgb" fields: {", ".join(unknown)}')
+
+
+def apply_config(device_type: str, device, changes: dict,
+                 profile: int | None = None, logger=None) -> dict:
+    """Write a (partial) configuration; return what was written.
+
+    Colour channels the ``"rgb"`` object leaves out (or sets to null, as
+    ``read`` prints them for an unreadable Holtek record) keep the mouse's
+    current values.  Holtek mice keep their mode, brightness and speed too;
+    Areson mice fall back to a steady effect at full brightness.
+    """
+    check_changes(changes)
+    staging = StagingManager()
+    staging.load_base_state({})
+    categories = 0
+    holtek_config: dict = {}
+    index = 0
+    if device_type == 'holtek':
+        image = hp.HoltekImage.read(device)
+        index = _holtek_profile(profile, image)
+        holtek_config = image.config(index)
+
+    for key, binding in (changes.get("buttons") or {}).items():
+        staging.stage_change(key, binding["action"], binding.get("params", {}))
+        categories |= hp.CATEGORY_BUTTONS
+    if changes.get("dpi"):
+        stages = list(changes["dpi"])
+        current = changes.get("dpi_stage", holtek_config.get('dpi_stage_current', 0) + 1)
+        staging.stage_change("DPI", "DPI", {
+            "stages": stages, "current": min(current, len(stages))})
+        categories |= hp.CATEGORY_DPI
+    rgb = {key: value for key, value in (changes.get("rgb") or {}).items()
+           if value is not None}
+    if rgb:
+        if device_type != 'holtek' and not {'r', 'g', 'b'} <= set(rgb):
+            current = vp.parse_settings(device.read_range(0x0000, 0xA0))["rgb"]
+            rgb = {**{key: current[key] for key in 'rgb'}, **rgb}
+        staging.stage_change("RGB", "RGB", rgb)
+        categories |= hp.CATEGORY_LED
+
+    written = sorted(staging.get_staged_changes())
+    rate = changes.get("polling_rate")
+    if rate is not None:
+        if device_type == 'holtek':
+            device.set_polling_rate(rate)
+        elif rate not in vp.POLLING_RATE_PAYLOADS:
+            raise CommandError(f"unsupported polling rate {rate}")
+        else:
+            staging.stage_change("Polling", "Polling", {"rate": rate})
+        written.append("Polling")
+    if not staging.has_changes():
+        return {"written": written}
+
+    if device_type == 'holtek':
+        device.enter_write_mode()
+        builder = PacketBuilder(device_type, index, holtek_config)
+    else:
+        if not device.begin_write():
+            raise CommandError(device.last_error or "Mouse did not enter ready state")
+        builder = PacketBuilder(device_type)
+    controller = TransactionController(
+        device, builder, logger=logger,
+        coalesce=device.coalesce_writes if device_type == 'holtek' else None)
+    if not controller.execute_transaction(staging):
+        raise CommandError(getattr(device, "last_error", "") or "write failed")
+    if device_type == 'holtek':
+        # Commits and resets the mouse; the handle is unusable afterwards.
+        device.commit_writes(categories=categories)
+    return {"written": written}
+
+
+def load_profile_regions(path: Path, info: vp.DeviceInfo) -> list[tuple[int, bytes]]:
+    """Regions of a profile container (or raw Areson dump) made for ``info``."""
+    if not pc.is_profile_container(path):
+        if dd.detect_device_type(info) == 'holtek':
+            raise CommandError("raw dumps are only supported for Areson mice")
+        return pc.legacy_regions(path.read_bytes())
+    with pc.ProfileContainer.open(path) as profile:
+        if (dd.device_type_for_ids(profile.vendor_id, profile.product_id)
+                != dd.detect_device_type(info)):
+            raise CommandError(
+                f"profile was exported from "
+                f"{profile.vendor_id:04x}:{profile.product_id:04x}, "
+                f"not this {info.vendor_id:04x}:{info.product_id:04x} mouse")
+        return [(start, bytes(data)) for start, data in profile.regions()]
+
+
+def macro_events(args: argparse.Namespace) -> list[vp.MacroEvent]:
+    if args.text is not None:
+        _count, unsupported = vp.text_macro_requirements(args.text)
+        if unsupported:
+            raise CommandError(f"unsupported characters: {''.join(unsupported)}")
+        events = vp.build_text_macro_events(args.text)
+    else:
+        source = sys.stdin if args.events == "-" else open(args.events)
+        with source:
+            items = json.load(source)
+        if not isinstance(items, list):
+            raise CommandError("--events must hold a JSON list")
+        try:
+            events = [vp.MacroEvent(**item) for item in items]
+        except TypeError as exc:
+            raise CommandError(f"bad macro event: {exc}") from exc
+    if not events:
+        raise CommandError("macro has no events")
+    if len(events) > vp.MACRO_MAX_EVENTS:
+        raise CommandError(
+            f"a hardware macro slot holds at most {vp.MACRO_MAX_EVENTS} events")
+    return events
+
+
+def run(args: argparse.Namespace) -> dict | list:
+    if args.command == "list":
+        return [device_json(info) for info in vp.list_devices()]
+
+    info = select_device(args.device)
+    device_type = dd.detect_device_type(info)
+    result: dict = {"device": device_json(info)}
+    authenticate = device_type != 'holtek'
+
+    if args.command == "read":
+        with dd.open_device(device_type, info.path, authenticate=authenticate) as device:
+            result.update(read_config(device_type, device, args.profile))
+
+    elif args.command == "apply":
+        source = sys.stdin if args.config == "-" else open(args.config)
+        with source:
+            changes = json.load(source)
+        with dd.open_device(device_type, info.path, authenticate=authenticate) as device:
+            result.update(apply_config(device_type, device, changes, args.profile))
+
+    elif args.command == "export":
+        with dd.open_device(device_type, info.path, authenticate=authenticate) as device:
+            regions = dd.read_profile_regions(device_type, device)
+        payload = pc.encode_profile(info.vendor_id, info.product_id, regions)
+        args.file.write_bytes(payload)
+        result.update({"file": str(args.file), "bytes": len(payload)})
+
+    elif args.command == "import":
+        regions = load_profile_regions(args.file, info)
+        with dd.open_device(device_type, info.path, authenticate=authenticate) as device:
+            reports = dd.write_profile_regions(device_type, device, regions)
+        result.update({"file": str(args.file), "reports": reports})
+
+    elif args.command == "macro":
+        if device_type == 'holtek':
+            raise CommandError("hardware macros are not available on the Holtek Venus MMO")
+        if not 1 <= args.slot <= 16:
+            raise CommandError("macro slot must be 1..16")
+        events = macro_events(args)
+        reports = vp.build_macro_upload(args.slot - 1, args.name, events)
+        if args.bind:
+            button = vp.BUTTON_PROFILES.get(args.bind)
+            if button is None:
+                raise CommandError(f"unknown button {args.bind}")
+            reports.extend(vp.build_binding_packets(
+                "Macro", {"index": args.slot, "mode": args.repeat},
+                button.code_hi, button.code_lo, button.apply_offset))
+        with dd.open_device(device_type, info.path, authenticate=True) as device:
+            if not device.begin_write():
+                raise CommandError(device.last_error or "Mouse did not enter ready state")
+            for report in reports:
+                if not device.send_reliable(report):
+                    raise CommandError(device.last_error or "macro upload failed")
+        result.update({"slot": args.slot, "events": len(events),
+                       "bound_to": args.bind})
+
+    elif args.command == "battery":
+        if device_type == 'holtek':
+            raise CommandError("the Holtek Venus MMO does not report battery status")
+        with dd.open_device(device_type, info.path) as device:
+            status = device.query_status()
+        result.update({"level": status.level, "percent": status.percent,
+                       "cable_connected": status.cable_connected})
+    return result
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="venusctl", description=__doc__.splitlines()[0])
+    parser.add_argument("--device", help="hidraw path of the mouse to use")
+    parser.add_argument("--trace", type=Path,
+                        help="write a Chrome trace of the command to this file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list supported mice")
+    read = commands.add_parser("read", help="print the configuration")
+    read.add_argument("--profile", type=int, help="Holtek profile 1-5 (default: active)")
+    apply = commands.add_parser("apply", help="write settings from JSON")
+    apply.add_argument("config", help="JSON file, or - for stdin")
+    apply.add_argument("--profile", type=int, help="Holtek profile 1-5 (default: active)")
+    export = commands.add_parser("export", help="save a profile container")
+    export.add_argument("file", type=Path)
+    restore = commands.add_parser("import", help="write a profile container")
+    restore.add_argument("file", type=Path)
+    macro = commands.add_parser("macro", help="upload a macro to a slot")
+    macro.add_argument("slot", type=int, help="macro slot 1-16")
+    source = macro.add_mutually_exclusive_group(required=True)
+    source.add_argument("--text", help="type this US-layout text")
+    source.add_argument("--events", help="JSON list of MacroEvent fields, or -")
+    macro.add_argument("--name", default="Macro")
+    macro.add_argument("--bind", help='also bind the slot, e.g. "Button 5"')
+    macro.add_argument("--repeat", type=lambda text: int(text, 0),
+                       default=vp.MACRO_REPEAT_ONCE,
+                       help="repeat count 1-253, 0xFE hold or 0xFF toggle")
+    commands.add_parser("battery", help="query battery level")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        try:
+            with tracing.span(args.command, "venusctl"):
+                result = run(args)
+        finally:
+            if args.trace:
+                tracing.TRACER.export_chrome_trace(args.trace)
+    except (RuntimeError, ValueError, OSError, KeyError, TypeError) as exc:
+        # CommandError, ProtocolError, DeviceAccessError, ProfileFormatError
+        # and Holtek read failures all derive from the first three; the
+        # last two catch JSON input that passed the shape checks but not
+        # the protocol builders.
+        json.dump({"error": str(exc)}, sys.stdout)
+        print()
+        return 1
+    json.dump(result, sys.stdout, indent=2, default=_json_default)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())